@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Knowledge store benchmark for paper-search-mcp.
+
+Bulk-loads synthetic papers (titles of 10 words, abstracts of 150, drawn
+from a Zipf-distributed vocabulary) into an in-memory SurrealDB and times
+the import, then times search_knowledge queries once the store holds the
+full corpus.
+
+Usage:
+    python benchmarks/knowledge.py [--ingest 10000] [--corpus 100000] [--queries 50]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from paper_search_mcp.knowledge import KnowledgeStore  # noqa: E402
+
+VOCABULARY = [f"term{n}" for n in range(20000)]
+CUM_WEIGHTS = list(accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+
+def make_papers(start: int, count: int, rng: random.Random):
+    for n in range(start, start + count):
+        yield {
+            "paper_id": f"bench{n}",
+            "title": " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=10)),
+            "abstract": " ".join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=150)),
+            "authors": ["Ada Lovelace", "Alan Turing"],
+            "published_date": datetime(2024, 1, 1),
+            "source": "benchmark",
+        }
+
+
+async def run(ingest: int, corpus: int, queries: int) -> None:
+    rng = random.Random(0)
+    store = KnowledgeStore(url="mem://")
+    try:
+        await store.connect()
+        papers = list(make_papers(0, ingest, rng))
+        start = time.perf_counter()
+        await store.store_papers_bulk(papers)
+        elapsed = time.perf_counter() - start
+        print(f"ingest {ingest} papers: {elapsed:.2f}s ({ingest / elapsed:.0f} papers/s)")
+
+        if corpus > ingest:
+            await store.store_papers_bulk(make_papers(ingest, corpus - ingest, rng))
+        await store.search_papers(VOCABULARY[0])  # checks the index against SurrealDB once
+
+        timings = []
+        for _ in range(queries):
+            # Two terms: one common, one from the long tail
+            query = f"{rng.choice(VOCABULARY[:100])} {rng.choice(VOCABULARY[100:5000])}"
+            start = time.perf_counter()
+            await store.search_papers(query, limit=10)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+        print(f"search over {corpus} papers ({queries} queries): median {statistics.median(timings) * 1000:.1f}ms, "
+              f"p95 {p95 * 1000:.1f}ms, max {timings[-1] * 1000:.1f}ms")
+    finally:
+        await store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ingest", type=int, default=10000, help="Papers in the timed bulk import (default: 10000)")
+    parser.add_argument("--corpus", type=int, default=100000, help="Papers stored before timing queries (default: 100000)")
+    parser.add_argument("--queries", type=int, default=50, help="Queries timed (default: 50)")
+    args = parser.parse_args()
+    asyncio.run(run(args.ingest, args.corpus, args.queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for paper-search-mcp.
+
+Times fresh interpreters that import the MCP server, run simple CLI
+commands, and (for comparison) import every platform plus the knowledge and
+document processing backends, which is what startup used to cost. Importing
+FastMCP alone is timed too: the server import can't get below it, and the
+gap between the two is mostly FastMCP building the tools' schemas.
+
+Usage:
+    python benchmarks/startup.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EAGER_IMPORTS = "; ".join([
+    "import paper_search_mcp.server",
+    "from paper_search_mcp.registry import get_registry",
+    "registry = get_registry()",
+    "[registry[name] for name in registry]",
+    "from paper_search_mcp.knowledge import get_knowledge_store",
+    "from paper_search_mcp.document_processor import get_document_processor",
+    "get_document_processor()",
+    "import surrealdb",
+])
+
+CASES = [
+    # The floor for the server: FastMCP itself, before any tool is defined
+    ("import fastmcp", [sys.executable, "-c", "import fastmcp.server.server"]),
+    ("import server", [sys.executable, "-c", "import paper_search_mcp.server"]),
+    ("cli --help", [sys.executable, "-m", "paper_search_mcp.cli", "--help"]),
+    ("cli list-sources", [sys.executable, "-m", "paper_search_mcp.cli", "list-sources"]),
+    ("cli cache-stats", [sys.executable, "-m", "paper_search_mcp.cli", "cache-stats"]),
+    ("eager: all platforms + backends", [sys.executable, "-c", EAGER_IMPORTS]),
+]
+
+
+def time_command(command, runs: int):
+    """Wall-clock seconds of each run of command in a fresh process."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per case (default: 5)")
+    args = parser.parse_args()
+
+    # Warm the OS file cache and bytecode so runs measure imports, not disk
+    time_command(CASES[1][1], 1)
+    print(f"{'case':<34} {'median':>8} {'min':>8} {'max':>8}")
+    for name, command in CASES:
+        try:
+            timings = time_command(command, args.runs)
+        except subprocess.CalledProcessError:
+            print(f"{name:<34} {'failed':>8}")
+            continue
+        print(f"{name:<34} {statistics.median(timings):>7.3f}s {min(timings):>7.3f}s {max(timings):>7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,23 @@
 # paper_search_mcp/sources/arxiv.py
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-import httpx
+import asyncio
 import feedparser
 from ..paper import Paper
-from PyPDF2 import PdfReader
+from .base import PaperSource, SEARCH, DOWNLOAD, READ
+from ..pdf_store import get_pdf_store, pdf_aliases, versionless_arxiv_alias
+from ..download import download_to_store
+from ..extraction import get_extractor
 import os
 
-class PaperSource:
-    """Abstract base class for paper sources"""
-    async def search(self, query: str, **kwargs) -> List[Paper]:
-        raise NotImplementedError
-
-    async def download_pdf(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
-
-    async def read_paper(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
-
 class ArxivSearcher(PaperSource):
     """Searcher for arXiv papers"""
+
+    name = "arxiv"
+    description = "arXiv - Open access preprint repository"
+    capabilities = frozenset({SEARCH, DOWNLOAD, READ})
+    hedge_requests = True
+
     BASE_URL = "http://export.arxiv.org/api/query"
 
     async def search(self, query: str, max_results: int = 10) -> List[Paper]:
@@ -29,9 +27,8 @@ class ArxivSearcher(PaperSource):
             'sortBy': 'submittedDate',
             'sortOrder': 'descending'
         }
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.BASE_URL, params=params)
-            response.raise_for_status()
+        response = await self.request('GET', self.BASE_URL, params=params)
+        response.raise_for_status()
         feed = feedparser.parse(response.content)
         papers = []
         for entry in feed.entries:
@@ -59,22 +56,29 @@ class ArxivSearcher(PaperSource):
         return papers
 
     async def download_pdf(self, paper_id: str, save_path: str) -> str:
+        # Serve from the PDF store if any source already fetched this paper
+        store = get_pdf_store()
+        aliases = pdf_aliases(arxiv_id=paper_id)
+        filename = f"{paper_id}.pdf"
+        cached_file = await asyncio.to_thread(store.lookup, aliases, save_path, filename)
+        if cached_file:
+            return cached_file
+
         pdf_url = f"https://arxiv.org/pdf/{paper_id}.pdf"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(pdf_url)
-            response.raise_for_status()
-        output_file = f"{save_path}/{paper_id}.pdf"
-        with open(output_file, 'wb') as f:
-            f.write(response.content)
-        return output_file
-
-    async def read_paper(self, paper_id: str, save_path: str = "./downloads") -> str:
+        aliases.append(versionless_arxiv_alias(paper_id))
+        result = await download_to_store(pdf_url, aliases, save_path, filename, source=self)
+        return result.path
+
+    async def read_paper(self, paper_id: str, save_path: str = "./downloads",
+                         pages: Optional[str] = None, max_chars: Optional[int] = None) -> str:
         """Read a paper and convert it to text format.
-        
+
         Args:
             paper_id: arXiv paper ID
             save_path: Directory where the PDF is/will be saved
-            
+            pages: 1-based page selection such as '1-5,8,10-' (default: all pages)
+            max_chars: Stop reading after this many characters (default: no limit)
+
         Returns:
             str: The extracted text content of the paper
         """
@@ -82,28 +86,21 @@ class ArxivSearcher(PaperSource):
         pdf_path = f"{save_path}/{paper_id}.pdf"
         if not os.path.exists(pdf_path):
             pdf_path = await self.download_pdf(paper_id, save_path)
-        
-        # Read the PDF
+
+        # Read the PDF (parsed in a worker process, off the event loop)
         try:
-            reader = PdfReader(pdf_path)
-            text = ""
-            
-            # Extract text from each page
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            
-            return text.strip()
+            return await get_extractor().read_text(pdf_path, pages, max_chars)
         except Exception as e:
             print(f"Error reading PDF for paper {paper_id}: {e}")
             return ""
 
 if __name__ == "__main__":
     import asyncio
-    
+
     async def test_arxiv():
         # 测试 ArxivSearcher 的功能
         searcher = ArxivSearcher()
-        
+
         # 测试搜索功能
         print("Testing search functionality...")
         query = "machine learning"
@@ -116,7 +113,7 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"Error during search: {e}")
             return
-        
+
         # 测试 PDF 下载功能
         if papers:
             print("\nTesting PDF download functionality...")
@@ -140,5 +137,5 @@ if __name__ == "__main__":
                 print(f"\nTotal length of extracted text: {len(text_content)} characters")
             except Exception as e:
                 print(f"Error during paper reading: {e}")
-    
+
     asyncio.run(test_arxiv())
\ No newline at end of file
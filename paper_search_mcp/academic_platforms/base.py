@@ -0,0 +1,259 @@
+"""
+Common base class for paper-search-mcp platforms.
+Every source is async and declares its capabilities, so the registry, the
+MCP server and the CLI can tell what a source supports without hard-coding
+it. Requests go through one hook (shared client, rate limits, retries,
+coalescing, circuit breaker, adaptive timeouts and per-source metrics) and
+search results through the shared search cache.
+"""
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Dict, FrozenSet, List, Optional
+
+import httpx
+
+from ..paper import Paper
+from ..breaker import CircuitBreaker, get_breakers
+from ..latency import LatencyTracker, hedged
+from ..ratelimit import fetch
+from ..singleflight import get_singleflight, request_key, BODY_ARGUMENTS, IDEMPOTENT_METHODS
+from ..transport import get_client
+
+# Capabilities a source can declare
+SEARCH = "search"          # search(query, max_results)
+DOWNLOAD = "download"      # download_pdf(paper_id, save_path)
+READ = "read"              # read_paper(paper_id, save_path, pages, max_chars)
+LOOKUP = "lookup"          # get_paper(paper_id)
+BATCH = "batch"            # get_papers(paper_ids) in few requests
+CAPABILITIES = (SEARCH, DOWNLOAD, READ, LOOKUP, BATCH)
+
+# get_paper() calls in flight at once in the default get_papers()
+LOOKUP_CONCURRENCY = 4
+
+
+class BatchLookupError(Exception):
+    """Some requests of a batch lookup failed (as opposed to IDs that are unknown)."""
+
+    def __init__(self, papers: List[Optional[Paper]], failed: Dict[str, str]):
+        super().__init__(f"Lookup of {len(failed)} of {len(papers)} papers failed")
+        self.papers = papers    # One entry per requested ID; None for failed or unknown IDs
+        self.failed = failed    # Error message per failed ID
+
+
+@dataclass
+class SourceMetrics:
+    """Request counters of one source"""
+    requests: int = 0
+    failures: int = 0           # Connection errors and 4xx/5xx answers
+    seconds: float = 0.0        # Time spent in requests, including rate-limit waits and retries
+    coalesced: int = 0          # Requests answered by an identical one already in flight
+
+    def to_dict(self) -> Dict:
+        return dict(asdict(self), seconds=round(self.seconds, 3),
+                    mean_seconds=round(self.seconds / self.requests, 3) if self.requests else 0.0)
+
+
+class PaperSource:
+    """
+    Base class for paper sources.
+
+    Subclasses set `name`, `description` and `capabilities` and implement
+    the async methods for the capabilities they declare; the rest raise
+    NotImplementedError.
+    """
+
+    name: str = ""
+    description: str = ""
+    capabilities: FrozenSet[str] = frozenset({SEARCH})
+    # Whether the registry puts search() behind the persistent search cache
+    cacheable: bool = True
+    # Whether slow GETs get a duplicate request after the source's p95 latency
+    # (only for APIs where repeating a GET is cheap and harmless)
+    hedge_requests: bool = False
+
+    @classmethod
+    def supports(cls, capability: str) -> bool:
+        return capability in cls.capabilities
+
+    def unsupported(self, capability: str) -> NotImplementedError:
+        return NotImplementedError(f"{self.description or self.name or type(self).__name__} "
+                                   f"does not support {capability}")
+
+    @property
+    def metrics(self) -> SourceMetrics:
+        # Created on demand: subclasses don't call a base __init__
+        return self.__dict__.setdefault('_metrics', SourceMetrics())
+
+    @property
+    def latency(self) -> LatencyTracker:
+        """Response times of this source's GET requests, driving timeouts and hedging."""
+        latency = self.__dict__.get('_latency')
+        if latency is None:
+            latency = self.__dict__['_latency'] = LatencyTracker()
+        return latency
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """This source's circuit breaker."""
+        return get_breakers().get(self.name or type(self).__name__)
+
+    def is_failure(self, response: httpx.Response) -> bool:
+        """
+        Whether a response means the source is unhealthy (counts against its
+        breaker): throttling and server errors by default. Sources that
+        answer blocks with a 200 page (e.g. a CAPTCHA) override this.
+        """
+        return response.status_code == 429 or response.status_code >= 500
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared pooled HTTP client of the running event loop."""
+        return get_client()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the host's rate limit and retry policy,
+        recording it in this source's metrics and circuit breaker. Identical
+        GET/HEAD requests made while one is in flight share its response.
+
+        Once enough GET/HEAD responses have been seen, their timeout follows
+        the source's p99 latency (capped at the timeout passed in), and for
+        sources with `hedge_requests` a duplicate is sent when the first
+        request outlives the p95.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to ratelimit.fetch (params, headers, timeout, retries, ...)
+
+        Returns:
+            The response; its status is not checked
+
+        Raises:
+            CircuitOpenError: If the source's breaker is open (no request is sent)
+        """
+        key = None
+        if not any(kwargs.get(name) is not None for name in BODY_ARGUMENTS):
+            key = request_key(method, url, kwargs.get('params'), kwargs.get('headers'))
+        flight = get_singleflight()
+        if key is not None and key in flight:
+            self.metrics.coalesced += 1
+        else:
+            self.breaker.allow()
+        return await flight.do(key, lambda: self._send(method, url, key is not None, **kwargs))
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """
+        Like request(), but the body is left unread for the caller to
+        consume (e.g. with aiter_bytes()) and closed when the block exits.
+
+        Streamed requests are never coalesced or hedged and keep the timeout
+        they are given; time to the response headers feeds the latency
+        tracker for GET/HEAD.
+
+        Raises:
+            CircuitOpenError: If the source's breaker is open (no request is sent)
+        """
+        self.breaker.allow()
+        idempotent = (method.upper() in IDEMPOTENT_METHODS
+                      and not any(kwargs.get(name) is not None for name in BODY_ARGUMENTS))
+        response = await self._send(method, url, idempotent, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def _send(self, method: str, url: str, idempotent: bool, stream: bool = False,
+                    **kwargs) -> httpx.Response:
+        metrics = self.metrics
+        breaker = self.breaker
+        latency = self.latency
+        metrics.requests += 1
+        start = time.monotonic()
+        try:
+            if idempotent:
+                delay = None
+                if not stream:
+                    timeout = kwargs.get('timeout')
+                    if timeout is None or isinstance(timeout, (int, float)):
+                        kwargs['timeout'] = latency.timeout(timeout)
+                    delay = latency.hedge_delay() if self.hedge_requests else None
+
+                async def attempt(send, send_again) -> httpx.Response:
+                    # One try, after its rate-limit wait: the hedge timer and
+                    # the observed latency both cover time on the wire only
+                    started = time.monotonic()
+                    response = await hedged(send, latency, delay, send_again)
+                    if response.status_code < 500:
+                        if stream:
+                            latency.observe(time.monotonic() - started)
+                        else:
+                            try:
+                                latency.observe(response.elapsed.total_seconds())
+                            except RuntimeError:
+                                pass  # Responses that never went over the network carry no timing
+                    return response
+
+                response = await fetch(method, url, wrap_attempt=attempt, stream=stream, **kwargs)
+            else:
+                response = await fetch(method, url, stream=stream, **kwargs)
+        except httpx.HTTPError as e:
+            metrics.failures += 1
+            breaker.record(True, time.monotonic() - start, str(e) or type(e).__name__)
+            raise
+        except asyncio.CancelledError:
+            # The caller gave up; only a call that was already slow says something about the source
+            elapsed = time.monotonic() - start
+            if elapsed >= breaker.policy.slow_call_seconds:
+                breaker.record(True, elapsed)
+            else:
+                breaker.release()
+            raise
+        except Exception:
+            # Not the source's fault as far as we can tell (e.g. a bug in a
+            # hook), but a half-open probe slot must not stay claimed forever
+            metrics.failures += 1
+            breaker.release()
+            raise
+        finally:
+            metrics.seconds += time.monotonic() - start
+        if response.status_code >= 400:
+            metrics.failures += 1
+        failed = self.is_failure(response)
+        breaker.record(failed, time.monotonic() - start, f"HTTP {response.status_code}" if failed else "")
+        return response
+
+    async def search(self, query: str, max_results: int = 10, **kwargs) -> List[Paper]:
+        raise self.unsupported(SEARCH)
+
+    async def download_pdf(self, paper_id: str, save_path: str) -> str:
+        raise self.unsupported(DOWNLOAD)
+
+    async def read_paper(self, paper_id: str, save_path: str = "./downloads",
+                         pages: Optional[str] = None, max_chars: Optional[int] = None) -> str:
+        raise self.unsupported(READ)
+
+    async def get_paper(self, paper_id: str) -> Optional[Paper]:
+        """Look up one paper by its ID on this source (None if unknown)."""
+        raise self.unsupported(LOOKUP)
+
+    async def get_papers(self, paper_ids: List[str]) -> List[Optional[Paper]]:
+        """
+        Look up many papers; one entry per ID, in order (None if unknown).
+
+        Sources with a batch endpoint override this; the default runs
+        get_paper() concurrently. When some lookups fail, overrides raise
+        BatchLookupError with the results of the others.
+        """
+        if not self.supports(LOOKUP):
+            raise self.unsupported(BATCH)
+        semaphore = asyncio.Semaphore(LOOKUP_CONCURRENCY)
+
+        async def one(paper_id: str) -> Optional[Paper]:
+            async with semaphore:
+                return await self.get_paper(paper_id)
+
+        return list(await asyncio.gather(*(one(paper_id) for paper_id in paper_ids)))
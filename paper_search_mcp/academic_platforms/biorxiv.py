@@ -1,100 +1,61 @@
-from typing import List
-import httpx
+from typing import List, Optional
+import asyncio
 import os
-from datetime import datetime, timedelta
 from ..paper import Paper
-from PyPDF2 import PdfReader
+from .base import PaperSource, SEARCH, DOWNLOAD, READ
+from ..rxiv import SEARCH_MODES, search_window, keyword_search
+from ..pdf_store import get_pdf_store, pdf_aliases
+from ..download import download_to_store
+from ..extraction import get_extractor
 
-class PaperSource:
-    """Abstract base class for paper sources"""
-    def search(self, query: str, **kwargs) -> List[Paper]:
-        raise NotImplementedError
-
-    def download_pdf(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
+class BioRxivSearcher(PaperSource):
+    """
+    Searcher for bioRxiv papers. medRxiv shares the API and site layout, so
+    MedRxivSearcher only swaps the server name; `name` doubles as the server
+    in API, mirror and PDF URLs.
+    """
 
-    def read_paper(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
+    name = "biorxiv"
+    description = "bioRxiv - Preprint server for biology"
+    capabilities = frozenset({SEARCH, DOWNLOAD, READ})
 
-class BioRxivSearcher(PaperSource):
-    """Searcher for bioRxiv papers"""
     BASE_URL = "https://api.biorxiv.org/details/biorxiv"
 
     def __init__(self):
         self.timeout = 30
-        self.max_retries = 3
 
-    async def search(self, query: str, max_results: int = 10, days: int = 30) -> List[Paper]:
+    async def search(self, query: str, max_results: int = 10, days: int = 30,
+                     mode: str = "category") -> List[Paper]:
         """
-        Search for papers on bioRxiv by category within the last N days.
+        Search for papers on the server by category within the last N days, or by keyword.
 
         Args:
-            query: Category name to search for (e.g., "cell biology").
+            query: Category name to search for (e.g., "cell biology" on bioRxiv,
+                "cardiovascular medicine" on medRxiv), or keywords
+                in keyword mode.
             max_results: Maximum number of papers to return.
-            days: Number of days to look back for papers.
+            days: Number of days to look back for papers (category mode).
+            mode: "category" to list a category's recent postings, or "keyword"
+                for BM25-ranked matches in titles and abstracts of the local
+                mirror of recent postings.
 
         Returns:
-            List of Paper objects matching the category within the specified date range.
+            List of Paper objects: in posting order for category mode, best
+            match first (with extra["score"]) for keyword mode.
         """
-        # Calculate date range: last N days
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        
-        # Format category: lowercase and replace spaces with underscores
-        category = query.lower().replace(' ', '_')
-        
-        papers = []
-        cursor = 0
-        async with httpx.AsyncClient() as client:
-            while len(papers) < max_results:
-                url = f"{self.BASE_URL}/{start_date}/{end_date}/{cursor}"
-                if category:
-                    url += f"?category={category}"
-                tries = 0
-                while tries < self.max_retries:
-                    try:
-                        response = await client.get(url, timeout=self.timeout)
-                        response.raise_for_status()
-                        data = response.json()
-                        collection = data.get('collection', [])
-                        for item in collection:
-                            try:
-                                date = datetime.strptime(item['date'], '%Y-%m-%d')
-                                papers.append(Paper(
-                                    paper_id=item['doi'],
-                                    title=item['title'],
-                                    authors=item['authors'].split('; '),
-                                    abstract=item['abstract'],
-                                    url=f"https://www.biorxiv.org/content/{item['doi']}v{item.get('version', '1')}",
-                                    pdf_url=f"https://www.biorxiv.org/content/{item['doi']}v{item.get('version', '1')}.full.pdf",
-                                    published_date=date,
-                                    updated_date=date,
-                                    source="biorxiv",
-                                    categories=[item['category']],
-                                    keywords=[],
-                                    doi=item['doi']
-                                ))
-                            except Exception as e:
-                                print(f"Error parsing bioRxiv entry: {e}")
-                        if len(collection) < 100:
-                            break  # No more results
-                        cursor += 100
-                        break  # Exit retry loop on success
-                    except httpx.HTTPError as e:
-                        tries += 1
-                        if tries == self.max_retries:
-                            print(f"Failed to connect to bioRxiv API after {self.max_retries} attempts: {e}")
-                            break
-                        print(f"Attempt {tries} failed, retrying...")
-                else:
-                    continue
-                break
-
-        return papers[:max_results]
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}' (use one of: {', '.join(SEARCH_MODES)})")
+        if mode == "keyword":
+            return await keyword_search(self.name, query, max_results, timeout=self.timeout,
+                                        request=self.request)
+        # Served from the local day-partitioned record store; only days not
+        # stored yet are fetched, their cursor pages concurrently
+        return await search_window(self.name, query, days, max_results, timeout=self.timeout,
+                                   request=self.request)
 
     async def download_pdf(self, paper_id: str, save_path: str) -> str:
         """
-        Download a PDF for a given paper ID from bioRxiv.
+        Download a PDF for a given paper ID from the server.
 
         Args:
             paper_id: The DOI of the paper.
@@ -106,49 +67,44 @@ class BioRxivSearcher(PaperSource):
         if not paper_id:
             raise ValueError("Invalid paper_id: paper_id is empty")
 
-        pdf_url = f"https://www.biorxiv.org/content/{paper_id}v1.full.pdf"
-        tries = 0
-        async with httpx.AsyncClient() as client:
-            while tries < self.max_retries:
-                try:
-                    # Add User-Agent to avoid potential 403 errors
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                    }
-                    response = await client.get(pdf_url, timeout=self.timeout, headers=headers)
-                    response.raise_for_status()
-                    os.makedirs(save_path, exist_ok=True)
-                    output_file = f"{save_path}/{paper_id.replace('/', '_')}.pdf"
-                    with open(output_file, 'wb') as f:
-                        f.write(response.content)
-                    return output_file
-                except httpx.HTTPError as e:
-                    tries += 1
-                    if tries == self.max_retries:
-                        raise Exception(f"Failed to download PDF after {self.max_retries} attempts: {e}")
-                    print(f"Attempt {tries} failed, retrying...")
-    
-    async def read_paper(self, paper_id: str, save_path: str = "./downloads") -> str:
+        # Serve from the PDF store if any source already fetched this paper
+        store = get_pdf_store()
+        aliases = pdf_aliases(doi=paper_id)
+        filename = f"{paper_id.replace('/', '_')}.pdf"
+        cached_file = await asyncio.to_thread(store.lookup, aliases, save_path, filename)
+        if cached_file:
+            return cached_file
+
+        pdf_url = f"https://www.{self.name}.org/content/{paper_id}v1.full.pdf"
+        # Add User-Agent to avoid potential 403 errors; retries, Range resume
+        # and the circuit breaker are handled by the request pipeline
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        result = await download_to_store(pdf_url, aliases, save_path, filename,
+                                         headers=headers, timeout=self.timeout, source=self)
+        return result.path
+
+    async def read_paper(self, paper_id: str, save_path: str = "./downloads",
+                         pages: Optional[str] = None, max_chars: Optional[int] = None) -> str:
         """
         Read a paper and convert it to text format.
-        
+
         Args:
-            paper_id: bioRxiv DOI
+            paper_id: bioRxiv or medRxiv DOI
             save_path: Directory where the PDF is/will be saved
-            
+            pages: 1-based page selection such as '1-5,8,10-' (default: all pages)
+            max_chars: Stop reading after this many characters (default: no limit)
+
         Returns:
             str: The extracted text content of the paper
         """
         pdf_path = f"{save_path}/{paper_id.replace('/', '_')}.pdf"
         if not os.path.exists(pdf_path):
             pdf_path = await self.download_pdf(paper_id, save_path)
-        
+
         try:
-            reader = PdfReader(pdf_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            return await get_extractor().read_text(pdf_path, pages, max_chars)
         except Exception as e:
             print(f"Error reading PDF for paper {paper_id}: {e}")
             return ""
\ No newline at end of file
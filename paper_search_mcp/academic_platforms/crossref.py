@@ -1,105 +1,169 @@
 # paper_search_mcp/academic_platforms/crossref.py
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime
-import httpx
 import time
-import random
+import asyncio
+import httpx
 from ..paper import Paper
+from .base import PaperSource, SEARCH, LOOKUP, BATCH
+from ..dedup import normalize_doi
+from ..cache import SearchCache, get_search_cache, cache_enabled
 import logging
 
 logger = logging.getLogger(__name__)
 
-class PaperSource:
-    """Abstract base class for paper sources"""
-    def search(self, query: str, **kwargs) -> List[Paper]:
-        raise NotImplementedError
-
-    def download_pdf(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
-
-    async def read_paper(self, paper_id: str, save_path: str = "./downloads") -> str:
-        raise NotImplementedError
+# CrossRef returns at most this many rows per request
+MAX_ROWS = 1000
+# DOIs per `filter=doi:...,doi:...` query in resolve_dois (keeps URLs short)
+DOI_FILTER_BATCH = 50
+# Concurrent requests allowed in CrossRef's polite pool
+POLITE_CONCURRENCY = 3
+# Resolved DOI metadata is reused for this long before being fetched again
+DOI_CACHE_DAYS = 30
 
 class CrossRefSearcher(PaperSource):
     """Searcher for CrossRef database papers"""
-    
+
+    name = "crossref"
+    description = "CrossRef - Citation linking service"
+    capabilities = frozenset({SEARCH, LOOKUP, BATCH})
+    hedge_requests = True
+
     BASE_URL = "https://api.crossref.org"
-    
+
     # User agent for polite API usage as per CrossRef etiquette
     USER_AGENT = "paper-search-mcp/0.1.3 (https://github.com/Dragonatorul/paper-search-mcp; mailto:paper-search@example.org)"
-    
-    def __init__(self):
+
+    def __init__(self, doi_cache: SearchCache = None, concurrency: int = POLITE_CONCURRENCY):
+        """
+        Args:
+            doi_cache: Cache for resolved DOIs (default: the shared search
+                cache, unless PAPER_SEARCH_CACHE=off)
+            concurrency: Requests in flight at once in resolve_dois()
+        """
         self.headers = {
             'User-Agent': self.USER_AGENT,
             'Accept': 'application/json'
         }
-    
-    async def search(self, query: str, max_results: int = 10, **kwargs) -> List[Paper]:
+        self._doi_cache = doi_cache
+        self.concurrency = concurrency
+
+    @property
+    def doi_cache(self) -> Optional[SearchCache]:
+        if self._doi_cache is not None:
+            return self._doi_cache
+        return get_search_cache() if cache_enabled() else None
+
+    async def search(self, query: str, max_results: int = 10, filter: str = None,
+                     sort: str = None, order: str = None, select: str = None,
+                     **kwargs) -> List[Paper]:
         """
         Search CrossRef database for papers.
-        
+
+        Results beyond one page (1000 rows) are fetched with cursor deep paging.
+
         Args:
             query: Search query string
             max_results: Maximum number of results to return (default: 10)
-            **kwargs: Additional parameters like filters, sort, etc.
-            
+            filter: CrossRef filter string, e.g. 'from-pub-date:2020,has-full-text:true'
+            sort: Sort field (default: relevance)
+            order: Sort order, 'asc' or 'desc' (default: desc)
+            select: Comma-separated fields to return, e.g. 'DOI,title,issued'
+            **kwargs: Ignored; accepted for compatibility with other searchers
+
         Returns:
             List of Paper objects
         """
-        try:
-            params = {
-                'query': query,
-                'rows': min(max_results, 1000),  # CrossRef API max is 1000
-                'sort': 'relevance',
-                'order': 'desc'
-            }
-            
-            # Add any additional filters from kwargs
-            if 'filter' in kwargs:
-                params['filter'] = kwargs['filter']
-            if 'sort' in kwargs:
-                params['sort'] = kwargs['sort']
-            if 'order' in kwargs:
-                params['order'] = kwargs['order']
-                
-            # Add polite pool parameter
-            params['mailto'] = 'paper-search@example.org'
-            
-            url = f"{self.BASE_URL}/works"
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=30, headers=self.headers)
-                
-                if response.status_code == 429:
-                    # Rate limited - wait and retry once
-                    logger.warning("Rate limited by CrossRef API, waiting 2 seconds...")
-                    time.sleep(2)
-                    response = await client.get(url, params=params, timeout=30, headers=self.headers)
-                
-                response.raise_for_status()
-                data = response.json()
-            
-            papers = []
-            items = data.get('message', {}).get('items', [])
-            
-            for item in items:
-                try:
-                    paper = self._parse_crossref_item(item)
-                    if paper:
-                        papers.append(paper)
-                except Exception as e:
-                    logger.warning(f"Error parsing CrossRef item: {e}")
-                    continue
-                    
+        papers = []
+        if max_results <= 0:
             return papers
-            
+        try:
+            async for paper in self.iter_works(query, filter=filter, sort=sort, order=order,
+                                               select=select, max_results=max_results):
+                papers.append(paper)
         except httpx.HTTPError as e:
             logger.error(f"Error searching CrossRef: {e}")
-            return []
         except Exception as e:
             logger.error(f"Unexpected error in CrossRef search: {e}")
-            return []
-    
+        # On a failure deep into paging, keep the pages already received
+        return papers
+
+    async def iter_works(self, query: str = None, filter: str = None, sort: str = None,
+                         order: str = None, select: str = None, max_results: int = None,
+                         rows: int = MAX_ROWS) -> AsyncIterator[Paper]:
+        """
+        Stream CrossRef works page by page using cursor deep paging.
+
+        The next page is requested as soon as the current one arrives, so the
+        download overlaps with parsing and with whatever the caller does per
+        paper. At most two pages are held in memory, whatever the total.
+
+        Args:
+            query: Search query string (None to page through a filter only)
+            filter: CrossRef filter string
+            sort: Sort field (default: relevance, or none without a query)
+            order: Sort order, 'asc' or 'desc'
+            select: Comma-separated fields to return; smaller pages for callers
+                that only need, e.g., 'DOI,title,issued'
+            max_results: Stop after this many works (default: all)
+            rows: Works per page (at most 1000)
+
+        Yields:
+            Paper objects in result order
+
+        Raises:
+            httpx.HTTPError: If a page cannot be fetched
+        """
+        params = {'cursor': '*', 'mailto': 'paper-search@example.org'}
+        if query:
+            params['query'] = query
+            params['sort'] = 'relevance'
+            params['order'] = 'desc'
+        if filter:
+            params['filter'] = filter
+        if sort:
+            params['sort'] = sort
+        if order:
+            params['order'] = order
+        if select:
+            params['select'] = select
+        rows = max(1, min(rows, MAX_ROWS))
+
+        remaining = max_results
+        next_page = asyncio.ensure_future(self._fetch_page(params, self._page_rows(rows, remaining)))
+        try:
+            while next_page is not None:
+                message = await next_page
+                next_page = None
+                items = message.get('items', [])
+                if remaining is not None:
+                    items = items[:remaining]
+                    remaining -= len(items)
+                cursor = message.get('next-cursor')
+                # Request the following page before parsing this one
+                if items and cursor and remaining != 0:
+                    params = dict(params, cursor=cursor)
+                    next_page = asyncio.ensure_future(
+                        self._fetch_page(params, self._page_rows(rows, remaining)))
+                for item in items:
+                    paper = self._parse_crossref_item(item)
+                    if paper:
+                        yield paper
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    @staticmethod
+    def _page_rows(rows: int, remaining: Optional[int]) -> int:
+        return rows if remaining is None else min(rows, remaining)
+
+    async def _fetch_page(self, params: Dict[str, Any], rows: int) -> Dict[str, Any]:
+        # Paced per host and retried on 429/5xx (honouring Retry-After)
+        response = await self.request("GET", f"{self.BASE_URL}/works", params=dict(params, rows=rows),
+                                      timeout=30, headers=self.headers)
+        response.raise_for_status()
+        return response.json().get('message', {})
+
     def _parse_crossref_item(self, item: Dict[str, Any]) -> Optional[Paper]:
         """Parse a CrossRef API item into a Paper object."""
         try:
@@ -108,34 +172,34 @@ class CrossRefSearcher(PaperSource):
             title = self._extract_title(item)
             authors = self._extract_authors(item)
             abstract = item.get('abstract', '')
-            
+
             # Extract publication date
             published_date = self._extract_date(item, 'published')
             if not published_date:
                 published_date = self._extract_date(item, 'issued')
             if not published_date:
                 published_date = self._extract_date(item, 'created')
-            
+
             # Default to epoch if no date found
             if not published_date:
                 published_date = datetime(1970, 1, 1)
-            
+
             # Extract URLs
             url = item.get('URL', f"https://doi.org/{doi}" if doi else '')
             pdf_url = self._extract_pdf_url(item)
-            
+
             # Extract additional metadata
             container_title = self._extract_container_title(item)
             publisher = item.get('publisher', '')
             categories = [item.get('type', '')]
-            
+
             # Extract subjects/keywords if available
             subjects = item.get('subject', [])
             if isinstance(subjects, list):
                 keywords = subjects
             else:
                 keywords = []
-            
+
             return Paper(
                 paper_id=doi,
                 title=title,
@@ -162,23 +226,23 @@ class CrossRefSearcher(PaperSource):
                     'prefix': item.get('prefix', '')
                 }
             )
-            
+
         except Exception as e:
             logger.error(f"Error parsing CrossRef item: {e}")
             return None
-    
+
     def _extract_title(self, item: Dict[str, Any]) -> str:
         """Extract title from CrossRef item."""
         titles = item.get('title', [])
         if isinstance(titles, list) and titles:
             return titles[0]
         return str(titles) if titles else ''
-    
+
     def _extract_authors(self, item: Dict[str, Any]) -> List[str]:
         """Extract author names from CrossRef item."""
         authors = []
         author_list = item.get('author', [])
-        
+
         for author in author_list:
             if isinstance(author, dict):
                 given = author.get('given', '')
@@ -189,19 +253,19 @@ class CrossRefSearcher(PaperSource):
                     authors.append(family)
                 elif given:
                     authors.append(given)
-                    
+
         return authors
-    
+
     def _extract_date(self, item: Dict[str, Any], date_field: str) -> Optional[datetime]:
         """Extract date from CrossRef item."""
         date_info = item.get(date_field, {})
         if not date_info:
             return None
-            
+
         date_parts = date_info.get('date-parts', [])
         if not date_parts or not date_parts[0]:
             return None
-            
+
         parts = date_parts[0]
         try:
             year = parts[0] if len(parts) > 0 else 1970
@@ -210,14 +274,14 @@ class CrossRefSearcher(PaperSource):
             return datetime(year, month, day)
         except (ValueError, IndexError):
             return None
-    
+
     def _extract_container_title(self, item: Dict[str, Any]) -> str:
         """Extract container title (journal/book title) from CrossRef item."""
         container_titles = item.get('container-title', [])
         if isinstance(container_titles, list) and container_titles:
             return container_titles[0]
         return str(container_titles) if container_titles else ''
-    
+
     def _extract_pdf_url(self, item: Dict[str, Any]) -> str:
         """Extract PDF URL from CrossRef item."""
         # Check for link in the resource field
@@ -226,7 +290,7 @@ class CrossRefSearcher(PaperSource):
             primary = resource.get('primary', {})
             if primary and primary.get('URL', '').endswith('.pdf'):
                 return primary['URL']
-        
+
         # Check in links array
         links = item.get('link', [])
         for link in links:
@@ -234,17 +298,17 @@ class CrossRefSearcher(PaperSource):
                 content_type = link.get('content-type', '')
                 if 'pdf' in content_type.lower():
                     return link.get('URL', '')
-                    
+
         return ''
-    
-    def download_pdf(self, paper_id: str, save_path: str) -> str:
+
+    async def download_pdf(self, paper_id: str, save_path: str) -> str:
         """
         CrossRef doesn't provide direct PDF downloads.
-        
+
         Args:
             paper_id: DOI of the paper
             save_path: Directory to save the PDF
-            
+
         Raises:
             NotImplementedError: Always raises this error as CrossRef doesn't provide direct PDF access
         """
@@ -252,15 +316,15 @@ class CrossRefSearcher(PaperSource):
                   "CrossRef is a citation database that provides metadata about academic papers. "
                   "To access the full text, please use the paper's DOI or URL to visit the publisher's website.")
         raise NotImplementedError(message)
-    
+
     async def read_paper(self, paper_id: str, save_path: str = "./downloads") -> str:
         """
         CrossRef doesn't provide direct paper content access.
-        
+
         Args:
             paper_id: DOI of the paper
             save_path: Directory for potential PDF storage (unused)
-            
+
         Returns:
             str: Error message indicating PDF reading is not supported
         """
@@ -270,33 +334,40 @@ class CrossRefSearcher(PaperSource):
                   "To access the full text, please use the paper's DOI or URL to visit the publisher's website.")
         return message
 
+    async def get_paper(self, paper_id: str) -> Optional[Paper]:
+        """Look up one paper by DOI."""
+        return await self.get_paper_by_doi(normalize_doi(paper_id))
+
+    async def get_papers(self, paper_ids: List[str]) -> List[Optional[Paper]]:
+        """Look up many papers by DOI (see resolve_dois())."""
+        return await self.resolve_dois(paper_ids)
+
     async def get_paper_by_doi(self, doi: str) -> Optional[Paper]:
         """
         Get a specific paper by DOI.
-        
+
         Args:
             doi: Digital Object Identifier
-            
+
         Returns:
             Paper object if found, None otherwise
         """
         try:
             url = f"{self.BASE_URL}/works/{doi}"
             params = {'mailto': 'paper-search@example.org'}
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=30, headers=self.headers)
-                
-                if response.status_code == 404:
-                    logger.warning(f"DOI not found in CrossRef: {doi}")
-                    return None
-                    
-                response.raise_for_status()
-                data = response.json()
-                
-                item = data.get('message', {})
-                return self._parse_crossref_item(item)
-                
+
+            response = await self.request("GET", url, params=params, timeout=30, headers=self.headers)
+
+            if response.status_code == 404:
+                logger.warning(f"DOI not found in CrossRef: {doi}")
+                return None
+
+            response.raise_for_status()
+            data = response.json()
+
+            item = data.get('message', {})
+            return self._parse_crossref_item(item)
+
         except httpx.HTTPError as e:
             logger.error(f"Error fetching DOI {doi} from CrossRef: {e}")
             return None
@@ -304,14 +375,88 @@ class CrossRefSearcher(PaperSource):
             logger.error(f"Unexpected error fetching DOI {doi}: {e}")
             return None
 
+    async def resolve_dois(self, dois: List[str]) -> List[Optional[Paper]]:
+        """
+        Resolve many DOIs at once.
+
+        DOIs are normalized (resolver prefixes stripped, lowercased) and
+        deduplicated. Known ones come from the cache; the rest are looked up
+        with `filter=doi:` queries of up to DOI_FILTER_BATCH DOIs, and any a
+        query didn't return are fetched one by one. Requests run
+        concurrently, bounded by the polite-pool concurrency and the
+        CrossRef rate limit.
+
+        Args:
+            dois: DOIs in any common notation ('10.1/x', 'doi:10.1/x',
+                'https://doi.org/10.1/x')
+
+        Returns:
+            One entry per input DOI, in order: the Paper, or None if the DOI
+            is malformed or unknown to CrossRef
+        """
+        wanted = list(dict.fromkeys(d for d in map(normalize_doi, dois) if d.startswith('10.')))
+        cache = self.doi_cache
+        # Cache entries are versioned by period, so they expire together
+        version = str(int(time.time() // (DOI_CACHE_DAYS * 86400)))
+        found: Dict[str, Paper] = {}
+        if cache:
+            for doi in wanted:
+                paper = await asyncio.to_thread(cache.get_details, "crossref", doi, version)
+                if paper:
+                    found[doi] = paper
+        missing = [doi for doi in wanted if doi not in found]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def query_batch(batch: List[str]) -> None:
+            async with semaphore:
+                papers = await self._query_dois(batch)
+            for paper in papers:
+                found[normalize_doi(paper.doi)] = paper
+
+        async def query_one(doi: str) -> None:
+            async with semaphore:
+                paper = await self.get_paper_by_doi(doi)
+            if paper:
+                found[doi] = paper
+
+        # Commas separate filter values, so such DOIs can only be fetched alone
+        filterable = [doi for doi in missing if ',' not in doi]
+        await asyncio.gather(*(query_batch(filterable[i:i + DOI_FILTER_BATCH])
+                               for i in range(0, len(filterable), DOI_FILTER_BATCH)))
+        await asyncio.gather(*(query_one(doi) for doi in missing if doi not in found))
+
+        if cache:
+            for doi in missing:
+                if doi in found:
+                    await asyncio.to_thread(cache.put_details, "crossref", doi, version, found[doi])
+        return [found.get(normalize_doi(doi)) for doi in dois]
+
+    async def _query_dois(self, dois: List[str]) -> List[Paper]:
+        """Papers for a batch of DOIs from one `filter=doi:` query ([] on failure)."""
+        params = {
+            'filter': ','.join(f'doi:{doi}' for doi in dois),
+            'rows': len(dois),
+            'mailto': 'paper-search@example.org',
+        }
+        try:
+            response = await self.request("GET", f"{self.BASE_URL}/works", params=params,
+                                          timeout=30, headers=self.headers)
+            response.raise_for_status()
+            items = response.json().get('message', {}).get('items', [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"CrossRef DOI batch query failed, resolving one by one: {e}")
+            return []
+        return [paper for paper in map(self._parse_crossref_item, items) if paper]
+
 if __name__ == "__main__":
     import asyncio
-    
+
     async def main():
         # Test CrossRefSearcher functionality
         # 测试CrossRefSearcher功能
         searcher = CrossRefSearcher()
-        
+
         # Test search functionality
         # 测试搜索功能
         print("Testing search functionality...")
@@ -331,7 +476,7 @@ if __name__ == "__main__":
                 print()
         except Exception as e:
             print(f"Error during search: {e}")
-        
+
         # Test DOI lookup functionality
         # 测试DOI查找功能
         if papers:
@@ -345,7 +490,7 @@ if __name__ == "__main__":
                     print("Failed to retrieve paper by DOI")
             except Exception as e:
                 print(f"Error during DOI lookup: {e}")
-        
+
         # Test PDF download functionality (will return unsupported message)
         # 测试PDF下载功能（会返回不支持的提示）
         if papers:
@@ -355,7 +500,7 @@ if __name__ == "__main__":
                 pdf_path = searcher.download_pdf(paper_id, "./downloads")
             except NotImplementedError as e:
                 print(f"Expected error: {e}")
-        
+
         # Test paper reading functionality (will return unsupported message)
         # 测试论文阅读功能（会返回不支持的提示）
         if papers:
@@ -363,5 +508,5 @@ if __name__ == "__main__":
             paper_id = papers[0].doi
             message = searcher.read_paper(paper_id)
             print(f"Message: {message}")
-    
+
     asyncio.run(main())
\ No newline at end of file
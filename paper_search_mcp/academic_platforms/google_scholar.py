@@ -1,30 +1,23 @@
 from typing import List, Optional
 from datetime import datetime
-import httpx
 from bs4 import BeautifulSoup
-import time
 import random
 from ..paper import Paper
+from .base import PaperSource, SEARCH
 import logging
 
 logger = logging.getLogger(__name__)
 
-class PaperSource:
-    """Abstract base class for paper sources"""
-    def search(self, query: str, **kwargs) -> List[Paper]:
-        raise NotImplementedError
-
-    def download_pdf(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
-
-    def read_paper(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
-    
-
 class GoogleScholarSearcher(PaperSource):
     """Custom implementation of Google Scholar paper search"""
-    
+
+    name = "google_scholar"
+    description = "Google Scholar - Academic search engine"
+    capabilities = frozenset({SEARCH})
+
     SCHOLAR_URL = "https://scholar.google.com/scholar"
+    # Markers of the page Scholar serves instead of results when it blocks a client
+    CAPTCHA_MARKERS = ("gs_captcha", "/sorry/", "not a robot", "unusual traffic")
     BROWSERS = [
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)",
@@ -38,6 +31,15 @@ class GoogleScholarSearcher(PaperSource):
             'Accept-Language': 'en-US,en;q=0.9'
         }
 
+    def is_failure(self, response) -> bool:
+        """Blocks count against the breaker, including CAPTCHA pages served with a 200."""
+        if super().is_failure(response):
+            return True
+        if "/sorry/" in str(response.url):
+            return True
+        text = response.text[:20000].lower()
+        return "gs_ri" not in text and any(marker in text for marker in self.CAPTCHA_MARKERS)
+
     def _extract_year(self, text: str) -> Optional[int]:
         """Extract year from publication info"""
         for word in text.split():
@@ -94,53 +96,51 @@ class GoogleScholarSearcher(PaperSource):
         start = 0
         results_per_page = min(10, max_results)
 
-        async with httpx.AsyncClient() as client:
-            while len(papers) < max_results:
-                try:
-                    # Construct search parameters
-                    params = {
-                        'q': query,
-                        'start': start,
-                        'hl': 'en',
-                        'as_sdt': '0,5'  # Include articles and citations
-                    }
-
-                    # Make request with random delay
-                    time.sleep(random.uniform(1.0, 3.0))
-                    response = await client.get(self.SCHOLAR_URL, params=params, headers=self.headers)
-                    
-                    if response.status_code != 200:
-                        logger.error(f"Search failed with status {response.status_code}")
-                        break
+        while len(papers) < max_results:
+            try:
+                # Construct search parameters
+                params = {
+                    'q': query,
+                    'start': start,
+                    'hl': 'en',
+                    'as_sdt': '0,5'  # Include articles and citations
+                }
+
+                # The scholar.google.com rate limit spaces pages out with a random delay
+                response = await self.request("GET", self.SCHOLAR_URL, params=params, headers=self.headers)
+
+                if response.status_code != 200:
+                    logger.error(f"Search failed with status {response.status_code}")
+                    break
 
-                    # Parse results
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    results = soup.find_all('div', class_='gs_ri')
+                # Parse results
+                soup = BeautifulSoup(response.text, 'html.parser')
+                results = soup.find_all('div', class_='gs_ri')
 
-                    if not results:
+                if not results:
+                    break
+
+                # Process each result
+                for item in results:
+                    if len(papers) >= max_results:
                         break
 
-                    # Process each result
-                    for item in results:
-                        if len(papers) >= max_results:
-                            break
-                            
-                        paper = self._parse_paper(item)
-                        if paper:
-                            papers.append(paper)
+                    paper = self._parse_paper(item)
+                    if paper:
+                        papers.append(paper)
 
-                    start += results_per_page
+                start += results_per_page
 
-                except Exception as e:
-                    logger.error(f"Search error: {e}")
-                    break
+            except Exception as e:
+                logger.error(f"Search error: {e}")
+                break
 
         return papers[:max_results]
 
-    def download_pdf(self, paper_id: str, save_path: str) -> str:
+    async def download_pdf(self, paper_id: str, save_path: str) -> str:
         """
         Google Scholar doesn't support direct PDF downloads
-        
+
         Raises:
             NotImplementedError: Always raises this error
         """
@@ -149,10 +149,10 @@ class GoogleScholarSearcher(PaperSource):
             "Please use the paper URL to access the publisher's website."
         )
 
-    def read_paper(self, paper_id: str, save_path: str = "./downloads") -> str:
+    async def read_paper(self, paper_id: str, save_path: str = "./downloads") -> str:
         """
         Google Scholar doesn't support direct paper reading
-        
+
         Returns:
             str: Message indicating the feature is not supported
         """
@@ -163,15 +163,15 @@ class GoogleScholarSearcher(PaperSource):
 
 if __name__ == "__main__":
     import asyncio
-    
+
     async def main():
         # Test Google Scholar searcher
         searcher = GoogleScholarSearcher()
-        
+
         print("Testing search functionality...")
         query = "machine learning"
         max_results = 5
-        
+
         try:
             papers = await searcher.search(query, max_results=max_results)
             print(f"\nFound {len(papers)} papers for query '{query}':")
@@ -182,5 +182,5 @@ if __name__ == "__main__":
                 print(f"   URL: {paper.url}")
         except Exception as e:
             print(f"Error during search: {e}")
-    
+
     asyncio.run(main())
\ No newline at end of file
@@ -1,33 +1,30 @@
 from typing import List, Optional
 from datetime import datetime
+import asyncio
 import httpx
 from bs4 import BeautifulSoup
-import time
 import random
 from ..paper import Paper
+from .base import PaperSource, SEARCH, DOWNLOAD, READ, LOOKUP
+from ..pdf_store import get_pdf_store, pdf_aliases
+from ..download import download_to_store
+from ..extraction import get_extractor
+from ..cache import SearchCache, paper_to_json, paper_from_json, get_search_cache, cache_enabled
 import logging
-from PyPDF2 import PdfReader
-import os
 
 logger = logging.getLogger(__name__)
 
-
-class PaperSource:
-    """Abstract base class for paper sources"""
-
-    def search(self, query: str, **kwargs) -> List[Paper]:
-        raise NotImplementedError
-
-    def download_pdf(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
-
-    def read_paper(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
+# Detail pages fetched at once while enriching search results
+DETAIL_CONCURRENCY = 8
 
 
 class IACRSearcher(PaperSource):
     """IACR ePrint Archive paper search implementation"""
 
+    name = "iacr"
+    description = "IACR ePrint - Cryptology preprint archive"
+    capabilities = frozenset({SEARCH, DOWNLOAD, READ, LOOKUP})
+
     IACR_SEARCH_URL = "https://eprint.iacr.org/search"
     IACR_BASE_URL = "https://eprint.iacr.org"
     BROWSERS = [
@@ -36,12 +33,26 @@ class IACRSearcher(PaperSource):
         "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
     ]
 
-    def __init__(self):
+    def __init__(self, detail_cache: SearchCache = None, detail_concurrency: int = DETAIL_CONCURRENCY):
+        """
+        Args:
+            detail_cache: Cache for detail pages (default: the shared search
+                cache, unless PAPER_SEARCH_CACHE=off)
+            detail_concurrency: Detail pages fetched at once by search()
+        """
         self.headers = {
             "User-Agent": random.choice(self.BROWSERS),
             "Accept": "text/html,application/xhtml+xml",
             "Accept-Language": "en-US,en;q=0.9",
         }
+        self._detail_cache = detail_cache
+        self.detail_concurrency = detail_concurrency
+
+    @property
+    def detail_cache(self) -> Optional[SearchCache]:
+        if self._detail_cache is not None:
+            return self._detail_cache
+        return get_search_cache() if cache_enabled() else None
 
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """Parse date from IACR format (e.g., '2025-06-02')"""
@@ -51,8 +62,8 @@ class IACRSearcher(PaperSource):
             logger.warning(f"Could not parse date: {date_str}")
             return None
 
-    def _parse_paper(self, item, fetch_details: bool = True) -> Optional[Paper]:
-        """Parse single paper entry from IACR HTML and optionally fetch detailed info"""
+    def _parse_paper(self, item) -> Optional[Paper]:
+        """Parse single paper entry from IACR search results HTML"""
         try:
             # Extract paper ID from the search result
             header_div = item.find("div", class_="d-flex")
@@ -66,18 +77,6 @@ class IACRSearcher(PaperSource):
 
             paper_id = paper_link.get_text(strip=True)  # e.g., "2025/1014"
 
-            if fetch_details:
-                # Fetch detailed information for this paper
-                logger.info(f"Fetching detailed info for paper {paper_id}")
-                detailed_paper = await self.get_paper_details(paper_id)
-                if detailed_paper:
-                    return detailed_paper
-                else:
-                    logger.warning(
-                        f"Could not fetch details for {paper_id}, falling back to search result parsing"
-                    )
-
-            # Fallback: parse from search results if detailed fetch fails or is disabled
             paper_url = self.IACR_BASE_URL + paper_link["href"]
 
             # Get PDF URL
@@ -164,35 +163,65 @@ class IACRSearcher(PaperSource):
             params = {"q": query}
 
             # Make request
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.IACR_SEARCH_URL, params=params, headers=self.headers)
-                response.raise_for_status()
+            response = await self.request("GET", self.IACR_SEARCH_URL, params=params, headers=self.headers)
+            response.raise_for_status()
 
-                # Parse results
-                soup = BeautifulSoup(response.text, "html.parser")
+            # Parse results
+            soup = BeautifulSoup(response.text, "html.parser")
 
-                # Find all paper entries - they are divs with class "mb-4"
-                results = soup.find_all("div", class_="mb-4")
+            # Find all paper entries - they are divs with class "mb-4"
+            results = soup.find_all("div", class_="mb-4")
 
-                if not results:
-                    logger.info("No results found for the query")
-                    return papers
+            if not results:
+                logger.info("No results found for the query")
+                return papers
 
-                # Process each result
-                for i, item in enumerate(results):
-                    if len(papers) >= max_results:
-                        break
+            # Process each result
+            for item in results:
+                if len(papers) >= max_results:
+                    break
+                paper = self._parse_paper(item)
+                if paper:
+                    papers.append(paper)
 
-                    logger.info(f"Processing paper {i+1}/{min(len(results), max_results)}")
-                    paper = self._parse_paper(item, fetch_details=fetch_details)
-                    if paper:
-                        papers.append(paper)
+            if fetch_details:
+                papers = await self._add_details(papers)
 
         except Exception as e:
             logger.error(f"IACR search error: {e}")
 
         return papers[:max_results]
 
+    async def _add_details(self, papers: List[Paper]) -> List[Paper]:
+        """
+        Replace search hits with their detail pages, fetched concurrently.
+
+        Details are cached per ePrint ID along with the hit's last-updated
+        date, so a page is fetched again only after the paper is revised.
+        A hit whose details can't be fetched is kept as is.
+        """
+        cache = self.detail_cache
+        semaphore = asyncio.Semaphore(self.detail_concurrency)
+
+        async def enrich(paper: Paper) -> Paper:
+            version = paper.updated_date.date().isoformat() if paper.updated_date else None
+            if cache and version:
+                detailed = await asyncio.to_thread(cache.get_details, "iacr", paper.paper_id, version)
+                if detailed:
+                    return detailed
+            async with semaphore:
+                detailed = await self.get_paper_details(paper.paper_id)
+            if not detailed:
+                logger.warning(f"Could not fetch details for {paper.paper_id}, using the search result")
+                return paper
+            # The search listing knows the category; the detail page doesn't show it
+            detailed.categories = detailed.categories or paper.categories
+            if cache and version:
+                await asyncio.to_thread(cache.put_details, "iacr", paper.paper_id, version, detailed)
+            return detailed
+
+        return list(await asyncio.gather(*(enrich(paper) for paper in papers)))
+
     async def download_pdf(self, paper_id: str, save_path: str) -> str:
         """
         Download PDF from IACR ePrint Archive
@@ -205,83 +234,80 @@ class IACRSearcher(PaperSource):
             str: Path to downloaded file or error message
         """
         try:
-            pdf_url = f"{self.IACR_BASE_URL}/{paper_id}.pdf"
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(pdf_url, headers=self.headers)
-                response.raise_for_status()
+            # Serve from the PDF store if this paper was fetched before
+            store = get_pdf_store()
+            aliases = pdf_aliases("iacr", paper_id)
+            filename = f"iacr_{paper_id.replace('/', '_')}.pdf"
+            cached_file = await asyncio.to_thread(store.lookup, aliases, save_path, filename)
+            if cached_file:
+                return cached_file
 
-                filename = f"{save_path}/iacr_{paper_id.replace('/', '_')}.pdf"
-                with open(filename, "wb") as f:
-                    f.write(response.content)
-                return filename
+            pdf_url = f"{self.IACR_BASE_URL}/{paper_id}.pdf"
+            result = await download_to_store(pdf_url, aliases, save_path, filename, headers=self.headers,
+                                             source=self)
+            return result.path
 
         except Exception as e:
             logger.error(f"PDF download error: {e}")
             return f"Error downloading PDF: {e}"
 
-    async def read_paper(self, paper_id: str, save_path: str = "./downloads") -> str:
+    async def read_paper(self, paper_id: str, save_path: str = "./downloads",
+                         pages: Optional[str] = None, max_chars: Optional[int] = None) -> str:
         """
         Download and extract text from IACR paper PDF
 
         Args:
             paper_id: IACR paper ID
             save_path: Directory to save downloaded PDF
+            pages: 1-based page selection such as '1-5,8,10-' (default: all pages)
+            max_chars: Stop reading after this many characters (default: no limit)
 
         Returns:
             str: Extracted text from the PDF or error message
         """
         try:
-            # First get paper details to get the PDF URL
-            paper = await self.get_paper_details(paper_id)
-            if not paper or not paper.pdf_url:
-                return f"Error: Could not find PDF URL for paper {paper_id}"
-
-            # Download the PDF
-            async with httpx.AsyncClient() as client:
-                pdf_response = await client.get(paper.pdf_url, timeout=30)
-                pdf_response.raise_for_status()
-
-                # Create download directory if it doesn't exist
-                os.makedirs(save_path, exist_ok=True)
-
-                # Save the PDF
-                filename = f"iacr_{paper_id.replace('/', '_')}.pdf"
-                pdf_path = os.path.join(save_path, filename)
-
-                with open(pdf_path, "wb") as f:
-                    f.write(pdf_response.content)
-
-                # Extract text using PyPDF2
-                reader = PdfReader(pdf_path)
-                text = ""
-
-                for page_num, page in enumerate(reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += f"\n--- Page {page_num + 1} ---\n"
-                            text += page_text + "\n"
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to extract text from page {page_num + 1}: {e}"
-                        )
-                        continue
-
-                if not text.strip():
-                    return (
-                        f"PDF downloaded to {pdf_path}, but unable to extract readable text"
-                    )
-
-                # Add paper metadata at the beginning
-                metadata = f"Title: {paper.title}\n"
-                metadata += f"Authors: {', '.join(paper.authors)}\n"
-                metadata += f"Published Date: {paper.published_date}\n"
-                metadata += f"URL: {paper.url}\n"
-                metadata += f"PDF downloaded to: {pdf_path}\n"
-                metadata += "=" * 80 + "\n\n"
-
-                return metadata + text.strip()
+            store = get_pdf_store()
+            aliases = pdf_aliases("iacr", paper_id)
+            filename = f"iacr_{paper_id.replace('/', '_')}.pdf"
+            sha256 = await asyncio.to_thread(store.find, aliases)
+            metadata = await asyncio.to_thread(store.get_metadata, sha256) if sha256 else {}
+
+            if metadata:
+                # Read before: both the PDF and its metadata are local
+                paper = paper_from_json(metadata)
+                pdf_path = await asyncio.to_thread(store.export, sha256, save_path, filename)
+            else:
+                # First get paper details to get the PDF URL
+                paper = await self.get_paper_details(paper_id)
+                if not paper or not paper.pdf_url:
+                    return f"Error: Could not find PDF URL for paper {paper_id}"
+
+                if sha256:
+                    await asyncio.to_thread(store.set_metadata, sha256, paper_to_json(paper))
+                    pdf_path = await asyncio.to_thread(store.export, sha256, save_path, filename)
+                else:
+                    # Download the PDF
+                    result = await download_to_store(paper.pdf_url, aliases, save_path, filename,
+                                                     metadata=paper_to_json(paper), timeout=30, source=self)
+                    pdf_path = result.path
+
+            # Extract text in a worker process, off the event loop
+            text = await get_extractor().read_text(pdf_path, pages, max_chars, page_markers=True)
+
+            if not text.strip():
+                return (
+                    f"PDF downloaded to {pdf_path}, but unable to extract readable text"
+                )
+
+            # Add paper metadata at the beginning
+            metadata = f"Title: {paper.title}\n"
+            metadata += f"Authors: {', '.join(paper.authors)}\n"
+            metadata += f"Published Date: {paper.published_date}\n"
+            metadata += f"URL: {paper.url}\n"
+            metadata += f"PDF downloaded to: {pdf_path}\n"
+            metadata += "=" * 80 + "\n\n"
+
+            return metadata + text.strip()
 
         except httpx.HTTPError as e:
             logger.error(f"Error downloading PDF: {e}")
@@ -290,6 +316,10 @@ class IACRSearcher(PaperSource):
             logger.error(f"Read paper error: {e}")
             return f"Error reading paper: {e}"
 
+    async def get_paper(self, paper_id: str) -> Optional[Paper]:
+        """Look up one paper by ePrint ID (e.g., '2025/1014')."""
+        return await self.get_paper_details(paper_id)
+
     async def get_paper_details(self, paper_id: str) -> Optional[Paper]:
         """
         Fetch detailed information for a specific IACR paper
@@ -312,12 +342,11 @@ class IACRSearcher(PaperSource):
                 paper_url = f"{self.IACR_BASE_URL}/{paper_id}"
 
             # Make request
-            async with httpx.AsyncClient() as client:
-                response = await client.get(paper_url, headers=self.headers)
-                response.raise_for_status()
+            response = await self.request("GET", paper_url, headers=self.headers)
+            response.raise_for_status()
 
-                # Parse the page
-                soup = BeautifulSoup(response.text, "html.parser")
+            # Parse the page
+            soup = BeautifulSoup(response.text, "html.parser")
 
             # Extract title from h3 element
             title = ""
@@ -423,7 +452,7 @@ class IACRSearcher(PaperSource):
 
 if __name__ == "__main__":
     import asyncio
-    
+
     async def main():
         # Test IACR searcher
         searcher = IACRSearcher()
@@ -497,5 +526,5 @@ if __name__ == "__main__":
                 print(f"Could not fetch details for paper {test_paper_id}")
         except Exception as e:
             print(f"Error fetching paper details: {e}")
-    
+
     asyncio.run(main())
@@ -1,79 +1,185 @@
 # paper_search_mcp/sources/pubmed.py
-from typing import List
-import httpx
+from typing import Iterator, List, Optional, Tuple
 from xml.etree import ElementTree as ET
 from datetime import datetime
+import asyncio
+import logging
+import re
 from ..paper import Paper
+from .base import PaperSource, SEARCH
 import os
 
-class PaperSource:
-    """Abstract base class for paper sources"""
-    def search(self, query: str, **kwargs) -> List[Paper]:
-        raise NotImplementedError
+logger = logging.getLogger(__name__)
 
-    def download_pdf(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
+# Articles per EFetch request; the IDs stay on NCBI's history server, not in the URL
+EFETCH_BATCH = 200
+# EFetch batches in flight at once (the rate limiter paces them to NCBI's limit)
+EFETCH_CONCURRENCY = 3
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    """All text inside elem (titles and abstracts may contain markup such as <i>)."""
+    return "".join(elem.itertext()).strip() if elem is not None else ""
+
+
+def _parse_article(article: ET.Element) -> Paper:
+    """Paper for one <PubmedArticle> element."""
+    citation = article.find('MedlineCitation')
+    pmid = citation.findtext('PMID')
+    info = citation.find('Article')
+
+    authors = []
+    for author in info.iterfind('AuthorList/Author'):
+        last, initials = author.findtext('LastName'), author.findtext('Initials')
+        if last:
+            authors.append(f"{last} {initials}" if initials else last)
+        elif author.findtext('CollectiveName'):
+            authors.append(author.findtext('CollectiveName'))
+
+    # Structured abstracts have one AbstractText per section
+    abstract = " ".join(_text(part) for part in info.iterfind('Abstract/AbstractText'))
+
+    pub_date = info.find('Journal/JournalIssue/PubDate')
+    year = pub_date.findtext('Year') if pub_date is not None else None
+    if not year and pub_date is not None:
+        # e.g. <MedlineDate>1998 Dec-1999 Jan</MedlineDate>
+        match = re.search(r'\d{4}', pub_date.findtext('MedlineDate') or '')
+        year = match.group(0) if match else None
+    if not year:
+        raise ValueError(f"no publication year for PMID {pmid}")
+    published = datetime.strptime(year, '%Y')
+
+    doi = ''
+    for location in info.iterfind('ELocationID'):
+        if location.get('EIdType') == 'doi':
+            doi = (location.text or '').strip()
+            break
+
+    return Paper(
+        paper_id=pmid,
+        title=_text(info.find('ArticleTitle')),
+        authors=authors,
+        abstract=abstract,
+        url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+        pdf_url='',  # PubMed 无直接 PDF
+        published_date=published,
+        updated_date=published,
+        source='pubmed',
+        categories=[],
+        keywords=[],
+        doi=doi
+    )
+
+
+def _read_articles(parser: ET.XMLPullParser) -> Iterator[Paper]:
+    """
+    Papers for the <PubmedArticle> elements the parser has completed so far.
+
+    Each element is cleared once parsed, so memory holds one article at a
+    time rather than the whole document tree.
+    """
+    for _, elem in parser.read_events():
+        if elem.tag != 'PubmedArticle':
+            continue
+        try:
+            yield _parse_article(elem)
+        except Exception as e:
+            logger.warning(f"Error parsing PubMed article: {e}")
+        elem.clear()
 
-    def read_paper(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
 
 class PubMedSearcher(PaperSource):
     """Searcher for PubMed papers"""
+
+    name = "pubmed"
+    description = "PubMed - Biomedical literature database"
+    capabilities = frozenset({SEARCH})
+
     SEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
     FETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
 
+    @staticmethod
+    def _common_params() -> dict:
+        params = {'db': 'pubmed'}
+        # An NCBI API key raises the limit from 3 to 10 requests per second
+        api_key = os.getenv('NCBI_API_KEY', '').strip()
+        if api_key:
+            params['api_key'] = api_key
+        return params
+
+    async def _esearch(self, query: str) -> Tuple[int, str, str]:
+        """
+        Run the query on the history server.
+
+        Returns:
+            (count, WebEnv, query_key); the matching IDs stay on the server
+        """
+        params = dict(self._common_params(), term=query, retmax=0, usehistory='y', retmode='xml')
+        response = await self.request('GET', self.SEARCH_URL, params=params)
+        response.raise_for_status()
+        root = ET.fromstring(response.content)
+        count = int(root.findtext('Count') or 0)
+        return count, root.findtext('WebEnv') or '', root.findtext('QueryKey') or ''
+
+    async def _efetch(self, webenv: str, query_key: str, start: int, size: int) -> List[Paper]:
+        """
+        Fetch one batch of history-server results (POST keeps the URL short).
+
+        The response is streamed and parsed as it arrives, so the batch's
+        XML is never held in memory as a whole.
+        """
+        data = dict(self._common_params(), WebEnv=webenv, query_key=query_key,
+                    retstart=start, retmax=size, retmode='xml')
+        parser = ET.XMLPullParser(events=('end',))
+        papers = []
+        async with self.stream('POST', self.FETCH_URL, data=data) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(64 * 1024):
+                parser.feed(chunk)
+                papers.extend(_read_articles(parser))
+        parser.close()
+        return papers
+
     async def search(self, query: str, max_results: int = 10) -> List[Paper]:
-        async with httpx.AsyncClient() as client:
-            search_params = {
-                'db': 'pubmed',
-                'term': query,
-                'retmax': max_results,
-                'retmode': 'xml'
-            }
-            search_response = await client.get(self.SEARCH_URL, params=search_params)
-            search_response.raise_for_status()
-            search_root = ET.fromstring(search_response.content)
-            ids = [id.text for id in search_root.findall('.//Id')]
-            
-            fetch_params = {
-                'db': 'pubmed',
-                'id': ','.join(ids),
-                'retmode': 'xml'
-            }
-            fetch_response = await client.get(self.FETCH_URL, params=fetch_params)
-            fetch_response.raise_for_status()
-            fetch_root = ET.fromstring(fetch_response.content)
-            
-            papers = []
-            for article in fetch_root.findall('.//PubmedArticle'):
-                try:
-                    pmid = article.find('.//PMID').text
-                    title = article.find('.//ArticleTitle').text
-                    authors = [f"{author.find('LastName').text} {author.find('Initials').text}" 
-                               for author in article.findall('.//Author')]
-                    abstract = article.find('.//AbstractText').text if article.find('.//AbstractText') is not None else ''
-                    pub_date = article.find('.//PubDate/Year').text
-                    published = datetime.strptime(pub_date, '%Y')
-                    doi = article.find('.//ELocationID[@EIdType="doi"]').text if article.find('.//ELocationID[@EIdType="doi"]') is not None else ''
-                    papers.append(Paper(
-                        paper_id=pmid,
-                        title=title,
-                        authors=authors,
-                        abstract=abstract,
-                        url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-                        pdf_url='',  # PubMed 无直接 PDF
-                        published_date=published,
-                        updated_date=published,
-                        source='pubmed',
-                        categories=[],
-                        keywords=[],
-                        doi=doi
-                    ))
-                except Exception as e:
-                    print(f"Error parsing PubMed article: {e}")
-            return papers
-
-    def download_pdf(self, paper_id: str, save_path: str) -> str:
+        """
+        Search PubMed.
+
+        The query runs on the E-utilities history server; results are then
+        fetched in EFETCH_BATCH-article batches, several at a time, and
+        parsed incrementally. A batch that fails is logged and left out;
+        only if every batch fails is the error raised.
+
+        Args:
+            query: PubMed query (e.g., 'machine learning[Title]')
+            max_results: Maximum number of papers to return
+
+        Returns:
+            List of Paper objects in PubMed's relevance order
+        """
+        count, webenv, query_key = await self._esearch(query)
+        total = min(count, max_results)
+        if not total or not webenv:
+            return []
+
+        semaphore = asyncio.Semaphore(EFETCH_CONCURRENCY)
+
+        async def batch(start: int) -> List[Paper]:
+            async with semaphore:
+                return await self._efetch(webenv, query_key, start, min(EFETCH_BATCH, total - start))
+
+        starts = range(0, total, EFETCH_BATCH)
+        batches = await asyncio.gather(*(batch(start) for start in starts), return_exceptions=True)
+        papers = []
+        for start, result in zip(starts, batches):
+            if isinstance(result, BaseException):
+                logger.warning(f"PubMed EFetch batch starting at {start} failed: {result}")
+            else:
+                papers.extend(result)
+        if all(isinstance(result, BaseException) for result in batches):
+            raise batches[0]
+        return papers
+
+    async def download_pdf(self, paper_id: str, save_path: str) -> str:
         """Attempt to download a paper's PDF from PubMed.
 
         Args:
@@ -82,7 +188,7 @@ class PubMedSearcher(PaperSource):
 
         Returns:
             str: Error message indicating PDF download is not supported
-        
+
         Raises:
             NotImplementedError: Always raises this error as PubMed doesn't provide direct PDF access
         """
@@ -107,11 +213,11 @@ class PubMedSearcher(PaperSource):
 
 if __name__ == "__main__":
     import asyncio
-    
+
     async def main():
         # 测试 PubMedSearcher 的功能
         searcher = PubMedSearcher()
-        
+
         # 测试搜索功能
         print("Testing search functionality...")
         query = "machine learning"
@@ -127,24 +233,24 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"Error during search: {e}")
             papers = []
-        
+
         # 测试 PDF 下载功能（会返回不支持的提示）
         if papers:
             print("\nTesting PDF download functionality...")
             paper_id = papers[0].paper_id
             try:
-                pdf_path = searcher.download_pdf(paper_id, "./downloads")
+                pdf_path = await searcher.download_pdf(paper_id, "./downloads")
             except NotImplementedError as e:
                 print(f"Expected error: {e}")
-        
+
         # 测试论文阅读功能（会返回不支持的提示）
         if papers:
             print("\nTesting paper reading functionality...")
             paper_id = papers[0].paper_id
             try:
-                message = searcher.read_paper(paper_id)
+                message = await searcher.read_paper(paper_id)
                 print(f"Response: {message}")
             except Exception as e:
                 print(f"Error during paper reading: {e}")
-    
+
     asyncio.run(main())
\ No newline at end of file
@@ -4,13 +4,18 @@ Simple wrapper adapted from scihub.py for downloading PDFs via Sci-Hub.
 """
 from pathlib import Path
 import re
+import asyncio
 import hashlib
 import logging
 from typing import Optional
 
-import httpx
 from bs4 import BeautifulSoup
 
+from ..transport import get_client
+from ..pdf_store import get_pdf_store, pdf_aliases
+from ..download import fetch_to_store
+from ..dedup import normalize_doi
+
 
 class SciHubFetcher:
     """Simple Sci-Hub PDF downloader."""
@@ -43,37 +48,40 @@ class SciHubFetcher:
             return None
 
         try:
+            # Serve from the PDF store if any source already fetched this paper
+            store = get_pdf_store()
+            aliases = self._aliases(identifier)
+            clean_identifier = re.sub(r'[^\w\-_.]', '_', identifier)
+            cached_file = await asyncio.to_thread(store.lookup, aliases, str(self.output_dir),
+                                                  f"{clean_identifier}.pdf")
+            if cached_file:
+                return cached_file
+
             # Get direct URL to PDF
             pdf_url = await self._get_direct_url(identifier)
             if not pdf_url:
                 logging.error(f"Could not find PDF URL for identifier: {identifier}")
                 return None
 
-            # Download the PDF
-            async with httpx.AsyncClient(verify=False) as client:
-                response = await client.get(pdf_url, timeout=30)
-                
-                if response.status_code != 200:
-                    logging.error(f"Failed to download PDF, status {response.status_code}")
-                    return None
-
-                if response.headers.get('Content-Type') != 'application/pdf':
-                    logging.error("Response is not a PDF")
-                    return None
-
-                # Generate filename and save
-                filename = self._generate_filename(response, identifier)
-                file_path = self.output_dir / filename
-                
-                with open(file_path, 'wb') as f:
-                    f.write(response.content)
-                    
-                return str(file_path)
+            # Stream the PDF into the store, then name the copy after its content
+            result = await fetch_to_store(pdf_url, aliases, timeout=30, verify=False,
+                                          expect_content_type='application/pdf')
+            filename = self._generate_filename(result, identifier, result.sha256)
+            return await asyncio.to_thread(store.export, result.sha256, str(self.output_dir), filename)
 
         except Exception as e:
             logging.error(f"Error downloading PDF for {identifier}: {e}")
             return None
 
+    def _aliases(self, identifier: str) -> list:
+        """PDF store aliases for a DOI, PMID or URL identifier."""
+        identifier = identifier.strip()
+        if normalize_doi(identifier).startswith('10.'):
+            return pdf_aliases(doi=identifier)
+        if identifier.isdigit():
+            return pdf_aliases(pmid=identifier)
+        return pdf_aliases('scihub', identifier)
+
     async def _get_direct_url(self, identifier: str) -> Optional[str]:
         """Get the direct PDF URL from Sci-Hub."""
         try:
@@ -83,15 +91,15 @@ class SciHubFetcher:
 
             # Search on Sci-Hub
             search_url = f"{self.base_url}/{identifier}"
-            
-            async with httpx.AsyncClient(verify=False) as client:
-                response = await client.get(search_url, timeout=20)
-                
-                if response.status_code != 200:
-                    return None
-
-                soup = BeautifulSoup(response.content, 'html.parser')
-            
+
+            client = get_client(verify=False)
+            response = await client.get(search_url, timeout=20)
+
+            if response.status_code != 200:
+                return None
+
+            soup = BeautifulSoup(response.content, 'html.parser')
+
             # Check for article not found
             if "article not found" in response.text.lower():
                 logging.warning("Article not found on Sci-Hub")
@@ -160,21 +168,21 @@ class SciHubFetcher:
             logging.error(f"Error getting direct URL for {identifier}: {e}")
             return None
 
-    def _generate_filename(self, response, identifier: str) -> str:
-        """Generate a unique filename for the PDF."""
+    def _generate_filename(self, response, identifier: str, content_hash: str = None) -> str:
+        """Generate a unique filename for the PDF (content_hash saves rehashing the body)."""
         # Try to get filename from URL
-        url_parts = response.url.split('/')
+        url_parts = str(response.url).split('/')
         if url_parts:
             name = url_parts[-1]
             # Remove view parameters
             name = re.sub(r'#view=(.+)', '', name)
             if name.endswith('.pdf'):
                 # Generate hash for uniqueness
-                pdf_hash = hashlib.md5(response.content).hexdigest()[:8]
+                pdf_hash = (content_hash or hashlib.md5(response.content).hexdigest())[:8]
                 base_name = name[:-4]  # Remove .pdf
                 return f"{pdf_hash}_{base_name}.pdf"
 
         # Fallback: use identifier
         clean_identifier = re.sub(r'[^\w\-_.]', '_', identifier)
-        pdf_hash = hashlib.md5(response.content).hexdigest()[:8]
+        pdf_hash = (content_hash or hashlib.md5(response.content).hexdigest())[:8]
         return f"{pdf_hash}_{clean_identifier}.pdf"
\ No newline at end of file
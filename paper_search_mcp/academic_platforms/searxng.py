@@ -7,29 +7,34 @@ from typing import List
 from datetime import datetime
 import httpx
 from ..paper import Paper
+from .base import PaperSource, SEARCH
 
-class SearXNGSearcher:
+class SearXNGSearcher(PaperSource):
     """Searcher using SearXNG metasearch engine."""
-    
+
+    name = "searxng"
+    description = "SearXNG - Privacy-focused metasearch engine"
+    capabilities = frozenset({SEARCH})
+
     def __init__(self, base_url: str = None):
         """
         Initialize SearXNG searcher.
-        
+
         Args:
             base_url: SearXNG instance URL (default: from env SEARXNG_URL)
         """
         self.base_url = base_url or os.getenv('SEARXNG_URL', 'http://localhost:8080')
-    
+
     async def search(self, query: str, max_results: int = 10, 
                     category: str = 'science') -> List[Paper]:
         """
         Search using SearXNG metasearch engine.
-        
+
         Args:
             query: Search query string
             max_results: Maximum number of results to return
             category: Search category (general, science, files, etc.)
-            
+
         Returns:
             List of Paper objects
         """
@@ -39,35 +44,37 @@ class SearXNGSearcher:
             'categories': category,
             'pageno': 1
         }
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/search",
-                    params=params,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-            except httpx.HTTPError as e:
-                print(f"SearXNG search error: {e}")
-                return []
-        
+
+        try:
+            # A local instance: fail fast instead of retrying when it is down
+            response = await self.request(
+                "GET",
+                f"{self.base_url}/search",
+                params=params,
+                timeout=30.0,
+                retries=0,
+            )
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            print(f"SearXNG search error: {e}")
+            return []
+
         papers = []
         results = data.get('results', [])[:max_results]
-        
+
         for idx, item in enumerate(results):
             try:
                 # Extract information from search result
                 title = item.get('title', 'Untitled')
                 url = item.get('url', '')
                 content = item.get('content', '')
-                
+
                 # Try to extract PDF URL if available
                 pdf_url = ''
                 if 'pdf' in url.lower() or 'arxiv.org' in url:
                     pdf_url = url
-                
+
                 # Create paper object
                 papers.append(Paper(
                     paper_id=f"searxng_{idx}_{hash(url)}",
@@ -89,17 +96,17 @@ class SearXNGSearcher:
             except Exception as e:
                 print(f"Error parsing SearXNG result: {e}")
                 continue
-        
+
         return papers
-    
+
     async def download_pdf(self, paper_id: str, save_path: str) -> str:
         """
         Download PDF - not directly supported by SearXNG.
-        
+
         Args:
             paper_id: Paper ID
             save_path: Save directory
-            
+
         Raises:
             NotImplementedError: SearXNG is a search aggregator, not a PDF provider
         """
@@ -107,15 +114,15 @@ class SearXNGSearcher:
             "SearXNG is a metasearch engine and doesn't directly provide PDF downloads. "
             "Use the paper's URL to access the original source."
         )
-    
+
     async def read_paper(self, paper_id: str, save_path: str = "./downloads") -> str:
         """
         Read paper - not directly supported by SearXNG.
-        
+
         Args:
             paper_id: Paper ID
             save_path: Save directory
-            
+
         Raises:
             NotImplementedError: SearXNG is a search aggregator
         """
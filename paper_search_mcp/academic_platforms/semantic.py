@@ -1,34 +1,39 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
+from collections import OrderedDict
 from datetime import datetime
+import asyncio
 import httpx
 from bs4 import BeautifulSoup
-import time
 import random
 from ..paper import Paper
+from .base import BatchLookupError, PaperSource, SEARCH, DOWNLOAD, READ, LOOKUP, BATCH
+from ..pdf_store import get_pdf_store, pdf_aliases
+from ..download import download_to_store
+from ..extraction import get_extractor
+from ..cache import paper_to_json, paper_from_json
 import logging
-from PyPDF2 import PdfReader
 import os
 import re
 
 logger = logging.getLogger(__name__)
 
-
-class PaperSource:
-    """Abstract base class for paper sources"""
-
-    def search(self, query: str, **kwargs) -> List[Paper]:
-        raise NotImplementedError
-
-    def download_pdf(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
-
-    def read_paper(self, paper_id: str, save_path: str) -> str:
-        raise NotImplementedError
+# Fields requested for a single paper's details
+DETAIL_FIELDS = ["title", "abstract", "year", "citationCount", "authors", "url", "publicationDate",
+                 "externalIds", "fieldsOfStudy", "openAccessPdf"]
+# IDs per POST /paper/batch request (the API accepts at most 500)
+BATCH_SIZE = 500
+# Details kept in memory, so a lookup followed by download/read costs one request
+DETAILS_MEMO_SIZE = 1024
 
 
 class SemanticSearcher(PaperSource):
     """Semantic Scholar paper search implementation"""
 
+    name = "semantic"
+    description = "Semantic Scholar - AI-powered research tool"
+    capabilities = frozenset({SEARCH, DOWNLOAD, READ, LOOKUP, BATCH})
+    hedge_requests = True
+
     SEMANTIC_SEARCH_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
     SEMANTIC_BASE_URL = "https://api.semanticscholar.org/graph/v1"
     BROWSERS = [
@@ -43,6 +48,13 @@ class SemanticSearcher(PaperSource):
             "Accept": "text/html,application/xhtml+xml",
             "Accept-Language": "en-US,en;q=0.9",
         }
+        self._details: "OrderedDict[str, Paper]" = OrderedDict()
+
+    def _remember(self, paper_id: str, paper: Paper) -> None:
+        self._details[paper_id] = paper
+        self._details.move_to_end(paper_id)
+        while len(self._details) > DETAILS_MEMO_SIZE:
+            self._details.popitem(last=False)
 
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """Parse date from Semantic Scholar format (e.g., '2025-06-02')"""
@@ -60,19 +72,19 @@ class SemanticSearcher(PaperSource):
             r'https?://arxiv\.org/abs/[^\s,)]+',  # arXiv 链接
             r'https?://[^\s,)]*\.pdf',  # PDF 文件链接
         ]
-        
+
         all_urls = []
         for pattern in url_patterns:
             matches = re.findall(pattern, disclaimer)
             all_urls.extend(matches)
-        
+
         if not all_urls:
             return ""
-        
+
         doi_urls = [url for url in all_urls if 'doi.org' in url]
         if doi_urls:
             return doi_urls[0]
-        
+
         non_unpaywall_urls = [url for url in all_urls if 'unpaywall.org' not in url]
         if non_unpaywall_urls:
             url = non_unpaywall_urls[0]
@@ -80,24 +92,24 @@ class SemanticSearcher(PaperSource):
                 pdf_url = url.replace('/abs/', '/pdf/')
                 return pdf_url
             return url
-        
+
         if all_urls:
             url = all_urls[0]
             if 'arxiv.org/abs/' in url:
                 pdf_url = url.replace('/abs/', '/pdf/')
                 return pdf_url
             return url
-        
+
         return ""
 
     def _parse_paper(self, item) -> Optional[Paper]:
         """Parse single paper entry from Semantic Scholar HTML and optionally fetch detailed info"""
         try:
             authors = [author['name'] for author in item.get('authors', [])]
-            
+
             # Parse the publication date
             published_date = self._parse_date(item.get('publicationDate', ''))
-            
+
             # Safely get PDF URL - 支持从 disclaimer 中提取
             pdf_url = ""
             if item.get('openAccessPdf'):
@@ -108,17 +120,17 @@ class SemanticSearcher(PaperSource):
                 # 如果 URL 为空但有 disclaimer，尝试从 disclaimer 中提取
                 elif open_access_pdf.get('disclaimer'):
                     pdf_url = self._extract_url_from_disclaimer(open_access_pdf['disclaimer'])
-            
+
             # Safely get DOI
             doi = ""
             if item.get('externalIds') and item['externalIds'].get('DOI'):
                 doi = item['externalIds']['DOI']
-            
+
             # Safely get categories
             categories = item.get('fieldsOfStudy', [])
             if not categories:
                 categories = []
-            
+
             return Paper(
                 paper_id=item['paperId'],
                 title=item['title'],
@@ -131,12 +143,13 @@ class SemanticSearcher(PaperSource):
                 categories=categories,
                 doi=doi,
                 citations=item.get('citationCount', 0),
+                extra={'external_ids': item.get('externalIds') or {}},
             )
 
         except Exception as e:
             logger.warning(f"Failed to parse Semantic paper: {e}")
             return None
-        
+
     @staticmethod
     def get_api_key() -> Optional[str]:
         """
@@ -148,57 +161,40 @@ class SemanticSearcher(PaperSource):
             logger.warning("No SEMANTIC_SCHOLAR_API_KEY set or it's empty. Using unauthenticated access with lower rate limits.")
             return None
         return api_key.strip()
-    
-    async def request_api(self, path: str, params: dict) -> dict:
+
+    async def request_api(self, path: str, params: dict, json: dict = None) -> dict:
         """
         Make a request to the Semantic Scholar API with optional API key.
+
+        Requests are paced by the shared rate limiter (tighter without an API
+        key) and retried after 429/5xx answers without blocking the event loop.
+        A json body turns the request into a POST.
         """
-        max_retries = 3
-        retry_delay = 2  # seconds
-        
-        for attempt in range(max_retries):
-            try:
-                api_key = self.get_api_key()
-                headers = self.headers.copy()
-                if api_key:
-                    headers["x-api-key"] = api_key
-                url = f"{self.SEMANTIC_BASE_URL}/{path}"
-                
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(url, params=params, headers=headers)
-                    
-                    # 检查是否是429错误（限流）
-                    if response.status_code == 429:
-                        if attempt < max_retries - 1:
-                            wait_time = retry_delay * (2 ** attempt)  # 指数退避
-                            logger.warning(f"Rate limited (429). Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}")
-                            time.sleep(wait_time)
-                            continue
-                        else:
-                            logger.error(f"Rate limited (429) after {max_retries} attempts. Please wait before making more requests.")
-                            return {"error": "rate_limited", "status_code": 429, "message": "Too many requests. Please wait before retrying."}
-                    
-                    response.raise_for_status()
-                    return response
-                
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 429:
-                    if attempt < max_retries - 1:
-                        wait_time = retry_delay * (2 ** attempt)
-                        logger.warning(f"Rate limited (429). Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error(f"Rate limited (429) after {max_retries} attempts. Please wait before making more requests.")
-                        return {"error": "rate_limited", "status_code": 429, "message": "Too many requests. Please wait before retrying."}
-                else:
-                    logger.error(f"HTTP Error requesting API: {e}")
-                    return {"error": "http_error", "status_code": e.response.status_code, "message": str(e)}
-            except Exception as e:
-                logger.error(f"Error requesting API: {e}")
-                return {"error": "general_error", "message": str(e)}
-        
-        return {"error": "max_retries_exceeded", "message": "Maximum retry attempts exceeded"}
+        try:
+            api_key = self.get_api_key()
+            headers = self.headers.copy()
+            if api_key:
+                headers["x-api-key"] = api_key
+            url = f"{self.SEMANTIC_BASE_URL}/{path}"
+
+            if json is not None:
+                response = await self.request("POST", url, params=params, json=json, headers=headers)
+            else:
+                response = await self.request("GET", url, params=params, headers=headers)
+
+            if response.status_code == 429:
+                logger.error("Rate limited (429) after retrying. Please wait before making more requests.")
+                return {"error": "rate_limited", "status_code": 429, "message": "Too many requests. Please wait before retrying."}
+
+            response.raise_for_status()
+            return response
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP Error requesting API: {e}")
+            return {"error": "http_error", "status_code": e.response.status_code, "message": str(e)}
+        except Exception as e:
+            logger.error(f"Error requesting API: {e}")
+            return {"error": "general_error", "message": str(e)}
 
     async def search(self, query: str, year: Optional[str] = None, max_results: int = 10) -> List[Paper]:
         """
@@ -230,7 +226,7 @@ class SemanticSearcher(PaperSource):
                 params["year"] = year
             # Make request
             response = await self.request_api("paper/search", params)
-            
+
             # Check for errors
             if isinstance(response, dict) and "error" in response:
                 error_msg = response.get("message", "Unknown error")
@@ -239,13 +235,13 @@ class SemanticSearcher(PaperSource):
                 else:
                     logger.error(f"Semantic Scholar API error: {error_msg}")
                 return papers
-            
+
             # Check response status code
             if not hasattr(response, 'status_code') or response.status_code != 200:
                 status_code = getattr(response, 'status_code', 'unknown')
                 logger.error(f"Semantic Scholar search failed with status {status_code}")
                 return papers
-                
+
             data = response.json()
             results = data['data']
 
@@ -283,34 +279,60 @@ class SemanticSearcher(PaperSource):
             - PMCID:<id> (e.g., "PMCID:2323736")
             - URL:<url> (e.g., "URL:https://arxiv.org/abs/2106.15928v1")
             save_path: Path to save the PDF
-            
+
         Returns:
             str: Path to downloaded file or error message
         """
         try:
-            paper = await self.get_paper_details(paper_id)
-            if not paper or not paper.pdf_url:
+            pdf_path, _ = await self._fetch_pdf(paper_id, save_path)
+            if not pdf_path:
                 return f"Error: Could not find PDF URL for paper {paper_id}"
-            pdf_url = paper.pdf_url
-            
-            async with httpx.AsyncClient() as client:
-                pdf_response = await client.get(pdf_url, timeout=30)
-                pdf_response.raise_for_status()
-                
-                # Create download directory if it doesn't exist
-                os.makedirs(save_path, exist_ok=True)
-                
-                filename = f"semantic_{paper_id.replace('/', '_')}.pdf"
-                pdf_path = os.path.join(save_path, filename)
-                
-                with open(pdf_path, "wb") as f:
-                    f.write(pdf_response.content)
-                return pdf_path
+            return pdf_path
         except Exception as e:
             logger.error(f"PDF download error: {e}")
             return f"Error downloading PDF: {e}"
 
-    async def read_paper(self, paper_id: str, save_path: str = "./downloads") -> str:
+    async def _fetch_pdf(self, paper_id: str, save_path: str):
+        """
+        Get a paper's PDF through the PDF store, downloading it only if no
+        source has stored it yet.
+
+        Returns:
+            (pdf_path, paper): pdf_path is None when no open-access PDF exists;
+            paper is None when the PDF was stored without its metadata (the
+            caller looks it up only if it needs it)
+        """
+        store = get_pdf_store()
+        aliases = pdf_aliases("semantic", paper_id)
+        filename = f"semantic_{paper_id.replace('/', '_')}.pdf"
+        sha256 = await asyncio.to_thread(store.find, aliases)
+        if sha256:
+            metadata = await asyncio.to_thread(store.get_metadata, sha256)
+            pdf_path = await asyncio.to_thread(store.export, sha256, save_path, filename)
+            return pdf_path, paper_from_json(metadata) if metadata else None
+
+        paper = await self.get_paper_details(paper_id)
+        if not paper:
+            return None, None
+
+        # The same PDF may already be stored under its DOI or arXiv ID
+        external = paper.extra.get('external_ids') or {}
+        aliases += pdf_aliases("semantic", paper.paper_id, doi=paper.doi,
+                               arxiv_id=external.get('ArXiv'), pmid=external.get('PubMed'))
+        sha256 = await asyncio.to_thread(store.find, aliases)
+        if sha256:
+            await asyncio.to_thread(store.add_aliases, sha256, aliases)
+            await asyncio.to_thread(store.set_metadata, sha256, paper_to_json(paper))
+            return await asyncio.to_thread(store.export, sha256, save_path, filename), paper
+
+        if not paper.pdf_url:
+            return None, paper
+        result = await download_to_store(paper.pdf_url, aliases, save_path, filename,
+                                         metadata=paper_to_json(paper), timeout=30, source=self)
+        return result.path, paper
+
+    async def read_paper(self, paper_id: str, save_path: str = "./downloads",
+                         pages: Optional[str] = None, max_chars: Optional[int] = None) -> str:
         """
         Download and extract text from Semantic Scholar paper PDF
 
@@ -325,61 +347,38 @@ class SemanticSearcher(PaperSource):
             - PMCID:<id> (e.g., "PMCID:2323736")
             - URL:<url> (e.g., "URL:https://arxiv.org/abs/2106.15928v1")
             save_path: Directory to save downloaded PDF
+            pages: 1-based page selection such as '1-5,8,10-' (default: all pages)
+            max_chars: Stop reading after this many characters (default: no limit)
 
         Returns:
             str: Extracted text from the PDF or error message
         """
         try:
-            # First get paper details to get the PDF URL
-            paper = await self.get_paper_details(paper_id)
-            if not paper or not paper.pdf_url:
+            pdf_path, paper = await self._fetch_pdf(paper_id, save_path)
+            if not pdf_path:
                 return f"Error: Could not find PDF URL for paper {paper_id}"
 
-            # Download the PDF
-            async with httpx.AsyncClient() as client:
-                pdf_response = await client.get(paper.pdf_url, timeout=30)
-                pdf_response.raise_for_status()
-
-                # Create download directory if it doesn't exist
-                os.makedirs(save_path, exist_ok=True)
-
-                # Save the PDF
-                filename = f"semantic_{paper_id.replace('/', '_')}.pdf"
-                pdf_path = os.path.join(save_path, filename)
-
-                with open(pdf_path, "wb") as f:
-                    f.write(pdf_response.content)
-
-                # Extract text using PyPDF2
-                reader = PdfReader(pdf_path)
-                text = ""
-
-                for page_num, page in enumerate(reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += f"\n--- Page {page_num + 1} ---\n"
-                            text += page_text + "\n"
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to extract text from page {page_num + 1}: {e}"
-                        )
-                        continue
-
-                if not text.strip():
-                    return (
-                        f"PDF downloaded to {pdf_path}, but unable to extract readable text"
-                    )
-
-                # Add paper metadata at the beginning
-                metadata = f"Title: {paper.title}\n"
+            # Extract text in a worker process, off the event loop
+            text = await get_extractor().read_text(pdf_path, pages, max_chars, page_markers=True)
+
+            if not text.strip():
+                return (
+                    f"PDF downloaded to {pdf_path}, but unable to extract readable text"
+                )
+
+            # Add paper metadata at the beginning
+            if paper is None:
+                paper = await self.get_paper_details(paper_id)
+            metadata = ""
+            if paper:
+                metadata += f"Title: {paper.title}\n"
                 metadata += f"Authors: {', '.join(paper.authors)}\n"
                 metadata += f"Published Date: {paper.published_date}\n"
                 metadata += f"URL: {paper.url}\n"
-                metadata += f"PDF downloaded to: {pdf_path}\n"
-                metadata += "=" * 80 + "\n\n"
+            metadata += f"PDF downloaded to: {pdf_path}\n"
+            metadata += "=" * 80 + "\n\n"
 
-                return metadata + text.strip()
+            return metadata + text.strip()
 
         except httpx.HTTPError as e:
             logger.error(f"Error downloading PDF: {e}")
@@ -388,6 +387,14 @@ class SemanticSearcher(PaperSource):
             logger.error(f"Read paper error: {e}")
             return f"Error reading paper: {e}"
 
+    async def get_paper(self, paper_id: str) -> Optional[Paper]:
+        """Look up one paper by any ID format accepted by get_paper_details()."""
+        return await self.get_paper_details(paper_id)
+
+    async def get_papers(self, paper_ids: List[str]) -> List[Optional[Paper]]:
+        """Look up many papers through the batch endpoint (see get_papers_batch())."""
+        return await self.get_papers_batch(paper_ids)
+
     async def get_paper_details(self, paper_id: str) -> Optional[Paper]:
         """
         Fetch detailed information for a specific Semantic Scholar paper
@@ -406,14 +413,15 @@ class SemanticSearcher(PaperSource):
         Returns:
             Paper: Detailed paper object with full metadata
         """
+        if paper_id in self._details:
+            return self._details[paper_id]
         try:
-            fields = ["title", "abstract", "year", "citationCount", "authors", "url","publicationDate","externalIds","fieldsOfStudy"]
             params = {
-                "fields": ",".join(fields),
+                "fields": ",".join(DETAIL_FIELDS),
             }
-            
+
             response = await self.request_api(f"paper/{paper_id}", params)
-            
+
             # Check for errors
             if isinstance(response, dict) and "error" in response:
                 error_msg = response.get("message", "Unknown error")
@@ -422,16 +430,17 @@ class SemanticSearcher(PaperSource):
                 else:
                     logger.error(f"Semantic Scholar API error: {error_msg}")
                 return None
-            
+
             # Check response status code
             if not hasattr(response, 'status_code') or response.status_code != 200:
                 status_code = getattr(response, 'status_code', 'unknown')
                 logger.error(f"Semantic Scholar paper details fetch failed with status {status_code}")
                 return None
-                
+
             results = response.json()
             paper = self._parse_paper(results)
             if paper:
+                self._remember(paper_id, paper)
                 return paper
             else:
                 return None
@@ -439,10 +448,67 @@ class SemanticSearcher(PaperSource):
             logger.error(f"Error fetching paper details for {paper_id}: {e}")
             return None
 
+    async def get_papers_batch(self, paper_ids: List[str]) -> List[Optional[Paper]]:
+        """
+        Fetch details for many papers with POST /paper/batch.
+
+        IDs are sent BATCH_SIZE per request, the requests concurrently (the
+        rate limiter paces them); repeated IDs are requested once.
+
+        Args:
+            paper_ids: Identifiers in any format get_paper_details() accepts
+                (Semantic Scholar ID, DOI:, ARXIV:, PMID:, PMCID:, MAG:, ACL:, URL:)
+
+        Returns:
+            One entry per requested ID, in order; None for unknown IDs
+
+        Raises:
+            BatchLookupError: If a batch request failed; it carries the
+                entries of the other batches and the failed IDs
+        """
+        unique = list(dict.fromkeys(paper_ids))
+        found: Dict[str, Optional[Paper]] = {}
+        failed: Dict[str, str] = {}
+        missing = []
+        for paper_id in unique:
+            if paper_id in self._details:
+                found[paper_id] = self._details[paper_id]
+            else:
+                missing.append(paper_id)
+
+        async def batch(ids: List[str]) -> None:
+            response = await self.request_api(
+                "paper/batch", {"fields": ",".join(DETAIL_FIELDS)}, json={"ids": ids}
+            )
+            if isinstance(response, dict) and "error" in response:
+                message = response.get('message', 'Unknown error')
+                logger.error(f"Semantic Scholar batch lookup of {len(ids)} papers failed: {message}")
+                failed.update(dict.fromkeys(ids, message))
+                return
+            try:
+                items = response.json()
+            except ValueError as e:
+                logger.error(f"Semantic Scholar batch lookup returned invalid JSON: {e}")
+                failed.update(dict.fromkeys(ids, f"Invalid JSON: {e}"))
+                return
+            # Results come back in request order, null for IDs that don't resolve
+            for paper_id, item in zip(ids, items):
+                paper = self._parse_paper(item) if item else None
+                found[paper_id] = paper
+                if paper:
+                    self._remember(paper_id, paper)
+
+        await asyncio.gather(*(batch(missing[i:i + BATCH_SIZE])
+                               for i in range(0, len(missing), BATCH_SIZE)))
+        papers = [found.get(paper_id) for paper_id in paper_ids]
+        if failed:
+            raise BatchLookupError(papers, failed)
+        return papers
+
 
 if __name__ == "__main__":
     import asyncio
-    
+
     async def main():
         # Test Semantic searcher
         searcher = SemanticSearcher()
@@ -495,6 +561,5 @@ if __name__ == "__main__":
                 print(f"Could not fetch details for paper {test_paper_id}")
         except Exception as e:
             print(f"Error fetching paper details: {e}")
-    
+
     asyncio.run(main())
-    
\ No newline at end of file
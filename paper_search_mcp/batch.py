@@ -0,0 +1,134 @@
+"""
+Bulk PDF downloads for paper-search-mcp.
+Downloads a reading list of (source, paper ID) pairs concurrently under a
+global concurrency limit (hosts are additionally limited in download.py)
+and reports success or failure per paper.
+"""
+import os
+import time
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Papers downloaded at once across all sources (overridable via env)
+DEFAULT_CONCURRENCY = 8
+
+
+def default_concurrency() -> int:
+    """Global download concurrency (env PAPER_SEARCH_DOWNLOAD_CONCURRENCY)."""
+    try:
+        return max(1, int(os.getenv('PAPER_SEARCH_DOWNLOAD_CONCURRENCY', DEFAULT_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_CONCURRENCY
+
+
+@dataclass
+class BatchItem:
+    """One paper of a bulk download"""
+    source: str                   # Source name (e.g., 'arxiv')
+    paper_id: str                 # ID within the source
+    status: str = "pending"       # 'ok' or 'error' once finished
+    path: str = ""                # Downloaded file when status == 'ok'
+    error: str = ""               # Reason when status == 'error'
+    elapsed: float = 0.0          # Seconds spent downloading
+
+    def to_dict(self) -> Dict:
+        return {
+            'source': self.source,
+            'paper_id': self.paper_id,
+            'status': self.status,
+            'path': self.path,
+            'error': self.error,
+            'elapsed': round(self.elapsed, 3),
+        }
+
+
+def parse_items(specs: Iterable[str], sources: Iterable[str],
+                default_source: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Parse paper specs into (source, paper_id) pairs.
+
+    Accepted forms, one per spec (or line of an ID file):
+        'arxiv 2106.12345'             source and ID separated by whitespace
+        'arxiv:2106.12345'             source prefix
+        '2106.12345'                   bare ID, needs default_source
+    Blank lines and '#' comments are skipped; repeated papers are kept once.
+
+    Raises:
+        ValueError: If a spec names an unknown source or has no source
+    """
+    sources = set(sources)
+    pairs: List[Tuple[str, str]] = []
+    seen = set()
+    for spec in specs:
+        spec = spec.split('#', 1)[0].strip()
+        if not spec:
+            continue
+        parts = spec.split(None, 1)
+        prefix, _, rest = spec.partition(':')
+        if len(parts) == 2:
+            source, paper_id = parts[0], parts[1].strip()
+        elif rest and prefix in sources:
+            source, paper_id = prefix, rest
+        elif default_source:
+            source, paper_id = default_source, spec
+        else:
+            raise ValueError(f"No source given for '{spec}' (use 'source:id' or a default source)")
+        if source not in sources:
+            raise ValueError(f"Unknown source '{source}'. Available: {', '.join(sorted(sources))}")
+        if (source, paper_id) not in seen:
+            seen.add((source, paper_id))
+            pairs.append((source, paper_id))
+    return pairs
+
+
+async def _download_one(item: BatchItem, searcher: Any, save_path: str) -> None:
+    start = time.monotonic()
+    try:
+        if searcher is None:
+            raise ValueError(f"Source '{item.source}' does not support downloads")
+        result = searcher.download_pdf(item.paper_id, save_path)
+        if inspect.isawaitable(result):
+            result = await result
+        # Several searchers report failures as a returned message
+        if isinstance(result, str) and result.endswith('.pdf') and os.path.exists(result):
+            item.status, item.path = "ok", result
+        else:
+            item.status, item.error = "error", str(result or "No file returned")
+    except Exception as e:
+        logger.warning(f"Download of {item.source}:{item.paper_id} failed: {e}")
+        item.status, item.error = "error", str(e) or type(e).__name__
+    item.elapsed = time.monotonic() - start
+
+
+async def download_batch(searchers: Dict[str, Any], items: Iterable[Tuple[str, str]],
+                         save_path: str = "./downloads", max_concurrency: int = None,
+                         on_result: Callable[[BatchItem], None] = None) -> List[BatchItem]:
+    """
+    Download many papers concurrently.
+
+    Args:
+        searchers: Mapping of source name to searcher with download_pdf()
+        items: (source, paper_id) pairs
+        save_path: Directory to save the PDFs
+        max_concurrency: Downloads in flight at once (default: default_concurrency())
+        on_result: Called with each BatchItem as it finishes
+
+    Returns:
+        One BatchItem per pair, in input order; failures never abort the batch
+    """
+    batch = [BatchItem(source, paper_id) for source, paper_id in items]
+    semaphore = asyncio.Semaphore(max_concurrency or default_concurrency())
+
+    async def run(item: BatchItem) -> None:
+        async with semaphore:
+            await _download_one(item, searchers.get(item.source), save_path)
+        if on_result:
+            on_result(item)
+
+    await asyncio.gather(*(run(item) for item in batch))
+    return batch
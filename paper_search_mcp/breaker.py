@@ -0,0 +1,224 @@
+"""
+Per-source circuit breakers for paper-search-mcp.
+Each source's requests feed a rolling window of outcomes. When too many of
+them fail or are slow, the breaker opens and further requests fail at once
+instead of waiting out timeouts and retries. After a cooldown one probe
+request is let through (half-open); its outcome closes the breaker or opens
+it again.
+"""
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+import httpx
+
+from .transport import _env_bool, _env_float, _env_int
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class BreakerPolicy:
+    """When a source's breaker opens, and for how long"""
+    window: float = 60.0            # Seconds of outcomes considered
+    min_calls: int = 5              # Outcomes needed in the window before it can open
+    failure_rate: float = 0.5       # Share of failed or slow calls that opens it
+    slow_call_seconds: float = 15.0  # Calls taking longer count as failed
+    cooldown: float = 30.0          # Seconds open before a probe is let through
+
+
+def default_policy() -> BreakerPolicy:
+    """The policy with overrides from the environment."""
+    return BreakerPolicy(
+        window=_env_float('PAPER_SEARCH_BREAKER_WINDOW', 60.0),
+        min_calls=_env_int('PAPER_SEARCH_BREAKER_MIN_CALLS', 5),
+        failure_rate=_env_float('PAPER_SEARCH_BREAKER_FAILURE_RATE', 0.5),
+        slow_call_seconds=_env_float('PAPER_SEARCH_BREAKER_SLOW_SECONDS', 15.0),
+        cooldown=_env_float('PAPER_SEARCH_BREAKER_COOLDOWN', 30.0),
+    )
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """A request was refused because its source's breaker is open."""
+
+    def __init__(self, source: str, retry_in: float):
+        super().__init__(f"{source} is failing; skipped for another {retry_in:.0f}s (circuit open)")
+        self.source = source
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a rolling window of outcomes"""
+
+    def __init__(self, name: str, policy: BreakerPolicy = None, enabled: bool = True):
+        self.name = name
+        self.policy = policy or BreakerPolicy()
+        self.enabled = enabled
+        self._outcomes: Deque[Tuple[float, bool]] = deque()   # (time, failed)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._last_error = ""
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0][0] < now - self.policy.window:
+            self._outcomes.popleft()
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.policy.cooldown:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        with self._lock:
+            if self._current_state(time.monotonic()) != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.policy.cooldown - time.monotonic())
+
+    def allow(self) -> None:
+        """
+        Claim permission for one request.
+
+        Raises:
+            CircuitOpenError: While open, or half-open with the probe already in flight
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            retry_in = max(0.0, self._opened_at + self.policy.cooldown - now)
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record(self, failed: bool, seconds: float = 0.0, error: str = "") -> None:
+        """
+        Record one request's outcome.
+
+        Args:
+            failed: Whether the request failed (connection error, 429, 5xx, ...)
+            seconds: How long it took; slower than the policy's limit counts as failed
+            error: What went wrong, kept for the health report
+        """
+        if not self.enabled:
+            return
+        if seconds >= self.policy.slow_call_seconds:
+            failed = True
+            error = error or f"slow response ({seconds:.1f}s)"
+        with self._lock:
+            now = time.monotonic()
+            if failed:
+                self._last_error = error
+            state = self._current_state(now)
+            if state == HALF_OPEN:
+                self._probing = False
+                if failed:
+                    self._open(now)
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    logger.info(f"Circuit for {self.name} closed")
+                return
+            if state == OPEN:
+                return
+            self._outcomes.append((now, failed))
+            self._trim(now)
+            calls = len(self._outcomes)
+            failures = sum(1 for _, bad in self._outcomes if bad)
+            if calls >= self.policy.min_calls and failures / calls >= self.policy.failure_rate:
+                self._open(now)
+
+    def release(self) -> None:
+        """Give back a claimed request that ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probing = False
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self.times_opened += 1
+        logger.warning(f"Circuit for {self.name} opened for {self.policy.cooldown:.0f}s: {self._last_error}")
+
+    def to_dict(self) -> Dict:
+        """State and recent error rate, for the health report"""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            self._trim(now)
+            calls = len(self._outcomes)
+            failures = sum(1 for _, bad in self._outcomes if bad)
+            retry_in = max(0.0, self._opened_at + self.policy.cooldown - now) if state == OPEN else 0.0
+            return {
+                'state': state if self.enabled else 'disabled',
+                'recent_calls': calls,
+                'recent_failures': failures,
+                'error_rate': round(failures / calls, 3) if calls else 0.0,
+                'retry_in': round(retry_in, 1),
+                'times_opened': self.times_opened,
+                'last_error': self._last_error,
+            }
+
+
+class BreakerBoard:
+    """The breakers of all sources, created on first use."""
+
+    def __init__(self, policy: BreakerPolicy = None, enabled: bool = None):
+        self.policy = policy or default_policy()
+        self.enabled = _env_bool('PAPER_SEARCH_BREAKER', True) if enabled is None else enabled
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name, self.policy, self.enabled)
+            return self._breakers[name]
+
+    def is_open(self, name: str) -> bool:
+        """Whether name's breaker refuses requests (without creating one)."""
+        breaker = self._breakers.get(name)
+        return breaker is not None and breaker.enabled and breaker.state == OPEN
+
+    def states(self) -> Dict[str, Dict]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.to_dict() for name, breaker in breakers.items()}
+
+
+_board: Optional[BreakerBoard] = None
+
+
+def get_breakers() -> BreakerBoard:
+    """Return the process-wide breakers."""
+    global _board
+    if _board is None:
+        _board = BreakerBoard()
+    return _board
+
+
+def configure_breakers(policy: BreakerPolicy = None, enabled: bool = None) -> BreakerBoard:
+    """Replace the process-wide breakers (env settings if arguments are None)."""
+    global _board
+    _board = BreakerBoard(policy, enabled)
+    return _board
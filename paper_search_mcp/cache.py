@@ -0,0 +1,457 @@
+"""
+Persistent search result cache for paper-search-mcp.
+Stores searcher results in SQLite (surviving restarts) behind an in-memory
+LRU, with per-source TTLs, size-bounded eviction and stale-while-revalidate.
+"""
+import os
+import json
+import time
+import asyncio
+import hashlib
+import inspect
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .paper import Paper
+from .singleflight import get_singleflight
+
+logger = logging.getLogger(__name__)
+
+# Seconds a search result stays fresh, per source
+DEFAULT_TTLS = {
+    'arxiv': 3600,
+    'pubmed': 3600,
+    'biorxiv': 3600,
+    'medrxiv': 3600,
+    'iacr': 3600,
+    'searxng': 1800,
+    'semantic': 6 * 3600,
+    'crossref': 6 * 3600,
+    'google_scholar': 24 * 3600,
+}
+
+
+def _data_dir() -> str:
+    return os.getenv('DATA_DIR', './data')
+
+
+def paper_to_json(paper: Paper) -> Dict:
+    """Lossless JSON-compatible form of a Paper (unlike Paper.to_dict)."""
+    data = asdict(paper)
+    for key in ('published_date', 'updated_date'):
+        if isinstance(data[key], datetime):
+            data[key] = data[key].isoformat()
+    return data
+
+
+def paper_from_json(data: Dict) -> Paper:
+    """Rebuild a Paper from paper_to_json() output."""
+    data = dict(data)
+    for key in ('published_date', 'updated_date'):
+        if data.get(key):
+            data[key] = datetime.fromisoformat(data[key])
+    return Paper(**data)
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share an entry."""
+    return ' '.join(str(query).casefold().split())
+
+
+def make_key(source: str, query: str, params: Dict) -> str:
+    """Cache key for (source, normalized query, parameters)."""
+    payload = json.dumps([source, normalize_query(query), params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SearchCache:
+    """
+    Two-level cache for search results.
+
+    A bounded in-memory LRU answers hot queries without touching disk; the
+    SQLite file keeps results across restarts. An entry is fresh for its
+    source's TTL, then served stale for `stale_ttl` more seconds while the
+    caller refreshes it in the background.
+    """
+
+    def __init__(self, path: str = None, max_entries: int = None, memory_entries: int = 256,
+                 ttls: Dict[str, int] = None, default_ttl: int = None, stale_ttl: int = None):
+        """
+        Args:
+            path: SQLite file (default: $DATA_DIR/search_cache.sqlite3)
+            max_entries: Disk entries kept before LRU eviction
+                (default: from env PAPER_SEARCH_CACHE_MAX_ENTRIES or 5000)
+            memory_entries: Entries kept deserialized in memory
+            ttls: Per-source fresh lifetime in seconds (merged over DEFAULT_TTLS)
+            default_ttl: Lifetime for sources without a TTL
+                (default: from env PAPER_SEARCH_CACHE_TTL or 3600)
+            stale_ttl: Extra seconds an expired entry may be served while refreshing
+                (default: from env PAPER_SEARCH_CACHE_STALE_TTL or 86400)
+        """
+        self.path = path or os.path.join(_data_dir(), 'search_cache.sqlite3')
+        self.max_entries = max_entries or int(os.getenv('PAPER_SEARCH_CACHE_MAX_ENTRIES', 5000))
+        self.memory_entries = memory_entries
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl or int(os.getenv('PAPER_SEARCH_CACHE_TTL', 3600))
+        self.stale_ttl = stale_ttl if stale_ttl is not None else int(os.getenv('PAPER_SEARCH_CACHE_STALE_TTL', 86400))
+
+        self._memory: "OrderedDict[str, Tuple[str, float, List[Paper]]]" = OrderedDict()
+        # Memory hits not yet written to the disk `accessed` column, so
+        # entries served from memory aren't the first evicted from disk
+        self._touched: Dict[str, float] = {}
+        self._memory_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0,
+                      'evictions': 0, 'errors': 0}
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    value TEXT NOT NULL
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS search_cache_accessed ON search_cache (accessed)")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS paper_details (
+                    source TEXT NOT NULL,
+                    paper_id TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    accessed REAL NOT NULL,
+                    value TEXT NOT NULL,
+                    PRIMARY KEY (source, paper_id)
+                )
+            """)
+        return self._db
+
+    def ttl_for(self, source: str) -> int:
+        return self.ttls.get(source, self.default_ttl)
+
+    def get_memory(self, source: str, key: str) -> Optional[Tuple[Optional[List[Paper]], bool]]:
+        """
+        Look up an entry in the memory tier only; never touches disk, so it
+        is safe to call on the event loop.
+
+        Returns:
+            None if the key is not in memory, else the same as get()
+        """
+        now = time.time()
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            self._memory.move_to_end(key)
+            self._touched[key] = now
+        return self._freshness(source, entry[1], entry[2], now)
+
+    def get(self, source: str, key: str) -> Tuple[Optional[List[Paper]], bool]:
+        """
+        Look up an entry.
+
+        Returns:
+            (papers, stale): papers is None on a miss; stale is True when the
+            entry is past its TTL but still inside the stale window
+        """
+        answer = self.get_memory(source, key)
+        if answer is not None:
+            return answer
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn().execute(
+                    "SELECT created, value FROM search_cache WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Search cache read failed: {e}")
+                self.stats['errors'] += 1
+                row = None
+            if row is None:
+                self.stats['misses'] += 1
+                return None, False
+            created = row[0]
+            try:
+                papers = [paper_from_json(item) for item in json.loads(row[1])]
+            except (ValueError, KeyError, TypeError) as e:
+                # Corrupt or written by an older Paper: drop it and refetch
+                logger.warning(f"Dropping unreadable search cache entry for {source}: {e}")
+                self.stats['errors'] += 1
+                self.stats['misses'] += 1
+                try:
+                    self._conn().execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                except sqlite3.Error:
+                    pass
+                return None, False
+            self._remember(key, source, created, papers)
+            try:
+                self._conn().execute("UPDATE search_cache SET accessed = ? WHERE key = ?", (now, key))
+            except sqlite3.Error:
+                pass
+        return self._freshness(source, created, papers, now)
+
+    def _freshness(self, source: str, created: float, papers: List[Paper],
+                   now: float) -> Tuple[Optional[List[Paper]], bool]:
+        """(papers, stale) for an entry created at `created`, counting the lookup in stats."""
+        ttl = self.ttl_for(source)
+        age = now - created
+        if age <= ttl:
+            self.stats['hits'] += 1
+            return papers, False
+        if age <= ttl + self.stale_ttl:
+            self.stats['stale_hits'] += 1
+            return papers, True
+        self.stats['misses'] += 1
+        return None, False
+
+    def _flush_touched(self, db: sqlite3.Connection) -> None:
+        """Write the access times of memory hits to disk (call with _lock held)."""
+        with self._memory_lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            db.executemany("UPDATE search_cache SET accessed = ? WHERE key = ?",
+                           [(accessed, key) for key, accessed in touched.items()])
+
+    def put(self, source: str, key: str, papers: List[Paper]) -> None:
+        """Store an entry and evict the least recently used ones beyond max_entries."""
+        now = time.time()
+        value = json.dumps([paper_to_json(paper) for paper in papers], default=str)
+        with self._lock:
+            self._remember(key, source, now, list(papers))
+            try:
+                db = self._conn()
+                db.execute(
+                    "INSERT OR REPLACE INTO search_cache (key, source, created, accessed, value) VALUES (?, ?, ?, ?, ?)",
+                    (key, source, now, now, value),
+                )
+                # Evict by recency including reads answered from memory
+                self._flush_touched(db)
+                count = db.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+                if count > self.max_entries:
+                    excess = count - self.max_entries
+                    db.execute(
+                        "DELETE FROM search_cache WHERE key IN "
+                        "(SELECT key FROM search_cache ORDER BY accessed ASC LIMIT ?)",
+                        (excess,),
+                    )
+                    self.stats['evictions'] += excess
+            except sqlite3.Error as e:
+                logger.warning(f"Search cache write failed: {e}")
+                self.stats['errors'] += 1
+
+    def get_details(self, source: str, paper_id: str, version: str) -> Optional[Paper]:
+        """
+        Detail record of one paper, if cached for this version.
+
+        Details don't expire by TTL: version (e.g., the paper's last-updated
+        date as shown in search results) changes when the page does.
+        """
+        with self._lock:
+            try:
+                row = self._conn().execute(
+                    "SELECT version, value FROM paper_details WHERE source = ? AND paper_id = ?",
+                    (source, paper_id),
+                ).fetchone()
+                if row is None or row[0] != version:
+                    return None
+                self._conn().execute(
+                    "UPDATE paper_details SET accessed = ? WHERE source = ? AND paper_id = ?",
+                    (time.time(), source, paper_id),
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Detail cache read failed: {e}")
+                return None
+        try:
+            return paper_from_json(json.loads(row[1]))
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Dropping unreadable detail entry {source}:{paper_id}: {e}")
+            return None
+
+    def put_details(self, source: str, paper_id: str, version: str, paper: Paper) -> None:
+        """Store the detail record of one paper, replacing older versions."""
+        value = json.dumps(paper_to_json(paper))
+        with self._lock:
+            try:
+                db = self._conn()
+                db.execute(
+                    "INSERT OR REPLACE INTO paper_details (source, paper_id, version, accessed, value) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (source, paper_id, version, time.time(), value),
+                )
+                # Same bound as search results; least recently read go first
+                db.execute(
+                    "DELETE FROM paper_details WHERE rowid IN (SELECT rowid FROM paper_details "
+                    "ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Detail cache write failed: {e}")
+                self.stats['errors'] += 1
+
+    def _remember(self, key: str, source: str, created: float, papers: List[Paper]) -> None:
+        with self._memory_lock:
+            self._memory[key] = (source, created, papers)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def clear(self, source: Optional[str] = None) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            source: Only drop this source's entries (default: everything)
+
+        Returns:
+            Number of disk entries removed
+        """
+        with self._lock:
+            if source:
+                with self._memory_lock:
+                    for key in [k for k, v in self._memory.items() if v[0] == source]:
+                        del self._memory[key]
+                        self._touched.pop(key, None)
+                self._conn().execute("DELETE FROM paper_details WHERE source = ?", (source,))
+                cursor = self._conn().execute("DELETE FROM search_cache WHERE source = ?", (source,))
+            else:
+                with self._memory_lock:
+                    self._memory.clear()
+                    self._touched.clear()
+                self._conn().execute("DELETE FROM paper_details")
+                cursor = self._conn().execute("DELETE FROM search_cache")
+            return cursor.rowcount
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters plus entry counts per source."""
+        with self._lock:
+            try:
+                rows = self._conn().execute(
+                    "SELECT source, COUNT(*) FROM search_cache GROUP BY source"
+                ).fetchall()
+                details = self._conn().execute("SELECT COUNT(*) FROM paper_details").fetchone()[0]
+            except sqlite3.Error:
+                rows, details = [], 0
+            lookups = self.stats['hits'] + self.stats['stale_hits'] + self.stats['misses']
+            return dict(
+                self.stats,
+                hit_rate=round((self.stats['hits'] + self.stats['stale_hits']) / lookups, 3) if lookups else 0.0,
+                entries=sum(count for _, count in rows),
+                memory_entries=len(self._memory),
+                entries_by_source=dict(rows),
+                detail_entries=details,
+                path=self.path,
+            )
+
+    def refresh_in_background(self, key: str, refresh) -> None:
+        """Schedule `refresh()` for key unless a refresh is already running."""
+        task = self._refreshing.get(key)
+        if task is not None and not task.done():
+            return
+        self.stats['refreshes'] += 1
+        task = asyncio.ensure_future(refresh())
+        self._refreshing[key] = task
+
+        def finished(task: asyncio.Task) -> None:
+            self._refreshing.pop(key, None)
+            # Retrieve the exception so a failed refresh is logged once, not as
+            # "Task exception was never retrieved"; the stale entry stays
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(f"Background refresh of a cached search failed: {task.exception()!r}")
+                self.stats['errors'] += 1
+
+        task.add_done_callback(finished)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class CachedSearcher:
+    """
+    Wraps a searcher so that `search()` goes through a SearchCache.
+    Concurrent misses for the same key share one upstream search.
+    Every other attribute is delegated to the wrapped searcher.
+    """
+
+    def __init__(self, searcher: Any, source: str, cache: SearchCache = None):
+        self._searcher = searcher
+        self._source = source
+        self._cache = cache
+        self._signature = inspect.signature(searcher.search)
+
+    @property
+    def cache(self) -> SearchCache:
+        return self._cache or get_search_cache()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._searcher, name)
+
+    async def search(self, *args, **kwargs) -> List[Paper]:
+        try:
+            bound = self._signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+        except TypeError:
+            return await self._searcher.search(*args, **kwargs)
+        params = dict(bound.arguments)
+        query = params.pop('query', '')
+        params.update(params.pop('kwargs', {}) or {})
+
+        cache = self.cache
+        key = make_key(self._source, query, params)
+        # The memory tier answers on the event loop; SQLite reads and writes
+        # run in a worker thread
+        answer = cache.get_memory(self._source, key)
+        papers, stale = answer if answer is not None else await asyncio.to_thread(cache.get, self._source, key)
+
+        async def fetch() -> List[Paper]:
+            result = await self._searcher.search(*args, **kwargs)
+            # Searchers return [] on upstream errors; don't pin those
+            if result:
+                await asyncio.to_thread(cache.put, self._source, key, result)
+            return result
+
+        if papers is None:
+            return list(await get_singleflight().do(('search', key), fetch))
+        if stale:
+            cache.refresh_in_background(key, fetch)
+        return list(papers)
+
+
+_search_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache()
+    return _search_cache
+
+
+def cache_enabled() -> bool:
+    """Caching is on unless PAPER_SEARCH_CACHE is set to off/false/0."""
+    return os.getenv('PAPER_SEARCH_CACHE', 'on').strip().lower() not in ('0', 'off', 'false', 'no')
+
+
+def cached(searcher: Any, source: str) -> Any:
+    """Wrap searcher with the shared search cache (unless caching is disabled)."""
+    if not cache_enabled():
+        return searcher
+    return CachedSearcher(searcher, source)
@@ -3,26 +3,28 @@
 Command-line interface for paper-search-mcp.
 Provides commands for searching and downloading academic papers from multiple sources.
 """
-import asyncio
 import os
-from typing import Optional
+from typing import Any, Dict, List, Optional
 import typer
 from rich.console import Console
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (
+    Progress, SpinnerColumn, TextColumn, BarColumn, DownloadColumn, TransferSpeedColumn,
+)
 import json
 
-from .academic_platforms.arxiv import ArxivSearcher
-from .academic_platforms.pubmed import PubMedSearcher
-from .academic_platforms.biorxiv import BioRxivSearcher
-from .academic_platforms.medrxiv import MedRxivSearcher
-from .academic_platforms.google_scholar import GoogleScholarSearcher
-from .academic_platforms.iacr import IACRSearcher
-from .academic_platforms.semantic import SemanticSearcher
-from .academic_platforms.crossref import CrossRefSearcher
-from .academic_platforms.searxng import SearXNGSearcher
-from .knowledge import KnowledgeStore
-from .document_processor import DocumentProcessor, DOCLING_AVAILABLE
+from .transport import run as run_with_transport
+from .cache import get_search_cache
+from .registry import get_registry
+from .academic_platforms.base import SEARCH, DOWNLOAD, READ, LOOKUP, CAPABILITIES
+from .federation import iter_search, DEFAULT_SOURCE_TIMEOUT
+from .dedup import merge_papers
+from .download import report_progress
+from .batch import download_batch, parse_items, default_concurrency
+from .extraction import parse_page_ranges
+from .rxiv import sync_mirror, get_rxiv_store, wait_for_syncs
+from .knowledge import get_knowledge_store
+from .document_processor import get_document_processor
 
 app = typer.Typer(
     name="paper-search",
@@ -31,22 +33,18 @@ app = typer.Typer(
 )
 console = Console()
 
-# Initialize searchers
-arxiv_searcher = ArxivSearcher()
-pubmed_searcher = PubMedSearcher()
-biorxiv_searcher = BioRxivSearcher()
-medrxiv_searcher = MedRxivSearcher()
-google_scholar_searcher = GoogleScholarSearcher()
-iacr_searcher = IACRSearcher()
-semantic_searcher = SemanticSearcher()
-crossref_searcher = CrossRefSearcher()
-searxng_searcher = SearXNGSearcher()
+# Characters shown by `read` without --all
+PREVIEW_CHARS = 1000
+
+# Searchers are imported and instantiated (behind the persistent search cache)
+# on first use, so commands only load the platforms they touch
+registry = get_registry()
+crossref_searcher = registry.lazy("crossref")
 
-# Initialize knowledge store
-knowledge_store = KnowledgeStore()
 
-# Initialize document processor if available
-doc_processor = DocumentProcessor() if DOCLING_AVAILABLE else None
+def cli_sources(capability: str) -> Dict[str, Any]:
+    """Sources declaring capability, by CLI name (e.g., 'google-scholar')."""
+    return {name.replace("_", "-"): searcher for name, searcher in registry.supporting(capability).items()}
 
 
 def display_papers(papers, source: str):
@@ -54,13 +52,13 @@ def display_papers(papers, source: str):
     if not papers:
         console.print(f"[yellow]No papers found from {source}[/yellow]")
         return
-    
+
     table = Table(title=f"Papers from {source}")
     table.add_column("ID", style="cyan", no_wrap=True)
     table.add_column("Title", style="green")
     table.add_column("Authors", style="blue")
     table.add_column("Year", style="magenta")
-    
+
     for paper in papers:
         year = paper.published_date.year if paper.published_date else "N/A"
         authors = ", ".join(paper.authors[:3]) + ("..." if len(paper.authors) > 3 else "")
@@ -70,7 +68,7 @@ def display_papers(papers, source: str):
             authors[:40] + ("..." if len(authors) > 40 else ""),
             str(year)
         )
-    
+
     console.print(table)
     console.print(f"\n[green]Found {len(papers)} papers[/green]")
 
@@ -78,51 +76,94 @@ def display_papers(papers, source: str):
 @app.command()
 def search(
     query: str = typer.Argument(..., help="Search query"),
-    source: str = typer.Option("arxiv", "--source", "-s", help="Source to search: arxiv, pubmed, biorxiv, medrxiv, google-scholar, iacr, semantic, crossref"),
-    max_results: int = typer.Option(10, "--max-results", "-n", help="Maximum number of results"),
+    source: str = typer.Option("arxiv", "--source", "-s", help="Source to search: arxiv, pubmed, biorxiv, medrxiv, google-scholar, iacr, semantic, crossref, searxng, or all"),
+    max_results: int = typer.Option(10, "--max-results", "-n", help="Maximum number of results (per source with --source all)"),
     year: Optional[int] = typer.Option(None, "--year", "-y", help="Filter by publication year (if supported)"),
+    timeout: float = typer.Option(DEFAULT_SOURCE_TIMEOUT, "--timeout", "-t", help="Per-source time budget in seconds for --source all"),
+    mode: str = typer.Option("category", "--mode", "-m", help="biorxiv/medrxiv: 'category' (query is a category) or 'keyword' (ranked search of the local mirror)"),
 ):
     """Search for academic papers from various sources."""
-    
+
+    async def run_search_all(searchers):
+        pending = set(searchers)
+        found = []
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            task = progress.add_task(f"Searching {len(pending)} sources...", total=None)
+
+            # Print each source's table as soon as it answers
+            async for result in iter_search(searchers, query, max_results, timeout):
+                pending.discard(result.source)
+                progress.update(task, description=f"Waiting for {', '.join(sorted(pending))}..." if pending else "Done")
+                if result.status == "ok":
+                    display_papers(result.papers, f"{result.source} ({result.elapsed:.1f}s)")
+                    found.extend(result.papers)
+                else:
+                    console.print(f"[yellow]{result.source}: {result.status} - {result.error}[/yellow]")
+
+        unique = merge_papers(found)
+        console.print(f"\n[green]Found {len(found)} papers ({len(unique)} unique) across {len(searchers)} sources[/green]")
+        # Let bioRxiv/medRxiv finish storing the windows they answered early from
+        await wait_for_syncs()
+
     async def run_search():
-        searchers = {
-            "arxiv": arxiv_searcher,
-            "pubmed": pubmed_searcher,
-            "biorxiv": biorxiv_searcher,
-            "medrxiv": medrxiv_searcher,
-            "google-scholar": google_scholar_searcher,
-            "iacr": iacr_searcher,
-            "semantic": semantic_searcher,
-            "crossref": crossref_searcher,
-            "searxng": searxng_searcher,
-        }
-        
+        searchers = cli_sources(SEARCH)
+
+        if source == "all":
+            await run_search_all(searchers)
+            return
+
         if source not in searchers:
             console.print(f"[red]Error: Unknown source '{source}'[/red]")
-            console.print(f"Available sources: {', '.join(searchers.keys())}")
+            console.print(f"Available sources: {', '.join(searchers.keys())}, all")
             raise typer.Exit(1)
-        
+
         searcher = searchers[source]
-        
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
         ) as progress:
             progress.add_task(f"Searching {source}...", total=None)
-            
+
             try:
                 if year and source in ["crossref"]:
                     papers = await searcher.search(query, year=year, max_results=max_results)
+                elif source in ["biorxiv", "medrxiv"]:
+                    papers = await searcher.search(query, max_results=max_results, mode=mode)
                 else:
                     papers = await searcher.search(query, max_results=max_results)
-                
+
                 display_papers(papers, source)
+                await wait_for_syncs()
             except Exception as e:
                 console.print(f"[red]Error: {e}[/red]")
                 raise typer.Exit(1)
-    
-    asyncio.run(run_search())
+
+    run_with_transport(run_search())
+
+
+def download_progress() -> Progress:
+    """Progress display with a byte counter and transfer speed for PDF downloads."""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        console=console,
+    )
+
+
+def progress_updater(progress: Progress, task_id):
+    """Download progress callback that advances one task of a rich progress display."""
+    def update(done: int, total: Optional[int]):
+        progress.update(task_id, completed=done, total=total)
+    return update
 
 
 @app.command()
@@ -132,41 +173,90 @@ def download(
     output_dir: str = typer.Option("./downloads", "--output", "-o", help="Output directory"),
 ):
     """Download a paper PDF by its ID."""
-    
+
     async def run_download():
-        searchers = {
-            "arxiv": arxiv_searcher,
-            "biorxiv": biorxiv_searcher,
-            "medrxiv": medrxiv_searcher,
-            "iacr": iacr_searcher,
-            "semantic": semantic_searcher,
-        }
-        
+        searchers = cli_sources(DOWNLOAD)
+
         if source not in searchers:
             console.print(f"[red]Error: Unknown source '{source}'[/red]")
             console.print(f"Available sources for download: {', '.join(searchers.keys())}")
             raise typer.Exit(1)
-        
+
         searcher = searchers[source]
-        
+
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
-        
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            progress.add_task(f"Downloading paper {paper_id}...", total=None)
-            
+
+        with download_progress() as progress:
+            task_id = progress.add_task(f"Downloading paper {paper_id}...", total=None)
+
             try:
-                pdf_path = await searcher.download_pdf(paper_id, output_dir)
+                with report_progress(progress_updater(progress, task_id)):
+                    pdf_path = await searcher.download_pdf(paper_id, output_dir)
                 console.print(f"[green]✓ Downloaded to: {pdf_path}[/green]")
             except Exception as e:
                 console.print(f"[red]Error downloading paper: {e}[/red]")
                 raise typer.Exit(1)
-    
-    asyncio.run(run_download())
+
+    run_with_transport(run_download())
+
+
+@app.command()
+def download_many(
+    papers: Optional[List[str]] = typer.Argument(None, help="Papers as source:id (bare IDs need --source)"),
+    file: Optional[str] = typer.Option(None, "--file", "-f", help="File with one paper per line ('source id', 'source:id' or a bare ID)"),
+    source: Optional[str] = typer.Option(None, "--source", "-s", help="Source for bare IDs: arxiv, biorxiv, medrxiv, iacr, semantic"),
+    output_dir: str = typer.Option("./downloads", "--output", "-o", help="Output directory"),
+    concurrency: int = typer.Option(default_concurrency(), "--concurrency", "-c", help="Downloads in flight at once"),
+):
+    """Download many paper PDFs concurrently."""
+
+    async def run_download_many():
+        searchers = cli_sources(DOWNLOAD)
+
+        specs = list(papers or [])
+        if file:
+            try:
+                with open(file, encoding="utf-8") as f:
+                    specs.extend(f.read().splitlines())
+            except OSError as e:
+                console.print(f"[red]Error reading {file}: {e}[/red]")
+                raise typer.Exit(1)
+        try:
+            items = parse_items(specs, searchers, source)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+        if not items:
+            console.print("[yellow]No papers given[/yellow]")
+            raise typer.Exit(1)
+
+        os.makedirs(output_dir, exist_ok=True)
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("{task.completed}/{task.total}"),
+            console=console,
+        ) as progress:
+            task_id = progress.add_task(f"Downloading {len(items)} papers...", total=len(items))
+
+            def on_result(item):
+                if item.status != "ok":
+                    progress.console.print(f"[red]✗ {item.source}:{item.paper_id}: {item.error}[/red]")
+                progress.advance(task_id)
+
+            results = await download_batch(searchers, items, output_dir, concurrency, on_result)
+
+        ok = sum(1 for item in results if item.status == "ok")
+        failed = len(results) - ok
+        console.print(f"[green]✓ Downloaded {ok} of {len(results)} papers to {output_dir}[/green]")
+        if failed:
+            console.print(f"[red]{failed} failed[/red]")
+            raise typer.Exit(1)
+
+    run_with_transport(run_download_many())
 
 
 @app.command()
@@ -175,80 +265,153 @@ def read(
     source: str = typer.Option("arxiv", "--source", "-s", help="Source: arxiv, biorxiv, medrxiv, iacr, semantic"),
     output_dir: str = typer.Option("./downloads", "--output", "-o", help="Directory where PDF is/will be saved"),
     show_all: bool = typer.Option(False, "--all", "-a", help="Show full text (default: first 1000 chars)"),
+    pages: Optional[str] = typer.Option(None, "--pages", "-p", help="1-based pages to read, e.g. '1-5,8,10-'"),
+    max_chars: Optional[int] = typer.Option(None, "--max-chars", "-m", help="Stop after this many characters"),
 ):
     """Read and extract text from a paper PDF."""
-    
+
+    if pages:
+        try:
+            parse_page_ranges(pages)
+        except ValueError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1)
+    # A preview only parses the pages it shows
+    budget = max_chars or (None if show_all else PREVIEW_CHARS)
+
     async def run_read():
-        searchers = {
-            "arxiv": arxiv_searcher,
-            "biorxiv": biorxiv_searcher,
-            "medrxiv": medrxiv_searcher,
-            "iacr": iacr_searcher,
-            "semantic": semantic_searcher,
-        }
-        
+        searchers = cli_sources(READ)
+
         if source not in searchers:
             console.print(f"[red]Error: Unknown source '{source}'[/red]")
             console.print(f"Available sources for reading: {', '.join(searchers.keys())}")
             raise typer.Exit(1)
-        
+
         searcher = searchers[source]
-        
+
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
-        
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            progress.add_task(f"Reading paper {paper_id}...", total=None)
-            
+
+        with download_progress() as progress:
+            task_id = progress.add_task(f"Reading paper {paper_id}...", total=None)
+
             try:
-                text = await searcher.read_paper(paper_id, output_dir)
+                with report_progress(progress_updater(progress, task_id)):
+                    text = await searcher.read_paper(paper_id, output_dir, pages, budget)
                 if text:
-                    if show_all:
-                        console.print(text)
-                    else:
-                        console.print(text[:1000])
-                        if len(text) > 1000:
-                            console.print(f"\n[dim]... ({len(text) - 1000} more characters. Use --all to see full text)[/dim]")
-                    console.print(f"\n[green]✓ Total length: {len(text)} characters[/green]")
+                    console.print(text, markup=False)
+                    if budget and not max_chars and "[Truncated at" in text:
+                        console.print("\n[dim]Use --all to see full text[/dim]")
+                    console.print(f"\n[green]✓ Length: {len(text)} characters[/green]")
                 else:
                     console.print("[yellow]No text extracted from paper[/yellow]")
             except Exception as e:
                 console.print(f"[red]Error reading paper: {e}[/red]")
                 raise typer.Exit(1)
-    
-    asyncio.run(run_read())
+
+    run_with_transport(run_read())
 
 
 @app.command()
 def list_sources():
     """List all available paper sources."""
-    sources = [
-        ("arxiv", "arXiv - Open access preprint repository", "search, download, read"),
-        ("pubmed", "PubMed - Biomedical literature database", "search"),
-        ("biorxiv", "bioRxiv - Preprint server for biology", "search, download, read"),
-        ("medrxiv", "medRxiv - Preprint server for health sciences", "search, download, read"),
-        ("google-scholar", "Google Scholar - Academic search engine", "search"),
-        ("iacr", "IACR ePrint - Cryptology preprint archive", "search, download, read"),
-        ("semantic", "Semantic Scholar - AI-powered research tool", "search, download, read"),
-        ("crossref", "CrossRef - Citation linking service", "search"),
-        ("searxng", "SearXNG - Privacy-focused metasearch engine", "search"),
-    ]
-    
     table = Table(title="Available Paper Sources")
     table.add_column("Source", style="cyan", no_wrap=True)
     table.add_column("Description", style="green")
     table.add_column("Capabilities", style="blue")
-    
-    for source, description, capabilities in sources:
-        table.add_row(source, description, capabilities)
-    
+
+    # Built-in sources and installed plugins, as declared in the registry
+    for name in registry:
+        spec = registry.spec(name)
+        capabilities = [c for c in CAPABILITIES if c in spec.capabilities]
+        table.add_row(name.replace("_", "-"), spec.description, ", ".join(capabilities))
+
     console.print(table)
 
 
+@app.command()
+def cache_stats(
+    clear: bool = typer.Option(False, "--clear", help="Drop all cached search results"),
+):
+    """Show search result cache statistics."""
+    cache = get_search_cache()
+    if clear:
+        removed = cache.clear()
+        console.print(f"[green]✓ Removed {removed} cached search results[/green]")
+        return
+
+    stats = cache.get_stats()
+    console.print("\n[bold cyan]Search Cache Statistics[/bold cyan]\n")
+    console.print(f"  Location: {stats['path']}")
+    console.print(f"  Entries:  {stats['entries']}")
+    for source, count in sorted(stats['entries_by_source'].items()):
+        console.print(f"    {source}: {count}")
+    console.print()
+
+
+@app.command()
+def rxiv_sync(
+    source: str = typer.Option("all", "--source", "-s", help="Mirror to sync: biorxiv, medrxiv, or all"),
+    days: Optional[int] = typer.Option(None, "--days", "-d", help="Days of postings to mirror (default: PAPER_SEARCH_RXIV_MIRROR_DAYS or 90)"),
+):
+    """Sync the local bioRxiv/medRxiv mirror used by keyword search (run daily, e.g., from cron)."""
+    servers = ["biorxiv", "medrxiv"] if source == "all" else [source]
+    if any(server not in ("biorxiv", "medrxiv") for server in servers):
+        console.print(f"[red]Error: Unknown source '{source}'. Available: biorxiv, medrxiv, all[/red]")
+        raise typer.Exit(1)
+
+    async def run_sync():
+        for server in servers:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+            ) as progress:
+                progress.add_task(f"Syncing {server}...", total=None)
+                fetched = await sync_mirror(server, days)
+            console.print(f"[green]✓ {server}: {fetched} records fetched[/green]")
+        stats = get_rxiv_store().get_stats()
+        for server in servers:
+            console.print(f"  {server}: {stats['records'].get(server, 0)} records stored")
+
+    run_with_transport(run_sync())
+
+
+@app.command()
+def crossref_harvest(
+    output: str = typer.Argument(..., help="JSON Lines file to write, one paper per line"),
+    query: Optional[str] = typer.Option(None, "--query", "-q", help="Search query (default: filter only)"),
+    filter: Optional[str] = typer.Option(None, "--filter", "-f", help="CrossRef filter, e.g. 'from-pub-date:2024,type:journal-article'"),
+    select: Optional[str] = typer.Option("DOI,title,author,issued,container-title", "--select", help="CrossRef fields to fetch ('' for all)"),
+    max_results: Optional[int] = typer.Option(None, "--max-results", "-n", help="Stop after this many works (default: all)"),
+):
+    """Stream CrossRef works to a JSON Lines file with cursor deep paging."""
+    if not query and not filter:
+        console.print("[red]Error: give --query and/or --filter[/red]")
+        raise typer.Exit(1)
+
+    async def run_harvest():
+        written = 0
+        with open(output, "w", encoding="utf-8") as f, Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Harvesting CrossRef...", total=None)
+            try:
+                async for paper in crossref_searcher.iter_works(
+                        query, filter=filter, select=select or None, max_results=max_results):
+                    f.write(json.dumps(paper.to_dict(), ensure_ascii=False) + "\n")
+                    written += 1
+                    if written % 1000 == 0:
+                        progress.update(task, description=f"Harvesting CrossRef... {written} works")
+            except Exception as e:
+                console.print(f"[red]Error after {written} works: {e}[/red]")
+        console.print(f"[green]✓ Wrote {written} works to {output}[/green]")
+
+    run_with_transport(run_harvest())
+
+
 # Knowledge management commands
 @app.command()
 def knowledge_store(
@@ -258,79 +421,125 @@ def knowledge_store(
 ):
     """Store a paper in the knowledge graph database."""
     async def run_store():
-        searchers = {
-            "arxiv": arxiv_searcher,
-            "pubmed": pubmed_searcher,
-            "biorxiv": biorxiv_searcher,
-            "medrxiv": medrxiv_searcher,
-            "iacr": iacr_searcher,
-            "semantic": semantic_searcher,
-        }
-        
+        searchers = cli_sources(SEARCH)
+
         searcher = searchers.get(source)
         if not searcher:
             console.print(f"[red]Source {source} not supported for storing[/red]")
             return
-        
+
         with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
             progress.add_task(f"Fetching and storing paper {paper_id}...", total=None)
-            
+
             try:
-                # Search for the paper
-                papers = await searcher.search(paper_id, max_results=1)
-                if not papers:
+                # Look the paper up by ID where the source can, else search for it
+                if LOOKUP in registry.capabilities(source.replace("-", "_")):
+                    paper = await searcher.get_paper(paper_id)
+                else:
+                    papers = await searcher.search(paper_id, max_results=1)
+                    paper = papers[0] if papers else None
+                if not paper:
                     console.print(f"[yellow]Paper {paper_id} not found[/yellow]")
                     return
-                
-                paper = papers[0]
+
                 paper_data = paper.to_dict()
-                
+
                 # Store in knowledge graph
-                record_id = await knowledge_store.store_paper(paper_data)
+                record_id = await get_knowledge_store().store_paper(paper_data)
                 console.print(f"[green]✓ Paper stored with ID: {record_id}[/green]")
-                
+
+            except Exception as e:
+                console.print(f"[red]Error: {e}[/red]")
+
+    run_with_transport(run_store())
+
+
+def read_papers(path: str):
+    """Yield paper dicts from a JSON Lines file (e.g. crossref-harvest output) or a JSON array."""
+    with open(path, encoding="utf-8") as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            yield from json.load(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+@app.command()
+def knowledge_import(
+    path: str = typer.Argument(..., help="JSON Lines file (one paper per line) or JSON array of papers"),
+    batch_size: int = typer.Option(500, "--batch-size", "-b", help="Papers per insert statement"),
+):
+    """Bulk-load papers into the knowledge graph (existing paper IDs are updated)."""
+    if not os.path.exists(path):
+        console.print(f"[red]Error: {path} not found[/red]")
+        raise typer.Exit(1)
+
+    async def run_import():
+        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
+            progress.add_task(f"Importing papers from {path}...", total=None)
+            try:
+                stats = await get_knowledge_store().store_papers_bulk(read_papers(path), batch_size)
             except Exception as e:
                 console.print(f"[red]Error: {e}[/red]")
-    
-    asyncio.run(run_store())
+                raise typer.Exit(1)
+
+        console.print(f"[green]✓ Stored {stats['stored']} papers in {stats['batches']} batches[/green]")
+        if stats['skipped']:
+            console.print(f"[yellow]  Skipped {stats['skipped']} papers without a paper_id[/yellow]")
+        if stats['failed']:
+            console.print(f"[red]  {stats['failed']} papers failed[/red]")
+            for error in stats['errors']:
+                console.print(f"    {error}")
+
+    run_with_transport(run_import())
 
 
 @app.command()
 def knowledge_search(
     query: str = typer.Argument(..., help="Search query"),
     limit: int = typer.Option(10, "--limit", "-l", help="Maximum results"),
+    offset: int = typer.Option(0, "--offset", help="Skip this many ranked results (next page)"),
 ):
-    """Search papers in the knowledge graph."""
+    """Search papers in the knowledge graph (best matches first)."""
     async def run_search():
         with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
             progress.add_task("Searching knowledge graph...", total=None)
-            
+
             try:
-                papers = await knowledge_store.search_papers(query, limit)
-                
+                papers = await get_knowledge_store().search_papers(query, limit, offset)
+
                 if not papers:
                     console.print("[yellow]No papers found in knowledge graph[/yellow]")
                     return
-                
+
                 table = Table(title=f"Knowledge Graph Results for '{query}'")
                 table.add_column("Paper ID", style="cyan")
                 table.add_column("Title", style="green")
                 table.add_column("Source", style="blue")
-                
+                table.add_column("Score", style="magenta", justify="right")
+
                 for paper in papers:
                     table.add_row(
                         paper.get('paper_id', 'N/A'),
                         paper.get('title', 'Untitled')[:60] + "...",
-                        paper.get('source', 'unknown')
+                        paper.get('source', 'unknown'),
+                        f"{paper.get('score', 0):.2f}"
                     )
-                
+
                 console.print(table)
-                console.print(f"[green]Found {len(papers)} papers[/green]")
-                
+                console.print(f"[green]Showing results {offset + 1}-{offset + len(papers)}[/green]")
+                if len(papers) == limit:
+                    console.print(f"[dim]Next page: --offset {offset + limit}[/dim]")
+
             except Exception as e:
                 console.print(f"[red]Error: {e}[/red]")
-    
-    asyncio.run(run_search())
+
+    run_with_transport(run_search())
 
 
 @app.command()
@@ -338,17 +547,17 @@ def knowledge_stats():
     """Get statistics about the knowledge graph."""
     async def run_stats():
         try:
-            stats = await knowledge_store.get_knowledge_stats()
-            
+            stats = await get_knowledge_store().get_knowledge_stats()
+
             console.print("\n[bold cyan]Knowledge Graph Statistics[/bold cyan]\n")
             console.print(f"  Papers:        {stats.get('papers', 0)}")
             console.print(f"  Concepts:      {stats.get('concepts', 0)}")
             console.print(f"  Relationships: {stats.get('relationships', 0)}\n")
-            
+
         except Exception as e:
             console.print(f"[red]Error: {e}[/red]")
-    
-    asyncio.run(run_stats())
+
+    run_with_transport(run_stats())
 
 
 # Document processing commands
@@ -358,17 +567,18 @@ def process_pdf(
     output_format: str = typer.Option("markdown", "--format", "-f", help="Output format: markdown, json"),
 ):
     """Process a PDF with advanced Docling parser."""
+    doc_processor = get_document_processor()
     if not doc_processor:
         console.print("[red]Docling not available. Install with: pip install docling[/red]")
         return
-    
+
     async def run_process():
         with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
             progress.add_task(f"Processing {pdf_path}...", total=None)
-            
+
             try:
                 result = await doc_processor.process_pdf(pdf_path)
-                
+
                 if output_format == "json":
                     console.print(json.dumps(result, indent=2, default=str))
                 else:
@@ -376,15 +586,15 @@ def process_pdf(
                     console.print(result.get('text', '')[:2000])
                     if len(result.get('text', '')) > 2000:
                         console.print("\n[dim]... (truncated)[/dim]")
-                    
+
                     console.print(f"\n[green]✓ Metadata:[/green]")
                     for key, value in result.get('metadata', {}).items():
                         console.print(f"  {key}: {value}")
-                
+
             except Exception as e:
                 console.print(f"[red]Error: {e}[/red]")
-    
-    asyncio.run(run_process())
+
+    run_with_transport(run_process())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,252 @@
+"""
+Cross-source deduplication for paper-search-mcp.
+Folds Paper records that describe the same work (shared DOI, arXiv ID, PMID,
+or title + first author) into one enriched Paper using hash indexes.
+"""
+import re
+import unicodedata
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Set
+
+from .paper import Paper
+
+_DOI_PREFIXES = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+_ARXIV_DOI = re.compile(r'^10\.48550/arxiv\.(.+)$', re.IGNORECASE)
+_ARXIV_URL = re.compile(r'arxiv\.org/(?:abs|pdf)/([^\s?#]+?)(?:\.pdf)?(?:[?#]|$)', re.IGNORECASE)
+_ARXIV_VERSION = re.compile(r'v\d+$')
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+# Titles shorter than this (after normalization) are too generic to match on
+MIN_FINGERPRINT_TITLE = 12
+
+
+def normalize_doi(doi: Optional[str]) -> str:
+    """Lowercase a DOI and strip resolver prefixes (e.g., 'https://doi.org/')."""
+    if not doi:
+        return ''
+    doi = _DOI_PREFIXES.sub('', doi.strip())
+    return doi.strip().lower()
+
+
+def normalize_arxiv_id(arxiv_id: Optional[str]) -> str:
+    """Strip the 'arXiv:' prefix and version suffix from an arXiv ID."""
+    if not arxiv_id:
+        return ''
+    arxiv_id = arxiv_id.strip()
+    if arxiv_id.lower().startswith('arxiv:'):
+        arxiv_id = arxiv_id[6:]
+    return _ARXIV_VERSION.sub('', arxiv_id).lower()
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Reduce a title to lowercase ASCII words for fuzzy-equal matching."""
+    if not title:
+        return ''
+    title = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode('ascii')
+    return _NON_ALNUM.sub(' ', title.lower()).strip()
+
+
+def first_author_surname(authors: List[str]) -> str:
+    """
+    Guess the surname of the first author across source formats:
+    'Jane Smith', 'Smith, Jane' and PubMed-style 'Smith JA' all give 'smith'.
+    """
+    if not authors or not authors[0]:
+        return ''
+    name = authors[0].strip()
+    if ',' in name:
+        surname = name.split(',')[0]
+    else:
+        parts = name.split()
+        if not parts:
+            return ''
+        # PubMed lists "LastName Initials"
+        if len(parts) > 1 and parts[-1].isupper() and len(parts[-1]) <= 3:
+            surname = parts[0]
+        else:
+            surname = parts[-1]
+    return normalize_title(surname).replace(' ', '')
+
+
+def _external_ids(paper: Paper) -> Dict:
+    """External identifiers some sources (e.g., Semantic Scholar) keep in extra."""
+    if not paper.extra:
+        return {}
+    ids = paper.extra.get('external_ids') or {}
+    return ids if isinstance(ids, dict) else {}
+
+
+def _paper_doi(paper: Paper) -> str:
+    """The normalized DOI of a paper, from its own field or its external IDs."""
+    return normalize_doi(paper.doi or _external_ids(paper).get('DOI'))
+
+
+def title_key(paper: Paper) -> str:
+    """
+    Fingerprint a paper by normalized title and first-author surname.
+    Returns '' for short titles or when the first author is unknown, since
+    generic titles ('Introduction', 'Erratum') without authors match unrelated
+    records.
+    """
+    title = normalize_title(paper.title)
+    surname = first_author_surname(paper.authors)
+    if len(title) < MIN_FINGERPRINT_TITLE or not surname:
+        return ''
+    return f"title:{title}|{surname}"
+
+
+def paper_keys(paper: Paper) -> Set[str]:
+    """
+    Compute the identity keys of a paper. Two papers sharing any key are
+    considered the same work. The title fingerprint is only a key for papers
+    without a DOI; a DOI already identifies the work.
+    """
+    keys = set()
+    external = _external_ids(paper)
+
+    doi = _paper_doi(paper)
+    if doi:
+        keys.add(f"doi:{doi}")
+
+    arxiv_id = ''
+    if paper.source == 'arxiv':
+        arxiv_id = paper.paper_id
+    elif external.get('ArXiv'):
+        arxiv_id = external['ArXiv']
+    else:
+        match = _ARXIV_DOI.match(doi)
+        if match:
+            arxiv_id = match.group(1)
+        else:
+            for link in (paper.url, paper.pdf_url):
+                match = _ARXIV_URL.search(link or '')
+                if match:
+                    arxiv_id = match.group(1)
+                    break
+    arxiv_id = normalize_arxiv_id(arxiv_id)
+    if arxiv_id:
+        keys.add(f"arxiv:{arxiv_id}")
+
+    pmid = paper.paper_id if paper.source == 'pubmed' else external.get('PubMed')
+    if pmid:
+        keys.add(f"pmid:{str(pmid).strip()}")
+
+    if not doi:
+        fingerprint = title_key(paper)
+        if fingerprint:
+            keys.add(fingerprint)
+
+    return keys
+
+
+def _merge_group(group: List[Paper]) -> Paper:
+    """Fold a group of duplicates into a copy of the first one, filling gaps from the rest."""
+    primary = group[0]
+    if len(group) == 1:
+        return primary
+
+    merged = replace(
+        primary,
+        authors=list(primary.authors),
+        categories=list(primary.categories),
+        keywords=list(primary.keywords),
+        references=list(primary.references),
+        extra=dict(primary.extra),
+    )
+    source_ids: Dict[str, List[str]] = {}
+
+    for paper in group:
+        ids = source_ids.setdefault(paper.source, [])
+        if paper.paper_id not in ids:
+            ids.append(paper.paper_id)
+        if not merged.title and paper.title:
+            merged.title = paper.title
+        if len(paper.authors) > len(merged.authors):
+            merged.authors = list(paper.authors)
+        if len(paper.abstract or '') > len(merged.abstract or ''):
+            merged.abstract = paper.abstract
+        if not merged.doi and paper.doi:
+            merged.doi = paper.doi
+        if not merged.pdf_url and paper.pdf_url:
+            merged.pdf_url = paper.pdf_url
+        if not merged.url and paper.url:
+            merged.url = paper.url
+        if not merged.published_date and paper.published_date:
+            merged.published_date = paper.published_date
+        if not merged.updated_date and paper.updated_date:
+            merged.updated_date = paper.updated_date
+        merged.citations = max(merged.citations or 0, paper.citations or 0)
+        for field_name in ('categories', 'keywords', 'references'):
+            values = getattr(merged, field_name)
+            for value in getattr(paper, field_name):
+                if value and value not in values:
+                    values.append(value)
+        for key, value in paper.extra.items():
+            merged.extra.setdefault(key, value)
+
+    merged.extra['source_ids'] = source_ids
+    return merged
+
+
+def merge_papers(papers: Iterable[Paper]) -> List[Paper]:
+    """
+    Deduplicate papers from one or more sources.
+
+    Every paper is indexed by its identity keys (normalized DOI, arXiv ID,
+    PMID, title + first-author fingerprint) in a hash map; papers that share
+    a key are joined with union-find, so the cost is linear in the number of
+    papers rather than pairwise. A paper without a DOI also joins a DOI
+    record with the same title fingerprint, but two groups whose DOIs differ
+    are never joined.
+
+    Args:
+        papers: Papers in preference order (earlier records win conflicts)
+
+    Returns:
+        One Paper per distinct work, in order of first appearance. Merged
+        records list every contributing ID per source in extra['source_ids'].
+    """
+    papers = list(papers)
+    parent = list(range(len(papers)))
+    # DOI of each group, kept at its root. arXiv's DataCite DOIs name the
+    # preprint of a work that may also have a publisher DOI, so they never conflict.
+    dois = []
+    for paper in papers:
+        doi = _paper_doi(paper)
+        dois.append('' if _ARXIV_DOI.match(doi) else doi)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j:
+            return
+        if dois[root_i] and dois[root_j] and dois[root_i] != dois[root_j]:
+            return
+        # Keep the earliest paper as the group root
+        root, child = min(root_i, root_j), max(root_i, root_j)
+        parent[child] = root
+        dois[root] = dois[root] or dois[child]
+
+    index: Dict[str, int] = {}
+    for i, paper in enumerate(papers):
+        keys = paper_keys(paper)
+        if _paper_doi(paper):
+            # Let papers without a DOI find this one by title
+            fingerprint = title_key(paper)
+            if fingerprint:
+                keys.add(fingerprint)
+        for key in keys:
+            j = index.setdefault(key, i)
+            if j != i:
+                union(i, j)
+
+    groups: Dict[int, List[Paper]] = {}
+    for i, paper in enumerate(papers):
+        groups.setdefault(find(i), []).append(paper)
+
+    return [_merge_group(groups[root]) for root in sorted(groups)]
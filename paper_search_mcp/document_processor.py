@@ -3,15 +3,17 @@ Document processing module using Docling for paper-search-mcp.
 Provides advanced PDF parsing, structure extraction, and text processing.
 """
 import os
+import logging
+import threading
+from importlib.util import find_spec
 from typing import Dict, Optional
 from pathlib import Path
 
-try:
-    from docling.document_converter import DocumentConverter
-    DOCLING_AVAILABLE = True
-except ImportError:
-    DOCLING_AVAILABLE = False
-    print("Docling not available. Install with: pip install docling")
+logger = logging.getLogger(__name__)
+
+# Docling pulls in heavy ML dependencies; it is only imported once a
+# DocumentProcessor is created, so check for it without importing it
+DOCLING_AVAILABLE = find_spec("docling") is not None
 
 class DocumentProcessor:
     """
@@ -23,7 +25,8 @@ class DocumentProcessor:
         """Initialize document processor."""
         if not DOCLING_AVAILABLE:
             raise ImportError("Docling is required for document processing")
-        
+        from docling.document_converter import DocumentConverter
+
         self.converter = DocumentConverter()
     
     async def process_pdf(self, pdf_path: str) -> Dict:
@@ -125,19 +128,16 @@ class DocumentProcessor:
     
     async def _fallback_extraction(self, pdf_path: str) -> Dict:
         """Fallback to basic PDF text extraction."""
-        from PyPDF2 import PdfReader
+        from .extraction import get_extractor
         
         try:
-            reader = PdfReader(pdf_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
+            page_count, texts = await get_extractor().extract_pages(pdf_path)
             
             return {
-                'text': text.strip(),
+                'text': "\n".join(texts).strip(),
                 'metadata': {
                     'title': '',
-                    'num_pages': len(reader.pages),
+                    'num_pages': page_count,
                     'has_tables': False,
                     'has_figures': False,
                 },
@@ -214,3 +214,24 @@ class DocumentProcessor:
             return json.dumps(doc_data, indent=2)
         else:
             return doc_data.get('text', '')
+
+
+_document_processor: Optional[DocumentProcessor] = None
+_document_processor_lock = threading.Lock()
+
+
+def get_document_processor() -> Optional[DocumentProcessor]:
+    """
+    Return the process-wide document processor, creating it on first use.
+
+    Returns:
+        The processor, or None if Docling is not installed
+    """
+    global _document_processor
+    if not DOCLING_AVAILABLE:
+        logger.warning("Docling not available. Install with: pip install docling")
+        return None
+    with _document_processor_lock:
+        if _document_processor is None:
+            _document_processor = DocumentProcessor()
+        return _document_processor
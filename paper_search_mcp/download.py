@@ -0,0 +1,248 @@
+"""
+Streaming downloads for paper-search-mcp.
+Writes responses to disk chunk by chunk, so memory use per download is
+constant, through a '.part' file that is renamed into place only when
+complete. A dropped connection is resumed with an HTTP Range request.
+"""
+import os
+import asyncio
+import logging
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional
+
+import httpx
+
+from .transport import get_client
+from .pdf_store import get_pdf_store
+from .singleflight import get_singleflight
+
+if TYPE_CHECKING:
+    from .academic_platforms.base import PaperSource
+
+logger = logging.getLogger(__name__)
+
+# Range requests attempted after a transfer is interrupted
+MAX_RESUMES = 3
+# Concurrent downloads from one host (overridable via env)
+DEFAULT_PER_HOST = 4
+
+# progress(bytes_done, total_bytes_or_None)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+_progress: ContextVar[Optional[ProgressCallback]] = ContextVar('download_progress', default=None)
+
+
+@contextmanager
+def report_progress(callback: Optional[ProgressCallback]):
+    """
+    Send progress of every download started inside the block to callback.
+
+    Searchers need no extra parameter for this: the callback travels in a
+    context variable, so it also reaches downloads made in child tasks.
+    """
+    token = _progress.set(callback)
+    try:
+        yield
+    finally:
+        _progress.reset(token)
+
+
+_host_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def per_host_limit() -> int:
+    """Concurrent downloads allowed per host (env PAPER_SEARCH_DOWNLOADS_PER_HOST)."""
+    try:
+        return max(1, int(os.getenv('PAPER_SEARCH_DOWNLOADS_PER_HOST', DEFAULT_PER_HOST)))
+    except ValueError:
+        return DEFAULT_PER_HOST
+
+
+def _host_slot(url: str) -> asyncio.Semaphore:
+    """Semaphore limiting concurrent downloads from url's host on this event loop."""
+    slots = _host_slots.setdefault(asyncio.get_running_loop(), {})
+    host = httpx.URL(url).host
+    if host not in slots:
+        slots[host] = asyncio.Semaphore(per_host_limit())
+    return slots[host]
+
+
+class DownloadError(Exception):
+    """The server answered, but not with the expected file."""
+
+
+class _Incomplete(Exception):
+    """The body ended before Content-Length bytes arrived."""
+
+
+@dataclass
+class DownloadResult:
+    """A finished download"""
+    path: str                       # Where the file was written
+    url: str                        # Final URL after redirects
+    size: int                       # Bytes on disk
+    content_type: str = ""
+    resumes: int = 0                # Range requests needed to finish
+    sha256: str = ""                # Set for downloads that went into the PDF store
+
+
+def _total_size(response: httpx.Response, offset: int) -> Optional[int]:
+    """Full file size from Content-Range (partial responses) or Content-Length."""
+    if response.status_code == 206:
+        content_range = response.headers.get('Content-Range', '')
+        total = content_range.rpartition('/')[2]
+        if total.isdigit():
+            return int(total)
+    length = response.headers.get('Content-Length')
+    if length and length.isdigit():
+        return int(length) + (offset if response.status_code == 206 else 0)
+    return None
+
+
+async def stream_to_file(url: str, path: str, headers: Dict = None, timeout: float = None,
+                         expect_content_type: str = None, verify: bool = True,
+                         progress: ProgressCallback = None,
+                         max_resumes: int = MAX_RESUMES,
+                         client: httpx.AsyncClient = None,
+                         source: "PaperSource" = None) -> DownloadResult:
+    """
+    Download url to path without holding the body in memory.
+
+    Bytes go to path + '.part', which is renamed to path once the body is
+    complete. If the connection drops, the transfer continues from the
+    bytes already on disk with a Range request (restarting from zero when
+    the server ignores Range). A '.part' file left by an earlier, failed
+    call is resumed the same way. At most per_host_limit() downloads run
+    against one host at a time.
+
+    Args:
+        url: URL to fetch
+        path: Destination file
+        headers: Extra request headers
+        timeout: Request timeout in seconds (default: the shared client's)
+        expect_content_type: Reject responses whose Content-Type doesn't start with this
+        verify: Verify TLS certificates
+        progress: Callback for progress (default: the one set by report_progress())
+        max_resumes: Range requests attempted after interruptions
+        client: HTTP client (default: the shared pooled client)
+        source: Send each request through this source's request hook (rate
+            limit, retries, circuit breaker, metrics and latency tracking)
+
+    Raises:
+        httpx.HTTPStatusError: On an error status
+        httpx.TransportError: If the transfer keeps failing after max_resumes
+        DownloadError: If the Content-Type doesn't match
+    """
+    progress = progress or _progress.get()
+    part_path = path + '.part'
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    client = client or get_client(verify=verify)
+    kwargs = {'timeout': timeout} if timeout is not None else {}
+    resumes = 0
+    async with _host_slot(url):
+        while True:
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            # Byte offsets only line up on the unencoded body
+            request_headers = dict(headers or {}, **{'Accept-Encoding': 'identity'})
+            if offset:
+                request_headers['Range'] = f"bytes={offset}-"
+            if source is not None:
+                opened = source.stream('GET', url, headers=request_headers, client=client, **kwargs)
+            else:
+                opened = client.stream('GET', url, headers=request_headers, **kwargs)
+            try:
+                async with opened as response:
+                    if response.status_code == 416 and offset:
+                        # The partial file doesn't fit the current resource; start over
+                        os.remove(part_path)
+                        resumes += 1
+                        if resumes > max_resumes:
+                            response.raise_for_status()
+                        continue
+                    response.raise_for_status()
+                    content_type = response.headers.get('Content-Type', '')
+                    if expect_content_type and not content_type.startswith(expect_content_type):
+                        raise DownloadError(
+                            f"Expected {expect_content_type} from {url}, got {content_type or 'no Content-Type'}"
+                        )
+                    if response.status_code != 206:
+                        offset = 0
+                    total = _total_size(response, offset)
+                    done = offset
+                    with open(part_path, 'ab' if offset else 'wb') as f:
+                        if progress:
+                            progress(done, total)
+                        # Write chunks as they arrive (at most one network read each),
+                        # so little is lost if the connection drops
+                        async for chunk in response.aiter_bytes():
+                            f.write(chunk)
+                            done += len(chunk)
+                            if progress:
+                                progress(done, total)
+                    if total is not None and done < total:
+                        raise _Incomplete(f"received {done} of {total} bytes")
+                    final_url = str(response.url)
+            except (httpx.TransportError, _Incomplete) as e:
+                resumes += 1
+                if resumes > max_resumes:
+                    if isinstance(e, _Incomplete):
+                        raise httpx.RemoteProtocolError(f"Download of {url} incomplete: {e}")
+                    raise
+                logger.warning(f"Download of {url} interrupted ({e}); resuming")
+                continue
+            except (httpx.HTTPStatusError, DownloadError):
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
+
+            os.replace(part_path, path)
+            return DownloadResult(path, final_url, done, content_type, resumes)
+
+
+async def download_to_store(url: str, aliases: Iterable[str], save_path: str, filename: str,
+                            metadata: Dict = None, **kwargs) -> DownloadResult:
+    """
+    Stream a PDF into the PDF store and export it as save_path/filename.
+
+    The staging file is named after the URL, so an interrupted download is
+    resumed by the next attempt. Keyword arguments go to stream_to_file().
+    """
+    result = await fetch_to_store(url, aliases, metadata, **kwargs)
+    # Hashing, copying and SQLite run in a worker thread, off the event loop
+    result.path = await asyncio.to_thread(get_pdf_store().export, result.sha256, save_path, filename)
+    return result
+
+
+async def fetch_to_store(url: str, aliases: Iterable[str], metadata: Dict = None,
+                         **kwargs) -> DownloadResult:
+    """
+    Stream a PDF into the PDF store without exporting it; result.path is the blob.
+
+    Concurrent calls for the same URL share one transfer (they would
+    otherwise write to the same staging file); each caller's aliases are
+    added to the stored blob.
+    """
+    store = get_pdf_store()
+    aliases = list(aliases)
+
+    async def transfer() -> DownloadResult:
+        result = await stream_to_file(url, store.staging_path(url), **kwargs)
+        result.sha256 = await asyncio.to_thread(store.add_file, result.path, aliases, metadata)
+        result.path = store.blob_path(result.sha256)
+        return result
+
+    flight = get_singleflight()
+    key = ('pdf', url)
+    joined = key in flight
+    result = replace(await flight.do(key, transfer))
+    if joined:
+        await asyncio.to_thread(store.add_aliases, result.sha256, aliases)
+    return result
@@ -0,0 +1,307 @@
+"""
+PDF text extraction for paper-search-mcp.
+Runs PyPDF2 in a process pool so parsing large PDFs never blocks the event
+loop, with a worker count, a per-document timeout and crash isolation
+(a worker that dies or hangs is replaced without taking the server down).
+Extracted pages are kept in the text cache, so a PDF is parsed only once,
+and can be read lazily by page range or up to a character budget.
+"""
+import os
+import re
+import asyncio
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib.metadata import version
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+from .text_cache import TextCache, get_text_cache
+
+logger = logging.getLogger(__name__)
+
+# Part of the text cache key; bump the suffix when extraction output changes.
+# PyPDF2 itself is only imported by the workers that parse PDFs
+EXTRACTOR_VERSION = f"PyPDF2-{version('PyPDF2')}/1"
+
+# Seconds one document may take before its worker is killed
+DEFAULT_TIMEOUT = 120.0
+# Pages parsed per worker call when reading lazily
+PAGE_BATCH = 8
+
+_PAGE_RANGE = re.compile(r'^(\d+)?\s*(-)?\s*(\d+)?$')
+
+
+def _default_workers() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
+class ExtractionError(Exception):
+    """A PDF could not be parsed (corrupt file, worker crash or timeout)."""
+
+
+def _extract_pages(pdf_path: str, page_numbers: Optional[Sequence[int]] = None) -> Tuple[int, List[str]]:
+    """
+    Worker function: extract the text of selected pages.
+
+    Args:
+        pdf_path: PDF file
+        page_numbers: 0-based pages to extract (default: all)
+
+    Returns:
+        (page_count, texts) with one string per requested page that exists
+        ('' when a page has no extractable text)
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(pdf_path)
+    page_count = len(reader.pages)
+    page_numbers = _valid_pages(page_numbers, page_count)
+    texts = []
+    for number in page_numbers:
+        try:
+            texts.append(reader.pages[number].extract_text() or "")
+        except Exception as e:
+            # One broken page shouldn't lose the rest of the document
+            logger.warning(f"Failed to extract text from page {number + 1} of {pdf_path}: {e}")
+            texts.append("")
+    return page_count, texts
+
+
+def parse_page_ranges(spec: str) -> List[Tuple[int, Optional[int]]]:
+    """
+    Parse a 1-based page selection such as '1-5,8,10-' into 0-based,
+    inclusive (first, last) ranges; last is None for an open end.
+
+    Raises:
+        ValueError: If the selection is malformed
+    """
+    ranges = []
+    for part in spec.split(','):
+        part = part.strip()
+        match = _PAGE_RANGE.match(part)
+        if not part or not match or not (match.group(1) or match.group(3)):
+            raise ValueError(f"Invalid page range '{part}' in '{spec}' (use e.g. '1-5,8,10-')")
+        first, dash, last = match.groups()
+        first = int(first) if first else 1
+        last = int(last) if last else (None if dash else first)
+        if first < 1 or (last is not None and last < first):
+            raise ValueError(f"Invalid page range '{part}' in '{spec}'")
+        ranges.append((first - 1, last - 1 if last is not None else None))
+    return ranges
+
+
+def select_pages(ranges: Optional[List[Tuple[int, Optional[int]]]], page_count: int) -> List[int]:
+    """0-based page numbers selected by parse_page_ranges() output (all pages if None), in order."""
+    if ranges is None:
+        return list(range(page_count))
+    numbers = []
+    seen = set()
+    for first, last in ranges:
+        last = page_count - 1 if last is None else min(last, page_count - 1)
+        for number in range(first, last + 1):
+            if number not in seen:
+                seen.add(number)
+                numbers.append(number)
+    return numbers
+
+
+def _valid_pages(page_numbers: Optional[Sequence[int]], page_count: int) -> List[int]:
+    if page_numbers is None:
+        return list(range(page_count))
+    return [number for number in page_numbers if 0 <= number < page_count]
+
+
+class PDFExtractor:
+    """
+    Extracts PDF text in a pool of worker processes.
+
+    Several documents are parsed in parallel (one per worker) while the
+    event loop keeps serving other requests.
+    """
+
+    def __init__(self, workers: int = None, timeout: float = None, cache: TextCache = None):
+        """
+        Args:
+            workers: Worker processes (default: env PAPER_SEARCH_EXTRACT_WORKERS or min(4, CPUs))
+            timeout: Seconds per document (default: env PAPER_SEARCH_EXTRACT_TIMEOUT or 120)
+            cache: Text cache (default: the shared one, unless PAPER_SEARCH_TEXT_CACHE=off)
+        """
+        self.workers = workers or int(os.getenv('PAPER_SEARCH_EXTRACT_WORKERS', 0)) or _default_workers()
+        self.timeout = timeout or float(os.getenv('PAPER_SEARCH_EXTRACT_TIMEOUT', DEFAULT_TIMEOUT))
+        self._cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> Optional[TextCache]:
+        return self._cache or get_text_cache()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _discard_pool(self, executor: ProcessPoolExecutor, kill: bool = False) -> None:
+        """Replace a broken or hung pool; the next call starts a fresh one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        if kill:
+            # A hung worker never returns; terminate it (no public API for this)
+            for process in list((executor._processes or {}).values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def extract_pages(self, pdf_path: str,
+                            page_numbers: Optional[Sequence[int]] = None) -> Tuple[int, List[str]]:
+        """
+        Extract page texts without blocking the event loop.
+
+        Pages already in the text cache (same PDF content, same extractor
+        version) are not parsed again.
+
+        Args:
+            pdf_path: PDF file
+            page_numbers: 0-based pages to extract (default: all); pages past
+                the end are ignored
+
+        Returns:
+            (page_count, texts), see _extract_pages()
+
+        Raises:
+            ExtractionError: If the PDF can't be parsed within the timeout
+        """
+        if not os.path.exists(pdf_path):
+            raise ExtractionError(f"PDF file not found: {pdf_path}")
+        pages = list(page_numbers) if page_numbers is not None else None
+
+        cache = self.cache
+        if cache is None:
+            return await self._run(pdf_path, pages)
+
+        # Hashing and decompressing are file I/O; keep them off the loop too
+        sha256 = await asyncio.to_thread(cache.file_hash, pdf_path)
+        cached = await asyncio.to_thread(cache.get, sha256, EXTRACTOR_VERSION)
+        if cached:
+            page_count, cached_pages = cached
+            wanted = _valid_pages(pages, page_count)
+            if all(cached_pages[number] is not None for number in wanted):
+                return page_count, [cached_pages[number] for number in wanted]
+
+        page_count, texts = await self._run(pdf_path, pages)
+        extracted = dict(zip(_valid_pages(pages, page_count), texts))
+        await asyncio.to_thread(cache.put, sha256, EXTRACTOR_VERSION, page_count, extracted)
+        return page_count, texts
+
+    async def _run(self, pdf_path: str, pages: Optional[List[int]]) -> Tuple[int, List[str]]:
+        """Run _extract_pages in the pool under the timeout."""
+        loop = asyncio.get_running_loop()
+
+        # One retry: a pool broken by another document's crash says nothing about this one
+        for attempt in range(2):
+            executor = self._pool()
+            try:
+                future = loop.run_in_executor(executor, _extract_pages, pdf_path, pages)
+                return await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                self._discard_pool(executor, kill=True)
+                raise ExtractionError(f"Extracting {pdf_path} took longer than {self.timeout}s")
+            except BrokenProcessPool:
+                self._discard_pool(executor)
+                if attempt:
+                    raise ExtractionError(f"Extraction worker crashed on {pdf_path}")
+                logger.warning(f"Extraction pool broke while parsing {pdf_path}; retrying")
+            except ExtractionError:
+                raise
+            except Exception as e:
+                raise ExtractionError(f"Could not parse {pdf_path}: {e}") from e
+
+    async def extract_text(self, pdf_path: str) -> str:
+        """Full text of a PDF, pages separated by newlines."""
+        _, texts = await self.extract_pages(pdf_path)
+        return "\n".join(texts).strip()
+
+    async def iter_pages(self, pdf_path: str, pages: Optional[str] = None,
+                         batch_size: int = PAGE_BATCH) -> AsyncIterator[Tuple[int, int, str]]:
+        """
+        Yield pages lazily, parsing batch_size pages per worker call.
+
+        Stopping early (e.g., once enough text was read) leaves the rest of
+        the document unparsed.
+
+        Args:
+            pdf_path: PDF file
+            pages: 1-based page selection such as '1-5,8,10-' (default: all)
+            batch_size: Pages parsed per worker call
+
+        Yields:
+            (page_number, page_count, text) with 1-based page_number
+
+        Raises:
+            ValueError: If pages is malformed
+            ExtractionError: If the PDF can't be parsed
+        """
+        ranges = parse_page_ranges(pages) if pages else None
+        # Only the page count is needed up front; no page is parsed for it
+        page_count, _ = await self.extract_pages(pdf_path, [])
+        numbers = select_pages(ranges, page_count)
+        for start in range(0, len(numbers), batch_size):
+            batch = numbers[start:start + batch_size]
+            _, texts = await self.extract_pages(pdf_path, batch)
+            for number, text in zip(batch, texts):
+                yield number + 1, page_count, text
+
+    async def read_text(self, pdf_path: str, pages: Optional[str] = None,
+                        max_chars: Optional[int] = None, page_markers: bool = False) -> str:
+        """
+        Text of selected pages, parsing no more pages than max_chars needs.
+
+        Args:
+            pdf_path: PDF file
+            pages: 1-based page selection such as '1-5,8,10-' (default: all)
+            max_chars: Stop after this many characters of text (default: no limit)
+            page_markers: Precede each non-empty page with '--- Page N ---'
+                (otherwise pages are joined with newlines)
+
+        Returns:
+            The text, ending with a note naming where it was cut if the budget ran out
+        """
+        # Without a budget every selected page is needed: parse them in one call
+        batch_size = PAGE_BATCH if max_chars else 1 << 30
+        parts: List[str] = []
+        length = 0
+        async for number, page_count, text in self.iter_pages(pdf_path, pages, batch_size):
+            if page_markers:
+                if not text:
+                    continue
+                text = f"\n--- Page {number} ---\n{text}\n"
+            elif parts:
+                text = "\n" + text
+            if max_chars and length + len(text) > max_chars:
+                parts.append(text[:max_chars - length])
+                body = "".join(parts).strip()
+                return (f"{body}\n\n[Truncated at {max_chars} characters on page {number} of "
+                        f"{page_count}; request later pages or a larger max_chars for more]")
+            parts.append(text)
+            length += len(text)
+        return "".join(parts).strip()
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_extractor: Optional[PDFExtractor] = None
+
+
+def get_extractor() -> PDFExtractor:
+    """Return the process-wide PDF extractor."""
+    global _extractor
+    if _extractor is None:
+        _extractor = PDFExtractor()
+    return _extractor
+
@@ -0,0 +1,122 @@
+"""
+Federated search for paper-search-mcp.
+Fans a query out to several searchers concurrently and yields each source's
+results as soon as they arrive, within a per-source timeout budget.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .paper import Paper
+from .breaker import CircuitOpenError, get_breakers
+
+logger = logging.getLogger(__name__)
+
+# Seconds each source may take before its results are dropped
+DEFAULT_SOURCE_TIMEOUT = 20.0
+
+
+@dataclass
+class SourceResult:
+    """Outcome of one source in a federated search"""
+    source: str                                       # Source name (e.g., 'arxiv')
+    papers: List[Paper] = field(default_factory=list)
+    status: str = "ok"                                # 'ok', 'timeout', 'error' or 'skipped'
+    elapsed: float = 0.0                              # Seconds until the source finished
+    error: str = ""                                   # Error message when status != 'ok'
+
+    def to_dict(self) -> Dict:
+        """Summarize the outcome without the papers themselves"""
+        return {
+            'status': self.status,
+            'count': len(self.papers),
+            'elapsed': round(self.elapsed, 3),
+            'error': self.error,
+        }
+
+
+async def _search_source(name: str, searcher: Any, query: str, max_results: int,
+                         timeout: float) -> SourceResult:
+    """Run one searcher under its timeout budget, never raising."""
+    start = time.monotonic()
+    try:
+        papers = await asyncio.wait_for(searcher.search(query, max_results=max_results), timeout)
+        return SourceResult(name, list(papers or []), "ok", time.monotonic() - start)
+    except asyncio.TimeoutError:
+        logger.warning(f"Source {name} exceeded its {timeout}s budget")
+        return SourceResult(name, [], "timeout", time.monotonic() - start,
+                            f"No response within {timeout} seconds")
+    except Exception as e:
+        logger.error(f"Source {name} failed: {e}")
+        return SourceResult(name, [], "error", time.monotonic() - start, str(e))
+
+
+async def _skipped(name: str, breaker_name: str) -> SourceResult:
+    """Result of a source left out because its circuit breaker is open."""
+    error = CircuitOpenError(breaker_name, get_breakers().get(breaker_name).retry_in())
+    return SourceResult(name, [], "skipped", 0.0, str(error))
+
+
+async def iter_search(searchers: Dict[str, Any], query: str, max_results: int = 10,
+                      timeout: float = DEFAULT_SOURCE_TIMEOUT) -> AsyncIterator[SourceResult]:
+    """
+    Search all given sources concurrently and yield results in completion order.
+    Sources whose circuit breaker is open are skipped at once.
+
+    Args:
+        searchers: Mapping of source name to searcher instance
+        query: Search query string
+        max_results: Maximum number of results per source
+        timeout: Per-source time budget in seconds
+
+    Yields:
+        SourceResult for each source, fastest first
+    """
+    breakers = get_breakers()
+    tasks = []
+    for name, searcher in searchers.items():
+        breaker_name = getattr(searcher, 'name', None) or name
+        if breakers.is_open(breaker_name):
+            tasks.append(asyncio.ensure_future(_skipped(name, breaker_name)))
+        else:
+            tasks.append(asyncio.ensure_future(_search_source(name, searcher, query, max_results, timeout)))
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The consumer may stop early; don't leave searches running
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def search_all(searchers: Dict[str, Any], query: str, max_results: int = 10,
+                     timeout: float = DEFAULT_SOURCE_TIMEOUT) -> List[SourceResult]:
+    """
+    Search all given sources concurrently and collect the results.
+
+    Wall-clock time is bounded by the slowest source inside the timeout budget.
+
+    Returns:
+        List of SourceResult in completion order
+    """
+    return [result async for result in iter_search(searchers, query, max_results, timeout)]
+
+
+def select_searchers(searchers: Dict[str, Any], sources: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Pick the searchers named in sources (all of them when sources is empty).
+
+    Raises:
+        ValueError: If a source name is unknown
+    """
+    if not sources:
+        return dict(searchers)
+    unknown = [name for name in sources if name not in searchers]
+    if unknown:
+        raise ValueError(
+            f"Unknown source(s): {', '.join(unknown)}. Available: {', '.join(searchers)}"
+        )
+    return {name: searchers[name] for name in sources}
@@ -1,11 +1,211 @@
 """
 SurrealDB knowledge graph and memory module for paper-search-mcp.
 Provides knowledge synthesis, storage, and retrieval capabilities.
+
+Keyword search over stored papers is served by a local SQLite FTS5 index of
+their titles and abstracts (like the bioRxiv/medRxiv mirror): SurrealDB's
+own full-text indexes cost tens of milliseconds per paper to maintain,
+which made bulk imports hundreds of times slower.
 """
 import os
-from typing import List, Dict, Optional
-from datetime import datetime
-from surrealdb import Surreal
+import re
+import asyncio
+import logging
+import sqlite3
+import threading
+from itertools import islice
+from typing import Any, Iterable, List, Dict, Optional, Tuple
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+# Papers per INSERT statement (and transaction) in store_papers_bulk()
+BULK_BATCH_SIZE = 500
+# Paper fields stored in the knowledge graph (the paper table's schema)
+PAPER_FIELDS = ('paper_id', 'title', 'authors', 'abstract', 'doi', 'published_date',
+                'source', 'url', 'pdf_url', 'categories', 'keywords')
+LIST_FIELDS = ('authors', 'categories', 'keywords')
+# URL schemes of SurrealDB's embedded engines, which take no sign-in
+EMBEDDED_SCHEMES = ('mem://', 'memory', 'file://', 'surrealkv://', 'rocksdb://')
+
+# One statement per batch: a paper already stored under the same paper_id
+# (paper_id_idx) is updated in place instead of failing the batch
+BULK_UPSERT = """
+    BEGIN TRANSACTION;
+    INSERT INTO paper $papers ON DUPLICATE KEY UPDATE
+        title = $input.title,
+        authors = $input.authors,
+        abstract = $input.abstract,
+        doi = $input.doi,
+        published_date = $input.published_date,
+        source = $input.source,
+        url = $input.url,
+        pdf_url = $input.pdf_url,
+        categories = $input.categories,
+        keywords = $input.keywords,
+        stored_at = $input.stored_at
+    RETURN NONE;
+    COMMIT TRANSACTION;
+"""
+
+# BM25 column weights: a title match counts more than an abstract match
+TITLE_WEIGHT = 2.0
+ABSTRACT_WEIGHT = 1.0
+# Papers read from SurrealDB per query when the search index is rebuilt
+REINDEX_PAGE_SIZE = 5000
+
+
+def match_expression(query: str) -> str:
+    """FTS5 query matching papers that contain every word of query."""
+    return ' '.join(f'"{word}"' for word in re.findall(r'\w+', query.lower()))
+
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not value:
+        return None
+    try:
+        return _parse_date(datetime.fromisoformat(str(value).replace('Z', '+00:00')))
+    except ValueError:
+        return None
+
+
+def paper_record(paper: Any) -> Optional[Dict]:
+    """
+    The paper table's fields for a paper, or None if it has no paper_id.
+
+    Args:
+        paper: A Paper, or a dict such as Paper.to_dict() output (lists may
+            be '; '-joined strings and dates ISO strings)
+    """
+    data = paper.to_dict() if hasattr(paper, 'to_dict') else paper
+    record = {}
+    for field in PAPER_FIELDS:
+        value = data.get(field)
+        if field in LIST_FIELDS:
+            if isinstance(value, str):
+                value = [item.strip() for item in value.split(';') if item.strip()]
+            record[field] = [str(item) for item in value or []]
+        elif field == 'published_date':
+            date = _parse_date(value)
+            if date is not None:
+                record[field] = date
+        else:
+            record[field] = str(value or '')
+    return record if record['paper_id'] else None
+
+
+class PaperIndex:
+    """
+    SQLite FTS5 index of stored papers' titles and abstracts, by paper_id.
+
+    Words are matched regardless of case, accents and word endings.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite file, or ':memory:'
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS papers (
+                    id INTEGER PRIMARY KEY,
+                    paper_id TEXT NOT NULL UNIQUE,
+                    title TEXT NOT NULL,
+                    abstract TEXT NOT NULL
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+                    title, abstract, content='papers', content_rowid='id',
+                    tokenize='porter unicode61 remove_diacritics 2'
+                );
+                CREATE TRIGGER IF NOT EXISTS papers_insert AFTER INSERT ON papers BEGIN
+                    INSERT INTO papers_fts (rowid, title, abstract) VALUES (new.id, new.title, new.abstract);
+                END;
+                CREATE TRIGGER IF NOT EXISTS papers_delete AFTER DELETE ON papers BEGIN
+                    INSERT INTO papers_fts (papers_fts, rowid, title, abstract)
+                    VALUES ('delete', old.id, old.title, old.abstract);
+                END;
+                CREATE TRIGGER IF NOT EXISTS papers_update AFTER UPDATE ON papers BEGIN
+                    INSERT INTO papers_fts (papers_fts, rowid, title, abstract)
+                    VALUES ('delete', old.id, old.title, old.abstract);
+                    INSERT INTO papers_fts (rowid, title, abstract) VALUES (new.id, new.title, new.abstract);
+                END;
+            """)
+        return self._db
+
+    def add(self, records: Iterable[Dict]) -> None:
+        """Index papers (paper table records), replacing earlier entries of the same paper_id."""
+        rows = [(r['paper_id'], r.get('title') or '', r.get('abstract') or '') for r in records]
+        with self._lock:
+            db = self._conn()
+            try:
+                db.execute("BEGIN")
+                db.executemany(
+                    "INSERT INTO papers (paper_id, title, abstract) VALUES (?, ?, ?) "
+                    "ON CONFLICT (paper_id) DO UPDATE SET title = excluded.title, abstract = excluded.abstract",
+                    rows,
+                )
+                db.execute("COMMIT")
+            except sqlite3.Error:
+                db.execute("ROLLBACK")
+                raise
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> List[Tuple[str, float]]:
+        """
+        paper_ids ranked by BM25 over title and abstract.
+
+        Returns:
+            (paper_id, score) pairs, best first; higher scores are better matches
+        """
+        expression = match_expression(query)
+        if not expression:
+            return []
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT p.paper_id, bm25(papers_fts, ?, ?) AS rank FROM papers_fts "
+                "JOIN papers p ON p.id = papers_fts.rowid "
+                "WHERE papers_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+                (TITLE_WEIGHT, ABSTRACT_WEIGHT, expression, limit, offset),
+            ).fetchall()
+        # bm25() is lower for better matches; report it so higher is better
+        return [(paper_id, -rank) for paper_id, rank in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn().execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._conn()
+            db.execute("DELETE FROM papers")
+            db.execute("INSERT INTO papers_fts (papers_fts) VALUES ('delete-all')")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def default_index_path(url: str, namespace: str, database: str) -> str:
+    """Search index file for a SurrealDB database (in memory for an in-memory database)."""
+    if url.startswith(('mem://', 'memory')):
+        return ':memory:'
+    return os.path.join(os.getenv('DATA_DIR', './data'), f"knowledge-{namespace}-{database}.sqlite3")
+
 
 class KnowledgeStore:
     """
@@ -14,7 +214,7 @@ class KnowledgeStore:
     """
     
     def __init__(self, url: str = None, user: str = None, password: str = None,
-                 namespace: str = None, database: str = None):
+                 namespace: str = None, database: str = None, index_path: str = None):
         """
         Initialize SurrealDB connection.
         
@@ -24,61 +224,78 @@ class KnowledgeStore:
             password: Database password (default: from env SURREALDB_PASS)
             namespace: Database namespace (default: from env SURREALDB_NS)
             database: Database name (default: from env SURREALDB_DB)
+            index_path: SQLite file of the keyword search index
+                (default: $DATA_DIR/knowledge-<namespace>-<database>.sqlite3)
         """
         self.url = url or os.getenv('SURREALDB_URL', 'ws://localhost:8000/rpc')
         self.user = user or os.getenv('SURREALDB_USER', 'root')
         self.password = password or os.getenv('SURREALDB_PASS', 'root')
         self.namespace = namespace or os.getenv('SURREALDB_NS', 'paper_search')
         self.database = database or os.getenv('SURREALDB_DB', 'knowledge')
+        self.index = PaperIndex(index_path or default_index_path(self.url, self.namespace, self.database))
+        self._index_checked = False
         self.db = None
     
     async def connect(self):
         """Establish connection to SurrealDB."""
         if not self.db:
-            self.db = Surreal(self.url)
-            await self.db.signin({"username": self.user, "password": self.password})
-            await self.db.use(self.namespace, self.database)
+            # Imported here: the client and its dependencies are slow to load
+            from surrealdb import AsyncSurreal
+            db = AsyncSurreal(self.url)
+            await db.connect()
+            if not self.url.startswith(EMBEDDED_SCHEMES):
+                await db.signin({"username": self.user, "password": self.password})
+            await db.use(self.namespace, self.database)
+            self.db = db
             await self._init_schema()
     
     async def _init_schema(self):
         """Initialize database schema for papers and knowledge."""
         # Define paper table
         await self.db.query("""
-            DEFINE TABLE paper SCHEMAFULL;
-            DEFINE FIELD paper_id ON paper TYPE string;
-            DEFINE FIELD title ON paper TYPE string;
-            DEFINE FIELD authors ON paper TYPE array;
-            DEFINE FIELD abstract ON paper TYPE string;
-            DEFINE FIELD doi ON paper TYPE string;
-            DEFINE FIELD published_date ON paper TYPE datetime;
-            DEFINE FIELD source ON paper TYPE string;
-            DEFINE FIELD url ON paper TYPE string;
-            DEFINE FIELD pdf_url ON paper TYPE string;
-            DEFINE FIELD categories ON paper TYPE array;
-            DEFINE FIELD keywords ON paper TYPE array;
-            DEFINE FIELD stored_at ON paper TYPE datetime;
-            DEFINE INDEX paper_id_idx ON paper FIELDS paper_id UNIQUE;
+            DEFINE TABLE IF NOT EXISTS paper SCHEMAFULL;
+            DEFINE FIELD IF NOT EXISTS paper_id ON paper TYPE string;
+            DEFINE FIELD IF NOT EXISTS title ON paper TYPE string;
+            DEFINE FIELD IF NOT EXISTS authors ON paper TYPE array<string>;
+            DEFINE FIELD IF NOT EXISTS abstract ON paper TYPE string;
+            DEFINE FIELD IF NOT EXISTS doi ON paper TYPE string;
+            DEFINE FIELD IF NOT EXISTS published_date ON paper TYPE option<datetime>;
+            DEFINE FIELD IF NOT EXISTS source ON paper TYPE string;
+            DEFINE FIELD IF NOT EXISTS url ON paper TYPE string;
+            DEFINE FIELD IF NOT EXISTS pdf_url ON paper TYPE string;
+            DEFINE FIELD IF NOT EXISTS categories ON paper TYPE array<string>;
+            DEFINE FIELD IF NOT EXISTS keywords ON paper TYPE array<string>;
+            DEFINE FIELD IF NOT EXISTS stored_at ON paper TYPE datetime;
+            DEFINE INDEX IF NOT EXISTS paper_id_idx ON paper FIELDS paper_id UNIQUE;
+        """)
+        
+        # Full-text indexes of earlier versions: search_papers() now uses
+        # the local PaperIndex, and these would slow every insert
+        await self.db.query("""
+            REMOVE INDEX IF EXISTS paper_title_search ON paper;
+            REMOVE INDEX IF EXISTS paper_abstract_search ON paper;
+            REMOVE ANALYZER IF EXISTS paper_text;
         """)
         
         # Define concept table for extracted knowledge
         await self.db.query("""
-            DEFINE TABLE concept SCHEMAFULL;
-            DEFINE FIELD name ON concept TYPE string;
-            DEFINE FIELD description ON concept TYPE string;
-            DEFINE FIELD category ON concept TYPE string;
-            DEFINE FIELD frequency ON concept TYPE int DEFAULT 1;
-            DEFINE FIELD created_at ON concept TYPE datetime;
-            DEFINE INDEX concept_name_idx ON concept FIELDS name UNIQUE;
+            DEFINE TABLE IF NOT EXISTS concept SCHEMAFULL;
+            DEFINE FIELD IF NOT EXISTS name ON concept TYPE string;
+            DEFINE FIELD IF NOT EXISTS description ON concept TYPE string;
+            DEFINE FIELD IF NOT EXISTS category ON concept TYPE string;
+            DEFINE FIELD IF NOT EXISTS frequency ON concept TYPE int DEFAULT 1;
+            DEFINE FIELD IF NOT EXISTS created_at ON concept TYPE datetime;
+            DEFINE INDEX IF NOT EXISTS concept_name_idx ON concept FIELDS name UNIQUE;
         """)
         
         # Define relationship edges
         await self.db.query("""
-            DEFINE TABLE relates_to SCHEMAFULL TYPE RELATION;
-            DEFINE FIELD in ON relates_to TYPE record;
-            DEFINE FIELD out ON relates_to TYPE record;
-            DEFINE FIELD relationship_type ON relates_to TYPE string;
-            DEFINE FIELD strength ON relates_to TYPE float DEFAULT 1.0;
-            DEFINE FIELD created_at ON relates_to TYPE datetime;
+            DEFINE TABLE IF NOT EXISTS relates_to SCHEMAFULL TYPE RELATION;
+            DEFINE FIELD IF NOT EXISTS in ON relates_to TYPE record;
+            DEFINE FIELD IF NOT EXISTS out ON relates_to TYPE record;
+            DEFINE FIELD IF NOT EXISTS relationship_type ON relates_to TYPE string;
+            DEFINE FIELD IF NOT EXISTS strength ON relates_to TYPE float DEFAULT 1.0;
+            DEFINE FIELD IF NOT EXISTS created_at ON relates_to TYPE datetime;
         """)
     
     async def store_paper(self, paper_data: Dict) -> str:
@@ -93,13 +310,73 @@ class KnowledgeStore:
         """
         await self.connect()
         
-        # Add storage timestamp
-        paper_data['stored_at'] = datetime.utcnow().isoformat()
+        # Coerce to the paper table's schema and add storage timestamp
+        record = paper_record(paper_data) or paper_data
+        record['stored_at'] = datetime.now(timezone.utc)
         
         # Store paper
-        result = await self.db.create('paper', paper_data)
-        return result[0]['id'] if result else None
+        result = await self.db.create('paper', record)
+        if isinstance(result, list):
+            result = result[0] if result else None
+        if result and record.get('paper_id'):
+            await asyncio.to_thread(self.index.add, [record])
+        return str(result['id']) if result else None
     
+    async def store_papers_bulk(self, papers: Iterable[Any], batch_size: int = BULK_BATCH_SIZE) -> Dict:
+        """
+        Store many papers, batch_size per INSERT statement and transaction.
+
+        Papers already stored with the same paper_id are updated instead of
+        duplicated. A batch that fails is rolled back on its own; the others
+        are still stored. Stored batches are added to the keyword search index.
+
+        Args:
+            papers: Papers or paper dicts (e.g. Paper.to_dict() output); read lazily
+            batch_size: Papers per statement
+
+        Returns:
+            Counts of 'stored', 'skipped' (no paper_id) and 'failed' papers,
+            'batches' sent, and up to ten 'errors'
+        """
+        await self.connect()
+
+        stats = {'stored': 0, 'skipped': 0, 'failed': 0, 'batches': 0, 'errors': []}
+        papers = iter(papers)
+        while True:
+            chunk = list(islice(papers, batch_size))
+            if not chunk:
+                break
+            # Within a batch the last copy of a paper wins
+            records = {}
+            for paper in chunk:
+                record = paper_record(paper)
+                if record is None:
+                    stats['skipped'] += 1
+                    continue
+                records[record['paper_id']] = record
+            if not records:
+                continue
+            now = datetime.now(timezone.utc)
+            for record in records.values():
+                record['stored_at'] = now
+            stats['batches'] += 1
+            try:
+                await self.db.query(BULK_UPSERT, {'papers': list(records.values())})
+                stats['stored'] += len(records)
+            except Exception as e:
+                logger.error(f"Storing a batch of {len(records)} papers failed: {e}")
+                stats['failed'] += len(records)
+                if len(stats['errors']) < 10:
+                    stats['errors'].append(str(e))
+                continue
+            try:
+                await asyncio.to_thread(self.index.add, records.values())
+            except sqlite3.Error as e:
+                # Stored but not searchable: have the next search rebuild the index
+                logger.error(f"Indexing a batch of {len(records)} papers failed: {e}")
+                self._index_checked = False
+        return stats
+
     async def get_paper(self, paper_id: str) -> Optional[Dict]:
         """
         Retrieve a paper by its ID.
@@ -118,27 +395,71 @@ class KnowledgeStore:
         )
         return result[0] if result and len(result) > 0 else None
     
-    async def search_papers(self, query: str, limit: int = 10) -> List[Dict]:
+    async def search_papers(self, query: str, limit: int = 10, offset: int = 0) -> List[Dict]:
         """
-        Search papers by keywords in title or abstract.
+        Search papers by keywords in title or abstract, best matches first.
+        
+        Papers are ranked by BM25 in the local PaperIndex, then read from
+        SurrealDB; matching ignores case, accents and word endings, and
+        title matches weigh more than abstract matches. The first search
+        rebuilds the index if it doesn't hold as many papers as SurrealDB
+        (e.g. a new index file, or papers stored from another host).
         
         Args:
             query: Search query
             limit: Maximum results to return
+            offset: Number of ranked results to skip (for paging)
             
         Returns:
-            List of matching papers
+            List of matching papers, each with its relevance 'score'
         """
+        if not query.strip():
+            return []
         await self.connect()
-        
-        result = await self.db.query("""
-            SELECT * FROM paper 
-            WHERE title CONTAINS $query OR abstract CONTAINS $query
-            ORDER BY stored_at DESC
-            LIMIT $limit
-        """, {"query": query, "limit": limit})
-        
-        return result if result else []
+        if not self._index_checked:
+            await self.sync_index()
+
+        ranked = await asyncio.to_thread(self.index.search, query, max(0, limit), max(0, offset))
+        if not ranked:
+            return []
+        result = await self.db.query(
+            "SELECT * FROM paper WHERE paper_id IN $paper_ids",
+            {"paper_ids": [paper_id for paper_id, _ in ranked]}
+        )
+        papers = {paper['paper_id']: paper for paper in result or []}
+        return [dict(papers[paper_id], score=round(score, 4))
+                for paper_id, score in ranked if paper_id in papers]
+
+    async def sync_index(self, force: bool = False) -> int:
+        """
+        Rebuild the keyword search index from SurrealDB if it is out of step.
+
+        Args:
+            force: Rebuild even if the index holds as many papers as SurrealDB
+
+        Returns:
+            Number of papers indexed (0 if the index was left as it was)
+        """
+        await self.connect()
+        counts = await self.db.query("SELECT count() FROM paper GROUP ALL")
+        stored = counts[0]['count'] if counts else 0
+        self._index_checked = True
+        if not force and stored == await asyncio.to_thread(self.index.count):
+            return 0
+
+        await asyncio.to_thread(self.index.clear)
+        indexed = 0
+        while True:
+            page = await self.db.query(
+                "SELECT paper_id, title, abstract FROM paper START $start LIMIT $limit",
+                {"start": indexed, "limit": REINDEX_PAGE_SIZE}
+            )
+            if not page:
+                break
+            await asyncio.to_thread(self.index.add, page)
+            indexed += len(page)
+        logger.info(f"Rebuilt the knowledge search index: {indexed} papers")
+        return indexed
     
     async def add_concept(self, name: str, description: str, category: str = "general") -> str:
         """
@@ -263,9 +584,9 @@ class KnowledgeStore:
         """
         await self.connect()
         
-        papers_count = await self.db.query("SELECT COUNT() FROM paper")
-        concepts_count = await self.db.query("SELECT COUNT() FROM concept")
-        relations_count = await self.db.query("SELECT COUNT() FROM relates_to")
+        papers_count = await self.db.query("SELECT count() FROM paper GROUP ALL")
+        concepts_count = await self.db.query("SELECT count() FROM concept GROUP ALL")
+        relations_count = await self.db.query("SELECT count() FROM relates_to GROUP ALL")
         
         return {
             "papers": papers_count[0]['count'] if papers_count else 0,
@@ -278,3 +599,15 @@ class KnowledgeStore:
         if self.db:
             await self.db.close()
             self.db = None
+        self.index.close()
+
+
+_knowledge_store: Optional[KnowledgeStore] = None
+
+
+def get_knowledge_store() -> KnowledgeStore:
+    """Return the process-wide knowledge store (connected on first query)."""
+    global _knowledge_store
+    if _knowledge_store is None:
+        _knowledge_store = KnowledgeStore()
+    return _knowledge_store
@@ -0,0 +1,184 @@
+"""
+Latency tracking, adaptive timeouts and hedged requests for paper-search-mcp.
+Each source keeps a histogram of its recent response times. Once it has
+enough samples, timeouts follow the observed p99 (times a safety factor)
+instead of a fixed number, and idempotent GETs that are still waiting after
+the p95 delay get one duplicate ("hedge") request; whichever answers first
+wins. Hedges are paid for from a small budget earned per request, so they
+add at most a few percent of upstream load.
+"""
+import math
+import asyncio
+import logging
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from .transport import _env_float, get_config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Histogram buckets grow geometrically from MIN_LATENCY to MAX_LATENCY seconds
+MIN_LATENCY = 0.005
+MAX_LATENCY = 300.0
+BUCKET_GROWTH = 1.15
+# Observations after which older counts are halved, so recent behaviour dominates
+DECAY_EVERY = 500
+# Samples needed before timeouts and hedging adapt
+MIN_SAMPLES = 20
+# Never hedge sooner than this, however fast the source usually is
+MIN_HEDGE_DELAY = 0.05
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of response times with exponential decay"""
+
+    def __init__(self, decay_every: int = DECAY_EVERY):
+        count = math.ceil(math.log(MAX_LATENCY / MIN_LATENCY, BUCKET_GROWTH)) + 1
+        self.bounds: List[float] = [MIN_LATENCY * BUCKET_GROWTH ** i for i in range(count)]
+        self.counts: List[float] = [0.0] * count
+        self.samples = 0                    # Observations so far (not decayed)
+        self.decay_every = decay_every
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        if seconds <= MIN_LATENCY:
+            index = 0
+        else:
+            index = min(len(self.bounds) - 1, math.ceil(math.log(seconds / MIN_LATENCY, BUCKET_GROWTH)))
+        with self._lock:
+            self.counts[index] += 1
+            self.samples += 1
+            if self.samples % self.decay_every == 0:
+                self.counts = [c / 2 for c in self.counts]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None without samples)."""
+        with self._lock:
+            total = sum(self.counts)
+            if not total:
+                return None
+            rank = q * total
+            seen = 0.0
+            for bound, count in zip(self.bounds, self.counts):
+                seen += count
+                if seen >= rank:
+                    return bound
+            return self.bounds[-1]
+
+
+class HedgeBudget:
+    """Each request earns `fraction` of a hedge; a hedge costs one (at most `burst` saved)"""
+
+    def __init__(self, fraction: float, burst: float = 5.0):
+        self.fraction = fraction
+        self.burst = burst
+        self.tokens = 0.0
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + self.fraction)
+
+    def spend(self) -> bool:
+        with self._lock:
+            if self.fraction <= 0 or self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class LatencyTracker:
+    """
+    Response times of one source and the timeouts and hedge delays derived
+    from them.
+
+    Settings can be overridden with environment variables:
+        PAPER_SEARCH_TIMEOUT_FACTOR: timeout = p99 * factor (default: 3)
+        PAPER_SEARCH_MIN_TIMEOUT: adaptive timeouts never go below this (default: 5s)
+        PAPER_SEARCH_HEDGE_BUDGET: extra requests hedging may add, as a
+            fraction of requests (default: 0.05; 0 disables hedging)
+    """
+
+    def __init__(self, factor: float = None, min_timeout: float = None, hedge_budget: float = None,
+                 min_samples: int = None):
+        self.histogram = LatencyHistogram()
+        self.factor = factor if factor is not None else _env_float('PAPER_SEARCH_TIMEOUT_FACTOR', 3.0)
+        self.min_timeout = min_timeout if min_timeout is not None else _env_float('PAPER_SEARCH_MIN_TIMEOUT', 5.0)
+        if hedge_budget is None:
+            hedge_budget = _env_float('PAPER_SEARCH_HEDGE_BUDGET', 0.05)
+        self.budget = HedgeBudget(hedge_budget)
+        self.min_samples = min_samples if min_samples is not None else MIN_SAMPLES
+        self.hedges = 0             # Duplicate requests sent
+        self.hedge_wins = 0         # Hedges that answered first
+
+    @property
+    def ready(self) -> bool:
+        return self.histogram.samples >= self.min_samples
+
+    def observe(self, seconds: float) -> None:
+        self.histogram.observe(seconds)
+
+    def timeout(self, ceiling: Optional[float] = None) -> float:
+        """
+        Timeout for the next request: p99 times the factor, at least
+        min_timeout and never above ceiling (the caller's fixed timeout,
+        default: the shared client's).
+        """
+        if ceiling is None:
+            ceiling = get_config().timeout
+        if not self.ready:
+            return ceiling
+        return min(ceiling, max(self.min_timeout, self.histogram.quantile(0.99) * self.factor))
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging (the p95), or None until there are enough samples."""
+        if not self.ready:
+            return None
+        return max(MIN_HEDGE_DELAY, self.histogram.quantile(0.95))
+
+    def to_dict(self) -> Dict:
+        quantiles = {f"p{round(q * 100)}": self.histogram.quantile(q) for q in (0.5, 0.95, 0.99)}
+        return dict({k: round(v, 3) if v is not None else None for k, v in quantiles.items()},
+                    samples=self.histogram.samples, hedges=self.hedges, hedge_wins=self.hedge_wins)
+
+
+async def hedged(send: Callable[[], Awaitable[T]], tracker: LatencyTracker,
+                 delay: Optional[float], hedge: Callable[[], Awaitable[T]] = None) -> T:
+    """
+    Await send(); if it hasn't finished after delay seconds and the budget
+    allows, start a second call and return whichever succeeds first.
+
+    The slower call is cancelled. If both fail, the first call's error is raised.
+
+    Args:
+        send: Starts one attempt (must be idempotent)
+        tracker: Source whose hedge budget and counters are used
+        delay: Seconds before hedging; None disables hedging for this call
+        hedge: Starts the duplicate (default: send), e.g. after taking its own rate-limit token
+    """
+    tracker.budget.earn()
+    if delay is None:
+        return await send()
+    primary = asyncio.ensure_future(send())
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not tracker.budget.spend():
+            return await primary
+        tracker.hedges += 1
+        hedge = asyncio.ensure_future((hedge or send)())
+        try:
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (primary, hedge):
+                    if task in done and not task.cancelled() and task.exception() is None:
+                        if task is hedge:
+                            tracker.hedge_wins += 1
+                        return task.result()
+            return primary.result()
+        finally:
+            hedge.cancel()
+    finally:
+        primary.cancel()
@@ -0,0 +1,282 @@
+"""
+Content-addressed PDF store for paper-search-mcp.
+Keeps each PDF once (sha256-keyed, sharded directories) and maps DOIs,
+arXiv IDs and source-specific IDs to it, so a paper fetched through several
+sources is downloaded and stored only once.
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from .dedup import normalize_doi, normalize_arxiv_id
+
+logger = logging.getLogger(__name__)
+
+
+def _default_root() -> str:
+    return os.getenv('PAPER_SEARCH_PDF_STORE', os.path.join(os.getenv('DATA_DIR', './data'), 'pdfs'))
+
+
+def pdf_aliases(source: str = None, paper_id: str = None, doi: str = None,
+                arxiv_id: str = None, pmid: str = None) -> List[str]:
+    """
+    Build the normalized alias keys for a PDF.
+
+    Semantic Scholar style prefixed IDs ('DOI:...', 'ARXIV:...', 'PMID:...')
+    are recognized in paper_id and mapped to the shared alias namespaces.
+    Versioned arXiv IDs stay versioned; see versionless_arxiv_alias().
+    """
+    aliases = []
+    if paper_id:
+        prefix, _, rest = paper_id.partition(':')
+        prefix = prefix.upper()
+        if rest and prefix == 'DOI':
+            doi = doi or rest
+        elif rest and prefix == 'ARXIV':
+            arxiv_id = arxiv_id or rest
+        elif rest and prefix == 'PMID':
+            pmid = pmid or rest
+        elif source:
+            aliases.append(f"{source}:{paper_id.strip()}")
+    if doi and normalize_doi(doi):
+        aliases.append(f"doi:{normalize_doi(doi)}")
+    if arxiv_id:
+        # Keep the version suffix: v1 and v5 are different PDFs
+        arxiv_id = arxiv_id.strip().lower()
+        if arxiv_id.startswith('arxiv:'):
+            arxiv_id = arxiv_id[6:]
+        aliases.append(f"arxiv:{arxiv_id}")
+    if pmid:
+        aliases.append(f"pmid:{str(pmid).strip()}")
+    return aliases
+
+
+def versionless_arxiv_alias(arxiv_id: str) -> str:
+    """Alias under which a versioned arXiv PDF also answers requests for the bare ID."""
+    return f"arxiv:{normalize_arxiv_id(arxiv_id)}"
+
+
+def sha256_file(path: str) -> str:
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Linux ioctl that makes dst share src's extents copy-on-write (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+
+def _reflink(src, dst) -> bool:
+    """Clone src into dst where the filesystem supports it; False if it doesn't."""
+    try:
+        import fcntl
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except (ImportError, OSError):
+        return False
+
+
+class PDFStore:
+    """
+    PDF blobs stored by sha256 under `root/ab/cd/<sha256>.pdf` plus an alias
+    index (SQLite) from identifiers to blobs.
+
+    Callers still get a file of their own in save_path: blobs are cloned
+    (reflinked) where the filesystem supports it, else copied, so editing a
+    downloaded PDF never changes the stored blob. Blobs are read-only. A
+    copied export takes as much disk space as its blob.
+
+    Methods block (hashing, copying, SQLite); async callers run them with
+    asyncio.to_thread().
+    """
+
+    def __init__(self, root: str = None):
+        """
+        Args:
+            root: Store directory (default: env PAPER_SEARCH_PDF_STORE or $DATA_DIR/pdfs)
+        """
+        self.root = root or _default_root()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(self.root, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(self.root, 'index.sqlite3'),
+                                       check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    sha256 TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    metadata TEXT
+                )
+            """)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS aliases (
+                    alias TEXT PRIMARY KEY,
+                    sha256 TEXT NOT NULL REFERENCES blobs(sha256)
+                )
+            """)
+        return self._db
+
+    def blob_path(self, sha256: str) -> str:
+        """Sharded location of a blob."""
+        return os.path.join(self.root, sha256[:2], sha256[2:4], f"{sha256}.pdf")
+
+    def staging_path(self, key: str) -> str:
+        """Stable scratch file for an in-flight download of key (e.g., its URL)."""
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.root, 'staging', f"{name}.pdf")
+
+    def find(self, aliases: Iterable[str]) -> Optional[str]:
+        """Return the sha256 of the first alias that points to an existing blob."""
+        aliases = [alias for alias in aliases if alias]
+        if not aliases:
+            return None
+        with self._lock:
+            for alias in aliases:
+                row = self._conn().execute(
+                    "SELECT sha256 FROM aliases WHERE alias = ?", (alias,)
+                ).fetchone()
+                if row and os.path.exists(self.blob_path(row[0])):
+                    return row[0]
+        return None
+
+    def get_metadata(self, sha256: str) -> Dict:
+        """Metadata stored alongside a blob (e.g., title and authors)."""
+        with self._lock:
+            row = self._conn().execute("SELECT metadata FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def set_metadata(self, sha256: str, metadata: Dict) -> None:
+        """Attach paper metadata to an existing blob."""
+        with self._lock:
+            self._conn().execute("UPDATE blobs SET metadata = ? WHERE sha256 = ?",
+                                 (json.dumps(metadata, default=str), sha256))
+
+    def add_aliases(self, sha256: str, aliases: Iterable[str]) -> None:
+        """Point more identifiers at an existing blob."""
+        with self._lock:
+            db = self._conn()
+            for alias in aliases:
+                if alias:
+                    db.execute("INSERT OR REPLACE INTO aliases (alias, sha256) VALUES (?, ?)", (alias, sha256))
+
+    def add_file(self, path: str, aliases: Iterable[str], metadata: Dict = None) -> str:
+        """
+        Move a downloaded file into the store.
+
+        Args:
+            path: File to ingest (it is moved, or removed if the blob already exists)
+            aliases: Identifiers for the PDF (see pdf_aliases())
+            metadata: Optional JSON-serializable paper metadata
+
+        Returns:
+            sha256 of the stored blob
+        """
+        sha256 = sha256_file(path)
+        target = self.blob_path(sha256)
+        if os.path.exists(target):
+            os.remove(path)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.move(path, target)
+            os.chmod(target, 0o444)
+        with self._lock:
+            self._conn().execute(
+                "INSERT INTO blobs (sha256, size, created, metadata) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(sha256) DO UPDATE SET metadata = COALESCE(excluded.metadata, blobs.metadata)",
+                (sha256, os.path.getsize(target), time.time(),
+                 json.dumps(metadata, default=str) if metadata else None),
+            )
+        self.add_aliases(sha256, aliases)
+        return sha256
+
+    def add_bytes(self, content: bytes, aliases: Iterable[str], metadata: Dict = None) -> str:
+        """Store PDF bytes; returns the sha256 of the blob."""
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            return self.add_file(tmp_path, aliases, metadata)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def export(self, sha256: str, save_path: str, filename: str) -> str:
+        """
+        Make a blob available as save_path/filename (reflink, else copy).
+
+        A previous export that is unchanged (same size and modification
+        time as the blob) is reused.
+
+        Returns:
+            Path of the exported file
+        """
+        os.makedirs(save_path, exist_ok=True)
+        target = os.path.join(save_path, filename)
+        blob = self.blob_path(sha256)
+        blob_stat = os.stat(blob)
+        if os.path.exists(target):
+            stat = os.stat(target)
+            # Hard links from older versions share the blob's inode: replace them
+            linked = (stat.st_ino, stat.st_dev) == (blob_stat.st_ino, blob_stat.st_dev)
+            if not linked and (stat.st_size, stat.st_mtime_ns) == (blob_stat.st_size, blob_stat.st_mtime_ns):
+                return target
+        fd, tmp_path = tempfile.mkstemp(dir=save_path, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as dst, open(blob, 'rb') as src:
+                if not _reflink(src, dst):
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            # Keep the blob's mtime so unchanged exports are recognized (and
+            # the text cache's memoized hash stays valid)
+            os.utime(tmp_path, ns=(blob_stat.st_atime_ns, blob_stat.st_mtime_ns))
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return target
+
+    def lookup(self, aliases: Iterable[str], save_path: str, filename: str) -> Optional[str]:
+        """Export the stored PDF for any of the aliases, or return None if unknown."""
+        sha256 = self.find(aliases)
+        if sha256 is None:
+            return None
+        logger.info(f"PDF store hit for {filename} ({sha256[:12]})")
+        return self.export(sha256, save_path, filename)
+
+    def save(self, content: bytes, aliases: Iterable[str], save_path: str, filename: str,
+             metadata: Dict = None) -> str:
+        """Store downloaded bytes and export them as save_path/filename."""
+        sha256 = self.add_bytes(content, aliases, metadata)
+        return self.export(sha256, save_path, filename)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_pdf_store: Optional[PDFStore] = None
+
+
+def get_pdf_store() -> PDFStore:
+    """Return the process-wide PDF store."""
+    global _pdf_store
+    if _pdf_store is None:
+        _pdf_store = PDFStore()
+    return _pdf_store
@@ -0,0 +1,246 @@
+"""
+Rate limiting and retries for paper-search-mcp.
+Requests wait for a per-host token bucket and are retried after 429/5xx
+answers (honouring Retry-After, else jittered exponential backoff). All
+waiting is done with asyncio.sleep, so a throttled source only delays its
+own requests, never the rest of the server.
+"""
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from .transport import get_client, _env_int
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: throttling and transient server failures
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Never wait longer than this for one retry, whatever Retry-After says
+MAX_RETRY_DELAY = 60.0
+
+Send = Callable[[], Awaitable[httpx.Response]]
+# wrap_attempt(send, send_again) in fetch()
+AttemptWrapper = Callable[[Send, Send], Awaitable[httpx.Response]]
+
+
+@dataclass
+class HostPolicy:
+    """Request budget for one host"""
+    rate: float                 # Sustained requests per second
+    burst: int = 1              # Requests allowed back to back
+    jitter: float = 0.0         # Extra random delay (seconds) per request
+
+
+def _semantic_policy() -> HostPolicy:
+    # An API key gets a dedicated 1 req/s; anonymous use shares a global pool
+    if os.getenv("SEMANTIC_SCHOLAR_API_KEY", "").strip():
+        return HostPolicy(rate=1.0, burst=1)
+    return HostPolicy(rate=0.5, burst=2)
+
+
+def _ncbi_policy() -> HostPolicy:
+    # E-utilities allow 3 requests/s, or 10 with an NCBI API key
+    if os.getenv("NCBI_API_KEY", "").strip():
+        return HostPolicy(rate=10.0, burst=10)
+    return HostPolicy(rate=3.0, burst=3)
+
+
+def default_policies() -> Dict[str, HostPolicy]:
+    """Built-in per-host policies, following each API's published limits."""
+    return {
+        "api.semanticscholar.org": _semantic_policy(),
+        "api.crossref.org": HostPolicy(rate=10.0, burst=10),
+        "scholar.google.com": HostPolicy(rate=0.5, burst=1, jitter=1.0),
+        "eutils.ncbi.nlm.nih.gov": _ncbi_policy(),
+        "export.arxiv.org": HostPolicy(rate=1 / 3, burst=4),
+    }
+
+
+def _env_policies() -> Dict[str, HostPolicy]:
+    """
+    Overrides from PAPER_SEARCH_RATE_LIMITS, e.g.
+    'api.crossref.org=20:20,scholar.google.com=0.2:1' (host=rate[:burst]).
+    """
+    policies = {}
+    for item in os.getenv("PAPER_SEARCH_RATE_LIMITS", "").split(","):
+        host, _, spec = item.strip().partition("=")
+        if not host or not spec:
+            continue
+        rate, _, burst = spec.partition(":")
+        try:
+            policies[host] = HostPolicy(rate=float(rate), burst=int(burst or 1))
+        except ValueError:
+            logger.warning(f"Invalid rate limit '{item}' in PAPER_SEARCH_RATE_LIMITS")
+    return policies
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of blocking.
+
+    Each request takes a token; when none is left the bucket goes into
+    debt and the caller is told how long to wait, so concurrent callers
+    are spaced out in arrival order without holding a lock while they sleep.
+    """
+
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self.tokens = float(policy.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.policy.burst, self.tokens + (now - self.updated) * self.policy.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = -self.tokens / self.policy.rate if self.tokens < 0 else 0.0
+        if self.policy.jitter:
+            delay += random.uniform(0, self.policy.jitter)
+        return delay
+
+
+class RateLimiter:
+    """Per-host token buckets; hosts without a policy are not limited."""
+
+    def __init__(self, policies: Dict[str, HostPolicy] = None):
+        self.policies = policies if policies is not None else dict(default_policies(), **_env_policies())
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> Optional[TokenBucket]:
+        policy = self.policies.get(host)
+        if policy is None:
+            return None
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(policy)
+            return self._buckets[host]
+
+    async def acquire(self, url: str) -> float:
+        """Wait for url's host budget; returns the seconds waited."""
+        bucket = self.bucket(httpx.URL(url).host)
+        if bucket is None:
+            return 0.0
+        delay = bucket.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+def configure_rate_limits(policies: Dict[str, HostPolicy] = None) -> RateLimiter:
+    """Replace the process-wide limiter (default policies plus env overrides if None)."""
+    global _rate_limiter
+    _rate_limiter = RateLimiter(policies)
+    return _rate_limiter
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = MAX_RETRY_DELAY) -> float:
+    """Exponential backoff with jitter: a random delay in [d/2, d] for d = base * 2^attempt."""
+    delay = min(cap, base * (2 ** attempt))
+    return random.uniform(delay / 2, delay)
+
+
+async def fetch(method: str, url: str, retries: int = None, backoff: float = 1.0,
+                client: httpx.AsyncClient = None, wrap_attempt: AttemptWrapper = None,
+                stream: bool = False, **kwargs) -> httpx.Response:
+    """
+    Send a request through the host's rate limit, retrying transient failures.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        retries: Retries after 429/5xx answers or connection errors
+            (default: env PAPER_SEARCH_HTTP_RETRIES or 3)
+        backoff: Base delay in seconds for exponential backoff
+        client: HTTP client (default: the shared pooled client)
+        wrap_attempt: Runs each single try as wrap_attempt(send, send_again):
+            send() makes the request once its rate-limit wait is over;
+            send_again() waits for another token first (for a duplicate).
+            Time spent waiting or backing off is never inside the wrapper
+        stream: Return once the headers arrive, leaving the body unread
+            (the caller must close the response)
+        **kwargs: Passed to httpx (params, headers, timeout, ...)
+
+    Returns:
+        The last response; its status is not checked, so callers still
+        handle 4xx/5xx answers themselves
+
+    Raises:
+        httpx.TransportError: If every attempt failed to connect
+    """
+    if retries is None:
+        retries = _env_int("PAPER_SEARCH_HTTP_RETRIES", 3)
+    client = client or get_client()
+    limiter = get_rate_limiter()
+
+    async def send() -> httpx.Response:
+        if stream:
+            return await client.send(client.build_request(method, url, **kwargs), stream=True)
+        return await client.request(method, url, **kwargs)
+
+    async def send_again() -> httpx.Response:
+        await limiter.acquire(url)
+        return await send()
+
+    for attempt in range(retries + 1):
+        await limiter.acquire(url)
+        try:
+            response = await (wrap_attempt(send, send_again) if wrap_attempt else send())
+        except httpx.TransportError as e:
+            if attempt == retries:
+                raise
+            delay = backoff_delay(attempt, backoff)
+            logger.warning(f"{method} {url} failed ({e}); retry {attempt + 1}/{retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        if stream:
+            await response.aclose()
+        delay = retry_after(response)
+        delay = min(delay, MAX_RETRY_DELAY) if delay is not None else backoff_delay(attempt, backoff)
+        logger.warning(f"{method} {url} returned {response.status_code}; "
+                       f"retry {attempt + 1}/{retries} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+    return response
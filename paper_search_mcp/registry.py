@@ -0,0 +1,198 @@
+"""
+Searcher registry for paper-search-mcp.
+Maps source names to searcher classes that are imported and instantiated on
+first use, so starting the server or a CLI command doesn't pay for every
+platform's dependencies. Each source declares its capabilities (search,
+download, read, lookup, batch), which the MCP tools and CLI commands are
+derived from. Third-party searchers are discovered through the
+'paper_search_mcp.searchers' entry point group.
+"""
+import importlib
+import logging
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Any, Dict, FrozenSet, Iterator, Optional, Union
+
+from .cache import cached
+from .academic_platforms.base import SEARCH, DOWNLOAD, READ, LOOKUP, BATCH
+
+logger = logging.getLogger(__name__)
+
+# Entry point group for searcher plugins: name = "package.module:SearcherClass"
+ENTRY_POINT_GROUP = "paper_search_mcp.searchers"
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """Where a source's searcher lives and what it can do"""
+    target: str                                   # "module:Class" (module may be relative)
+    description: str = ""
+    capabilities: Optional[FrozenSet[str]] = None  # None: read from the class when needed
+
+
+# Built-in sources. Capabilities are declared here as well as on the classes
+# (tests keep them in sync) so tools and commands can be set up without
+# importing any platform module.
+BUILTIN_SOURCES = {
+    "arxiv": SourceSpec(".academic_platforms.arxiv:ArxivSearcher",
+                        "arXiv - Open access preprint repository",
+                        frozenset({SEARCH, DOWNLOAD, READ})),
+    "pubmed": SourceSpec(".academic_platforms.pubmed:PubMedSearcher",
+                         "PubMed - Biomedical literature database",
+                         frozenset({SEARCH})),
+    "biorxiv": SourceSpec(".academic_platforms.biorxiv:BioRxivSearcher",
+                          "bioRxiv - Preprint server for biology",
+                          frozenset({SEARCH, DOWNLOAD, READ})),
+    "medrxiv": SourceSpec(".academic_platforms.medrxiv:MedRxivSearcher",
+                          "medRxiv - Preprint server for health sciences",
+                          frozenset({SEARCH, DOWNLOAD, READ})),
+    "google_scholar": SourceSpec(".academic_platforms.google_scholar:GoogleScholarSearcher",
+                                 "Google Scholar - Academic search engine",
+                                 frozenset({SEARCH})),
+    "iacr": SourceSpec(".academic_platforms.iacr:IACRSearcher",
+                       "IACR ePrint - Cryptology preprint archive",
+                       frozenset({SEARCH, DOWNLOAD, READ, LOOKUP})),
+    "semantic": SourceSpec(".academic_platforms.semantic:SemanticSearcher",
+                           "Semantic Scholar - AI-powered research tool",
+                           frozenset({SEARCH, DOWNLOAD, READ, LOOKUP, BATCH})),
+    "crossref": SourceSpec(".academic_platforms.crossref:CrossRefSearcher",
+                           "CrossRef - Citation linking service",
+                           frozenset({SEARCH, LOOKUP, BATCH})),
+    "searxng": SourceSpec(".academic_platforms.searxng:SearXNGSearcher",
+                          "SearXNG - Privacy-focused metasearch engine",
+                          frozenset({SEARCH})),
+}
+
+
+def load_class(target: str) -> type:
+    """Import 'module:Class' (module may be relative to this package)."""
+    module_name, _, class_name = target.partition(":")
+    module = importlib.import_module(module_name, package=__package__)
+    return getattr(module, class_name)
+
+
+class SearcherRegistry(Mapping):
+    """
+    Read-only mapping of source name to searcher, built lazily.
+
+    Looking up a source imports its module and creates the searcher (wrapped
+    in the search cache unless it opts out) once; listing names, testing
+    membership or asking for a built-in source's capabilities imports
+    nothing. Entry points are only scanned when a name outside the built-in
+    sources is needed.
+    """
+
+    def __init__(self, specs: Dict[str, Union[SourceSpec, str]] = None, discover: bool = True):
+        """
+        Args:
+            specs: Source name to SourceSpec or 'module:Class' (default: the
+                built-in sources)
+            discover: Also register searchers from installed entry points
+        """
+        self._specs: Dict[str, SourceSpec] = {}
+        for name, spec in (BUILTIN_SOURCES if specs is None else specs).items():
+            self._specs[name] = spec if isinstance(spec, SourceSpec) else SourceSpec(spec)
+        self._discover = discover
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def _discover_plugins(self) -> None:
+        if not self._discover:
+            return
+        self._discover = False
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            if entry_point.name in self._specs:
+                logger.warning(f"Ignoring searcher plugin '{entry_point.name}': name already registered")
+                continue
+            self._specs[entry_point.name] = SourceSpec(entry_point.value)
+
+    def register(self, name: str, spec: Union[SourceSpec, str]) -> None:
+        """Add a source, given as a SourceSpec or 'module:Class'."""
+        with self._lock:
+            self._specs[name] = spec if isinstance(spec, SourceSpec) else SourceSpec(spec)
+            self._instances.pop(name, None)
+
+    def spec(self, name: str) -> SourceSpec:
+        """
+        The source's spec, with description and capabilities filled in
+        (imports the searcher class only if they weren't declared).
+
+        Raises:
+            KeyError: If the source is unknown
+        """
+        if name not in self:
+            raise KeyError(name)
+        spec = self._specs[name]
+        if spec.capabilities is None:
+            cls = load_class(spec.target)
+            spec = SourceSpec(spec.target, spec.description or getattr(cls, "description", "") or name,
+                              frozenset(getattr(cls, "capabilities", {SEARCH})))
+            self._specs[name] = spec
+        return spec
+
+    def capabilities(self, name: str) -> FrozenSet[str]:
+        return self.spec(name).capabilities
+
+    def supporting(self, capability: str) -> Dict[str, "LazySearcher"]:
+        """Lazy searchers of every source declaring capability, by name."""
+        return {name: self.lazy(name) for name in self if capability in self.capabilities(name)}
+
+    def __getitem__(self, name: str) -> Any:
+        with self._lock:
+            searcher = self._instances.get(name)
+            if searcher is not None:
+                return searcher
+            if name not in self:
+                raise KeyError(name)
+            instance = load_class(self._specs[name].target)()
+            searcher = cached(instance, name) if getattr(instance, "cacheable", True) else instance
+            self._instances[name] = searcher
+            return searcher
+
+    def __contains__(self, name: object) -> bool:
+        if name not in self._specs:
+            self._discover_plugins()
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover_plugins()
+        return iter(list(self._specs))
+
+    def __len__(self) -> int:
+        self._discover_plugins()
+        return len(self._specs)
+
+    def loaded(self) -> Dict[str, Any]:
+        """Searchers created so far."""
+        return dict(self._instances)
+
+    def lazy(self, name: str) -> "LazySearcher":
+        """A stand-in for the named searcher that creates it on first use."""
+        return LazySearcher(self, name)
+
+
+class LazySearcher:
+    """Proxy for a registry searcher; attribute access creates the searcher."""
+
+    def __init__(self, registry: SearcherRegistry, name: str):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._registry[self._name], attr)
+
+    def __repr__(self) -> str:
+        return f"<LazySearcher {self._name}>"
+
+
+_registry: Optional[SearcherRegistry] = None
+
+
+def get_registry() -> SearcherRegistry:
+    """Return the process-wide searcher registry."""
+    global _registry
+    if _registry is None:
+        _registry = SearcherRegistry()
+    return _registry
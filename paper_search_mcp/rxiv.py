@@ -0,0 +1,625 @@
+"""
+Local store of bioRxiv/medRxiv details records for paper-search-mcp.
+The details API only lists postings by date window, 100 records per cursor
+page. Records are kept in SQLite partitioned by posting day (and category),
+so a repeat or overlapping window only fetches the days not stored yet; the
+pages of a window are fetched concurrently once the first one reveals the
+total count. A category search with days missing answers from the first
+page and stores the rest of its window in the background.
+
+Titles and abstracts of stored records go into an FTS5 index, so a mirror
+of recent postings (synced daily) answers BM25-ranked keyword searches,
+which the API itself can't do.
+"""
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from .paper import Paper
+from .ratelimit import fetch
+
+logger = logging.getLogger(__name__)
+
+DETAILS_URL = "https://api.biorxiv.org/details"
+# Records per cursor page (fixed by the API)
+PAGE_SIZE = 100
+# Cursor pages fetched at once (overridable via env)
+DEFAULT_CONCURRENCY = 4
+# Days this recent may still receive postings; once stored they are only
+# trusted for RECENT_TTL seconds
+SETTLE_DAYS = 2
+RECENT_TTL = 15 * 60
+
+# Coverage entry meaning "every category of this day is stored"
+ALL_CATEGORIES = ''
+
+# Days of postings mirrored for keyword search (overridable via env)
+DEFAULT_MIRROR_DAYS = 90
+# Seconds before the mirror is brought up to date again
+SYNC_INTERVAL = 24 * 3600
+# BM25 column weights: a title match counts more than an abstract match
+TITLE_WEIGHT = 2.0
+ABSTRACT_WEIGHT = 1.0
+
+SEARCH_MODES = ('category', 'keyword')
+
+# Sends one API request: (method, url, **kwargs) -> response, like ratelimit.fetch
+Request = Callable[..., Awaitable[httpx.Response]]
+
+
+def _data_dir() -> str:
+    return os.getenv('DATA_DIR', './data')
+
+
+def default_concurrency() -> int:
+    """Cursor pages fetched at once (env PAPER_SEARCH_RXIV_CONCURRENCY)."""
+    try:
+        return max(1, int(os.getenv('PAPER_SEARCH_RXIV_CONCURRENCY', DEFAULT_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_CONCURRENCY
+
+
+def mirror_days() -> int:
+    """Days of postings mirrored for keyword search (env PAPER_SEARCH_RXIV_MIRROR_DAYS)."""
+    try:
+        return max(1, int(os.getenv('PAPER_SEARCH_RXIV_MIRROR_DAYS', DEFAULT_MIRROR_DAYS)))
+    except ValueError:
+        return DEFAULT_MIRROR_DAYS
+
+
+def match_expression(query: str) -> str:
+    """FTS5 query matching any word of query; BM25 ranks papers matching more words higher."""
+    return ' OR '.join(f'"{word}"' for word in re.findall(r'\w+', query.lower()))
+
+
+def category_key(name: str) -> str:
+    """API form of a category: 'Cell Biology' -> 'cell_biology'."""
+    return '_'.join(name.strip().lower().split())
+
+
+def item_to_paper(server: str, item: Dict) -> Paper:
+    """Paper for one details record of server ('biorxiv' or 'medrxiv')."""
+    posted = datetime.strptime(item['date'], '%Y-%m-%d')
+    version = item.get('version', '1')
+    return Paper(
+        paper_id=item['doi'],
+        title=item['title'],
+        authors=item['authors'].split('; '),
+        abstract=item['abstract'],
+        url=f"https://www.{server}.org/content/{item['doi']}v{version}",
+        pdf_url=f"https://www.{server}.org/content/{item['doi']}v{version}.full.pdf",
+        published_date=posted,
+        updated_date=posted,
+        source=server,
+        categories=[item['category']],
+        keywords=[],
+        doi=item['doi'],
+    )
+
+
+def _days(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+
+def day_runs(days: Iterable[date]) -> List[Tuple[date, date]]:
+    """Group days into contiguous (first, last) runs, so each run is one API window."""
+    runs: List[Tuple[date, date]] = []
+    for day in sorted(days):
+        if runs and day - runs[-1][1] == timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+class RxivStore:
+    """
+    Details records per server, with the (category, day) pairs fully stored.
+
+    A day stored for all categories also answers queries for any single
+    category of that day. Every stored record is also in the keyword index.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: SQLite file (default: $DATA_DIR/rxiv.sqlite3)
+        """
+        self.path = path or os.path.join(_data_dir(), 'rxiv.sqlite3')
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS records (
+                    server TEXT NOT NULL,
+                    doi TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    PRIMARY KEY (server, doi, version)
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS records_day ON records (server, day, category)")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS coverage (
+                    server TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    fetched REAL NOT NULL,
+                    PRIMARY KEY (server, category, day)
+                )
+            """)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS mirror (
+                    server TEXT PRIMARY KEY,
+                    days INTEGER NOT NULL,
+                    synced REAL NOT NULL
+                )
+            """)
+            indexed = self._db.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'records_fts'"
+            ).fetchone()
+            # Contentless: the index holds only terms and positions, the text stays in records
+            self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5("
+                "title, abstract, content='', tokenize='porter unicode61')"
+            )
+            if not indexed:
+                self._db.execute(
+                    "INSERT INTO records_fts (rowid, title, abstract) SELECT rowid, "
+                    "json_extract(value, '$.title'), json_extract(value, '$.abstract') FROM records"
+                )
+        return self._db
+
+    def missing_days(self, server: str, category: str, start: date, end: date) -> List[date]:
+        """
+        Days of [start, end] not stored for category (or for all categories).
+
+        A day fetched within SETTLE_DAYS of its posting date counts as
+        stored for RECENT_TTL seconds only, since postings may still appear.
+        """
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT day, MAX(fetched) FROM coverage WHERE server = ? AND category IN (?, ?) "
+                "AND day BETWEEN ? AND ? GROUP BY day",
+                (server, category, ALL_CATEGORIES, start.isoformat(), end.isoformat()),
+            ).fetchall()
+        now = time.time()
+        stored = {
+            day for day, fetched in rows
+            if date.fromisoformat(day) <= date.fromtimestamp(fetched) - timedelta(days=SETTLE_DAYS)
+            or now - fetched < RECENT_TTL
+        }
+        return [day for day in _days(start, end) if day.isoformat() not in stored]
+
+    def add(self, server: str, items: List[Dict], category: str = ALL_CATEGORIES,
+            complete: Iterable[date] = ()) -> None:
+        """
+        Store records and mark days as fully stored.
+
+        Args:
+            server: 'biorxiv' or 'medrxiv'
+            items: Details records as returned by the API
+            category: Category the records were fetched for (ALL_CATEGORIES: unfiltered)
+            complete: Days whose records for category are now all stored
+        """
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            try:
+                db.execute("BEGIN")
+                for item in items:
+                    if item.get('doi') and item.get('date'):
+                        self._put_record(db, server, item)
+                db.executemany(
+                    "INSERT OR REPLACE INTO coverage (server, category, day, fetched) VALUES (?, ?, ?, ?)",
+                    [(server, category, day.isoformat(), now) for day in complete],
+                )
+                db.execute("COMMIT")
+            except sqlite3.Error:
+                db.execute("ROLLBACK")
+                raise
+
+    def _put_record(self, db: sqlite3.Connection, server: str, item: Dict) -> None:
+        """Insert or update one record and its keyword index entry."""
+        key = (server, item['doi'], str(item.get('version', '1')))
+        value = json.dumps(item)
+        row = db.execute(
+            "SELECT rowid, value FROM records WHERE server = ? AND doi = ? AND version = ?", key
+        ).fetchone()
+        if row:
+            rowid, old = row[0], json.loads(row[1])
+            # A contentless index forgets a row only when given its indexed text
+            db.execute(
+                "INSERT INTO records_fts (records_fts, rowid, title, abstract) VALUES ('delete', ?, ?, ?)",
+                (rowid, old.get('title', ''), old.get('abstract', '')),
+            )
+            db.execute(
+                "UPDATE records SET day = ?, category = ?, value = ? WHERE rowid = ?",
+                (item['date'], category_key(item.get('category', '')), value, rowid),
+            )
+        else:
+            rowid = db.execute(
+                "INSERT INTO records (server, doi, version, day, category, value) VALUES (?, ?, ?, ?, ?, ?)",
+                key + (item['date'], category_key(item.get('category', '')), value),
+            ).lastrowid
+        db.execute(
+            "INSERT INTO records_fts (rowid, title, abstract) VALUES (?, ?, ?)",
+            (rowid, item.get('title', ''), item.get('abstract', '')),
+        )
+
+    def keyword_query(self, server: str, query: str, limit: int = 10) -> List[Tuple[Dict, float]]:
+        """
+        Stored records ranked by BM25 over title and abstract.
+
+        Only the latest stored version of each DOI is returned.
+
+        Returns:
+            (record, score) pairs, best first; higher scores are better matches
+        """
+        expression = match_expression(query)
+        if not expression:
+            return []
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT r.value, bm25(records_fts, ?, ?) AS rank FROM records_fts "
+                "JOIN records r ON r.rowid = records_fts.rowid "
+                "WHERE records_fts MATCH ? AND r.server = ? "
+                "AND CAST(r.version AS INTEGER) = (SELECT MAX(CAST(version AS INTEGER)) "
+                "FROM records WHERE server = r.server AND doi = r.doi) "
+                "ORDER BY rank LIMIT ?",
+                (TITLE_WEIGHT, ABSTRACT_WEIGHT, expression, server, limit),
+            ).fetchall()
+        # bm25() is lower for better matches; report it so higher is better
+        return [(json.loads(value), -rank) for value, rank in rows]
+
+    def mirror_synced(self, server: str) -> Optional[Tuple[int, float]]:
+        """(days mirrored, time of last sync) for server, or None if never synced."""
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT days, synced FROM mirror WHERE server = ?", (server,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def set_mirror_synced(self, server: str, days: int) -> None:
+        with self._lock:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO mirror (server, days, synced) VALUES (?, ?, ?)",
+                (server, days, time.time()),
+            )
+
+    def query(self, server: str, category: str, start: date, end: date,
+              limit: int = None) -> List[Dict]:
+        """Stored records posted in [start, end], optionally of one category, in posting order."""
+        sql = "SELECT value FROM records WHERE server = ? AND day BETWEEN ? AND ?"
+        params: list = [server, start.isoformat(), end.isoformat()]
+        if category:
+            sql += " AND category = ?"
+            params.append(category)
+        sql += " ORDER BY day, doi, version"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn().execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_stats(self) -> Dict:
+        """Record and stored-day counts per server."""
+        with self._lock:
+            records = self._conn().execute(
+                "SELECT server, COUNT(*) FROM records GROUP BY server"
+            ).fetchall()
+            days = self._conn().execute(
+                "SELECT server, COUNT(DISTINCT day) FROM coverage GROUP BY server"
+            ).fetchall()
+            mirrors = self._conn().execute("SELECT server, days, synced FROM mirror").fetchall()
+        return {
+            'records': dict(records),
+            'days': dict(days),
+            'mirrors': {server: {'days': n, 'synced': synced} for server, n, synced in mirrors},
+            'path': self.path,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+async def fetch_page(server: str, start: date, end: date, category: str = ALL_CATEGORIES,
+                     cursor: int = 0, timeout: float = 30, client: httpx.AsyncClient = None,
+                     request: Request = None) -> Dict:
+    """
+    One cursor page of the details records posted in [start, end].
+
+    Arguments are as for fetch_interval().
+
+    Returns:
+        The API response: 'collection' holds the records, 'messages' the total count
+
+    Raises:
+        httpx.HTTPError: If the page can't be fetched (including CircuitOpenError)
+    """
+    url = f"{DETAILS_URL}/{server}/{start.isoformat()}/{end.isoformat()}/{cursor}"
+    params = {'category': category} if category else None
+    response = await (request or fetch)('GET', url, params=params, timeout=timeout, client=client)
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_interval(server: str, start: date, end: date, category: str = ALL_CATEGORIES,
+                         concurrency: int = None, timeout: float = 30,
+                         client: httpx.AsyncClient = None, request: Request = None,
+                         first: Dict = None,
+                         on_page: Callable[[List[Dict]], Awaitable] = None) -> List[Dict]:
+    """
+    All details records posted in [start, end].
+
+    The first cursor page reports the total count; the remaining pages are
+    then fetched concurrently, at most `concurrency` at a time.
+
+    Args:
+        server: 'biorxiv' or 'medrxiv'
+        start: First posting day
+        end: Last posting day
+        category: API category (e.g., 'cell_biology'), or ALL_CATEGORIES
+        concurrency: Pages in flight at once (default: default_concurrency())
+        timeout: Request timeout in seconds
+        client: HTTP client (default: the shared pooled client)
+        request: Sends each page request (default: ratelimit.fetch); searchers
+            pass their PaperSource.request so pages count against their
+            metrics and circuit breaker
+        first: The first page (cursor 0), if already fetched
+        on_page: Awaited with the records of each page fetched here as it
+            arrives, so a failed page doesn't lose the pages before it
+
+    Raises:
+        httpx.HTTPError: If a page can't be fetched (including CircuitOpenError)
+    """
+    async def page(cursor: int) -> Dict:
+        response = await fetch_page(server, start, end, category, cursor, timeout, client, request)
+        if on_page is not None:
+            await on_page(response.get('collection', []))
+        return response
+
+    first = first if first is not None else await page(0)
+    items = list(first.get('collection', []))
+    messages = first.get('messages') or [{}]
+    try:
+        total = int(messages[0].get('total'))
+    except (TypeError, ValueError):
+        total = None
+
+    if total is None:
+        # No count reported: page sequentially until a short page
+        cursor = PAGE_SIZE
+        while len(items) == cursor:
+            items.extend((await page(cursor)).get('collection', []))
+            cursor += PAGE_SIZE
+        return items
+
+    semaphore = asyncio.Semaphore(concurrency or default_concurrency())
+
+    async def limited(cursor: int) -> List[Dict]:
+        async with semaphore:
+            return (await page(cursor)).get('collection', [])
+
+    # Let every page finish (and reach on_page) before reporting a failure
+    pages = await asyncio.gather(*(limited(cursor) for cursor in range(PAGE_SIZE, total, PAGE_SIZE)),
+                                 return_exceptions=True)
+    for collection in pages:
+        if isinstance(collection, BaseException):
+            raise collection
+        items.extend(collection)
+    return items
+
+
+async def sync_window(server: str, category: str, start: date, end: date,
+                      store: RxivStore = None, first_page: Dict = None, **kwargs) -> int:
+    """
+    Fetch the days of [start, end] missing from the store.
+
+    Days within SETTLE_DAYS of today are fetched again once RECENT_TTL
+    has passed (see RxivStore.missing_days()). Keyword arguments go to
+    fetch_interval().
+
+    Each page is stored as it arrives; a run of days is marked complete
+    once all its pages are stored, so a failed page keeps the others and
+    only its run is fetched again.
+
+    Args:
+        first_page: First page of the earliest missing run of days, if
+            already fetched and stored
+
+    Returns:
+        Number of records fetched
+    """
+    store = store or get_rxiv_store()
+
+    async def save(items: List[Dict]) -> None:
+        await asyncio.to_thread(store.add, server, items, category)
+
+    fetched = 0
+    missing = await asyncio.to_thread(store.missing_days, server, category, start, end)
+    for first, last in day_runs(missing):
+        items = await fetch_interval(server, first, last, category, first=first_page,
+                                     on_page=save, **kwargs)
+        first_page = None
+        await asyncio.to_thread(store.add, server, [], category, _days(first, last))
+        fetched += len(items)
+    return fetched
+
+
+async def search_window(server: str, query: str, days: int, max_results: int,
+                        store: RxivStore = None, **kwargs) -> List[Paper]:
+    """
+    Papers of a category posted in the last `days` days, from the local store.
+
+    If days are missing, only the first page of the earliest missing run is
+    awaited (it holds the earliest postings, which come first in the
+    results); the rest of the window is stored in the background. If the
+    fetch fails, what is stored is returned.
+
+    Args:
+        server: 'biorxiv' or 'medrxiv'
+        query: Category name (e.g., 'cell biology'); empty for all categories
+        days: Days to look back
+        max_results: Maximum number of papers to return
+        store: Record store (default: the shared one)
+        **kwargs: Passed to fetch_interval()
+    """
+    store = store or get_rxiv_store()
+    category = category_key(query)
+    end = date.today()
+    start = end - timedelta(days=days)
+    key = f"{server}/{category}"
+    runs = day_runs(await asyncio.to_thread(store.missing_days, server, category, start, end))
+    if runs and not _sync_running(key):
+        try:
+            first_page = await fetch_page(server, runs[0][0], runs[0][1], category, **_page_kwargs(kwargs))
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch {server} records for {start}..{end}: {e}")
+        else:
+            await asyncio.to_thread(store.add, server, first_page.get('collection', []), category)
+            _in_background(key, f"sync of {server} records for {start}..{end}", lambda: sync_window(
+                server, category, start, end, store, first_page=first_page, **kwargs))
+
+    papers = []
+    for item in await asyncio.to_thread(store.query, server, category, start, end, max_results):
+        try:
+            papers.append(item_to_paper(server, item))
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Error parsing {server} entry: {e}")
+    return papers
+
+
+async def sync_mirror(server: str, days: int = None, store: RxivStore = None, **kwargs) -> int:
+    """
+    Bring the keyword-search mirror of server up to date.
+
+    Fetches every category for the last `days` days (default:
+    mirror_days()); days already stored are skipped, so a daily run only
+    fetches the new postings. Keyword arguments go to fetch_interval().
+
+    Returns:
+        Number of records fetched
+    """
+    store = store or get_rxiv_store()
+    days = days or mirror_days()
+    end = date.today()
+    fetched = await sync_window(server, ALL_CATEGORIES, end - timedelta(days=days), end, store, **kwargs)
+    await asyncio.to_thread(store.set_mirror_synced, server, days)
+    logger.info(f"{server} mirror synced: {fetched} records fetched for the last {days} days")
+    return fetched
+
+
+def _page_kwargs(kwargs: Dict) -> Dict:
+    """fetch_interval() keyword arguments that fetch_page() accepts."""
+    return {name: value for name, value in kwargs.items() if name != 'concurrency'}
+
+
+_syncing: Dict[str, asyncio.Task] = {}
+
+
+def _sync_running(key: str) -> bool:
+    task = _syncing.get(key)
+    return task is not None and not task.done()
+
+
+def _in_background(key: str, what: str, sync: Callable[[], Awaitable]) -> None:
+    """Run sync() as a task unless one is already running for key; failures are logged."""
+    if _sync_running(key):
+        return
+
+    async def run():
+        try:
+            await sync()
+        except httpx.HTTPError as e:
+            logger.warning(f"Background {what} failed: {e}")
+
+    task = asyncio.ensure_future(run())
+    _syncing[key] = task
+    task.add_done_callback(lambda _: _syncing.pop(key, None))
+
+
+async def wait_for_syncs() -> None:
+    """Wait for the background syncs started so far (e.g. before a CLI command exits)."""
+    while _syncing:
+        await asyncio.gather(*list(_syncing.values()), return_exceptions=True)
+
+
+async def keyword_search(server: str, query: str, max_results: int,
+                         store: RxivStore = None, **kwargs) -> List[Paper]:
+    """
+    Papers whose title or abstract match query, ranked by BM25, from the local mirror.
+
+    The mirror (see sync_mirror()) is built and refreshed in the
+    background, never inside a search. Until it is first built, results
+    come from what is stored so far (pages are stored as they arrive)
+    plus a live first page of the newest postings, fetched when the build
+    starts. Later searches answer from the index at once and refresh a
+    mirror older than SYNC_INTERVAL.
+
+    Args:
+        server: 'biorxiv' or 'medrxiv'
+        query: Keywords (e.g., 'single cell sequencing')
+        max_results: Maximum number of papers to return
+        store: Record store (default: the shared one)
+        **kwargs: Passed to fetch_interval()
+    """
+    store = store or get_rxiv_store()
+    synced = await asyncio.to_thread(store.mirror_synced, server)
+    if synced is None and not _sync_running(server):
+        end = date.today()
+        try:
+            page = await fetch_page(server, end - timedelta(days=1), end, ALL_CATEGORIES,
+                                    **_page_kwargs(kwargs))
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch the newest {server} records: {e}")
+        else:
+            await asyncio.to_thread(store.add, server, page.get('collection', []))
+    if synced is None or time.time() - synced[1] > SYNC_INTERVAL:
+        _in_background(server, f"sync of the {server} mirror",
+                       lambda: sync_mirror(server, store=store, **kwargs))
+
+    papers = []
+    for item, score in await asyncio.to_thread(store.keyword_query, server, query, max_results):
+        try:
+            paper = item_to_paper(server, item)
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Error parsing {server} entry: {e}")
+            continue
+        paper.extra = {'score': round(score, 4)}
+        papers.append(paper)
+    return papers
+
+
+_rxiv_store: Optional[RxivStore] = None
+
+
+def get_rxiv_store() -> RxivStore:
+    """Return the process-wide bioRxiv/medRxiv record store."""
+    global _rxiv_store
+    if _rxiv_store is None:
+        _rxiv_store = RxivStore()
+    return _rxiv_store
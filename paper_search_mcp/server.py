@@ -1,42 +1,40 @@
 # paper_search_mcp/server.py
-from typing import List, Dict, Optional
+from typing import Container, List, Dict, Optional, Union
 from fastmcp import FastMCP
-from .academic_platforms.arxiv import ArxivSearcher
-from .academic_platforms.pubmed import PubMedSearcher
-from .academic_platforms.biorxiv import BioRxivSearcher
-from .academic_platforms.medrxiv import MedRxivSearcher
-from .academic_platforms.google_scholar import GoogleScholarSearcher
-from .academic_platforms.iacr import IACRSearcher
-from .academic_platforms.semantic import SemanticSearcher
-from .academic_platforms.crossref import CrossRefSearcher
-from .academic_platforms.searxng import SearXNGSearcher
-
 # from .academic_platforms.hub import SciHubSearcher
 from .paper import Paper
-from .knowledge import KnowledgeStore
-from .document_processor import DocumentProcessor, DOCLING_AVAILABLE
+from .transport import run as run_with_transport
+from .cache import get_search_cache
+from .registry import get_registry
+from .academic_platforms.base import SEARCH, DOWNLOAD, READ, BatchLookupError
+from .breaker import get_breakers
+from .federation import iter_search, select_searchers, DEFAULT_SOURCE_TIMEOUT
+from .dedup import merge_papers
+from .batch import download_batch as run_download_batch, parse_items, default_concurrency
+from .extraction import parse_page_ranges
+from .knowledge import get_knowledge_store
+from .document_processor import get_document_processor
 
 # Initialize MCP server
 mcp = FastMCP("paper_search_server")
 
-# Instances of searchers
-arxiv_searcher = ArxivSearcher()
-pubmed_searcher = PubMedSearcher()
-biorxiv_searcher = BioRxivSearcher()
-medrxiv_searcher = MedRxivSearcher()
-google_scholar_searcher = GoogleScholarSearcher()
-iacr_searcher = IACRSearcher()
-semantic_searcher = SemanticSearcher()
-crossref_searcher = CrossRefSearcher()
-searxng_searcher = SearXNGSearcher()
+# Searchers available to the federated search_all tool; each platform is
+# imported and instantiated (behind the persistent search cache) on first use
+searchers = get_registry()
+
+arxiv_searcher = searchers.lazy("arxiv")
+pubmed_searcher = searchers.lazy("pubmed")
+biorxiv_searcher = searchers.lazy("biorxiv")
+medrxiv_searcher = searchers.lazy("medrxiv")
+google_scholar_searcher = searchers.lazy("google_scholar")
+iacr_searcher = searchers.lazy("iacr")
+semantic_searcher = searchers.lazy("semantic")
+crossref_searcher = searchers.lazy("crossref")
+searxng_searcher = searchers.lazy("searxng")
 # scihub_searcher = SciHubSearcher()
 
-# Initialize knowledge store
-knowledge_store = KnowledgeStore()
-
-# Initialize document processor if available
-doc_processor = DocumentProcessor() if DOCLING_AVAILABLE else None
-
+# Searchers that can download PDFs (used by download_batch)
+downloaders = searchers.supporting(DOWNLOAD)
 
 
 # Asynchronous helper to adapt async searchers
@@ -79,31 +77,41 @@ async def search_pubmed(query: str, max_results: int = 10) -> List[Dict]:
 
 
 @mcp.tool()
-async def search_biorxiv(query: str, max_results: int = 10) -> List[Dict]:
+async def search_biorxiv(query: str, max_results: int = 10, mode: str = "category") -> List[Dict]:
     """Search academic papers from bioRxiv.
 
     Args:
-        query: Search query string (e.g., 'machine learning').
+        query: Category name (e.g., 'bioinformatics') in category mode, or
+            keywords (e.g., 'single cell sequencing') in keyword mode.
         max_results: Maximum number of papers to return (default: 10).
+        mode: 'category' lists the category's postings of the last 30 days;
+            'keyword' ranks titles and abstracts of a local mirror of recent
+            postings by BM25 (the mirror is built in the background, so the
+            first keyword searches see the newest postings and what is mirrored so far).
     Returns:
         List of paper metadata in dictionary format.
     """
-    papers = await async_search(biorxiv_searcher, query, max_results)
-    return papers if papers else []
+    papers = await biorxiv_searcher.search(query, max_results=max_results, mode=mode)
+    return [paper.to_dict() for paper in papers]
 
 
 @mcp.tool()
-async def search_medrxiv(query: str, max_results: int = 10) -> List[Dict]:
+async def search_medrxiv(query: str, max_results: int = 10, mode: str = "category") -> List[Dict]:
     """Search academic papers from medRxiv.
 
     Args:
-        query: Search query string (e.g., 'machine learning').
+        query: Category name (e.g., 'bioinformatics') in category mode, or
+            keywords (e.g., 'single cell sequencing') in keyword mode.
         max_results: Maximum number of papers to return (default: 10).
+        mode: 'category' lists the category's postings of the last 30 days;
+            'keyword' ranks titles and abstracts of a local mirror of recent
+            postings by BM25 (the mirror is built in the background, so the
+            first keyword searches see the newest postings and what is mirrored so far).
     Returns:
         List of paper metadata in dictionary format.
     """
-    papers = await async_search(medrxiv_searcher, query, max_results)
-    return papers if papers else []
+    papers = await medrxiv_searcher.search(query, max_results=max_results, mode=mode)
+    return [paper.to_dict() for paper in papers]
 
 
 @mcp.tool()
@@ -205,18 +213,39 @@ async def download_iacr(paper_id: str, save_path: str = "./downloads") -> str:
     return await iacr_searcher.download_pdf(paper_id, save_path)
 
 
+def _page_range_error(pages: Optional[str]) -> str:
+    """Error message for a malformed page selection ('' if it is valid)."""
+    if pages:
+        try:
+            parse_page_ranges(pages)
+        except ValueError as e:
+            return f"Error: {e}"
+    return ""
+
+
 @mcp.tool()
-async def read_arxiv_paper(paper_id: str, save_path: str = "./downloads") -> str:
+async def read_arxiv_paper(
+    paper_id: str,
+    save_path: str = "./downloads",
+    pages: Optional[str] = None,
+    max_chars: Optional[int] = None,
+) -> str:
     """Read and extract text content from an arXiv paper PDF.
 
     Args:
         paper_id: arXiv paper ID (e.g., '2106.12345').
         save_path: Directory where the PDF is/will be saved (default: './downloads').
+        pages: 1-based pages to read, e.g. '1-5,8,10-' (default: all pages).
+        max_chars: Stop after this many characters; only the pages needed are parsed
+            (default: no limit).
     Returns:
         str: The extracted text content of the paper.
     """
+    error = _page_range_error(pages)
+    if error:
+        return error
     try:
-        return await arxiv_searcher.read_paper(paper_id, save_path)
+        return await arxiv_searcher.read_paper(paper_id, save_path, pages, max_chars)
     except Exception as e:
         print(f"Error reading paper {paper_id}: {e}")
         return ""
@@ -236,51 +265,84 @@ async def read_pubmed_paper(paper_id: str, save_path: str = "./downloads") -> st
 
 
 @mcp.tool()
-async def read_biorxiv_paper(paper_id: str, save_path: str = "./downloads") -> str:
+async def read_biorxiv_paper(
+    paper_id: str,
+    save_path: str = "./downloads",
+    pages: Optional[str] = None,
+    max_chars: Optional[int] = None,
+) -> str:
     """Read and extract text content from a bioRxiv paper PDF.
 
     Args:
         paper_id: bioRxiv DOI.
         save_path: Directory where the PDF is/will be saved (default: './downloads').
+        pages: 1-based pages to read, e.g. '1-5,8,10-' (default: all pages).
+        max_chars: Stop after this many characters; only the pages needed are parsed
+            (default: no limit).
     Returns:
         str: The extracted text content of the paper.
     """
+    error = _page_range_error(pages)
+    if error:
+        return error
     try:
-        return biorxiv_searcher.read_paper(paper_id, save_path)
+        return await biorxiv_searcher.read_paper(paper_id, save_path, pages, max_chars)
     except Exception as e:
         print(f"Error reading paper {paper_id}: {e}")
         return ""
 
 
 @mcp.tool()
-async def read_medrxiv_paper(paper_id: str, save_path: str = "./downloads") -> str:
+async def read_medrxiv_paper(
+    paper_id: str,
+    save_path: str = "./downloads",
+    pages: Optional[str] = None,
+    max_chars: Optional[int] = None,
+) -> str:
     """Read and extract text content from a medRxiv paper PDF.
 
     Args:
         paper_id: medRxiv DOI.
         save_path: Directory where the PDF is/will be saved (default: './downloads').
+        pages: 1-based pages to read, e.g. '1-5,8,10-' (default: all pages).
+        max_chars: Stop after this many characters; only the pages needed are parsed
+            (default: no limit).
     Returns:
         str: The extracted text content of the paper.
     """
+    error = _page_range_error(pages)
+    if error:
+        return error
     try:
-        return medrxiv_searcher.read_paper(paper_id, save_path)
+        return await medrxiv_searcher.read_paper(paper_id, save_path, pages, max_chars)
     except Exception as e:
         print(f"Error reading paper {paper_id}: {e}")
         return ""
 
 
 @mcp.tool()
-async def read_iacr_paper(paper_id: str, save_path: str = "./downloads") -> str:
+async def read_iacr_paper(
+    paper_id: str,
+    save_path: str = "./downloads",
+    pages: Optional[str] = None,
+    max_chars: Optional[int] = None,
+) -> str:
     """Read and extract text content from an IACR ePrint paper PDF.
 
     Args:
         paper_id: IACR paper ID (e.g., '2009/101').
         save_path: Directory where the PDF is/will be saved (default: './downloads').
+        pages: 1-based pages to read, e.g. '1-5,8,10-' (default: all pages).
+        max_chars: Stop after this many characters; only the pages needed are parsed
+            (default: no limit).
     Returns:
         str: The extracted text content of the paper.
     """
+    error = _page_range_error(pages)
+    if error:
+        return error
     try:
-        return iacr_searcher.read_paper(paper_id, save_path)
+        return await iacr_searcher.read_paper(paper_id, save_path, pages, max_chars)
     except Exception as e:
         print(f"Error reading paper {paper_id}: {e}")
         return ""
@@ -326,7 +388,44 @@ async def download_semantic(paper_id: str, save_path: str = "./downloads") -> st
 
 
 @mcp.tool()
-async def read_semantic_paper(paper_id: str, save_path: str = "./downloads") -> str:
+async def get_semantic_papers_batch(paper_ids: List[str]) -> List[Dict]:
+    """Look up many Semantic Scholar papers at once (e.g., to enrich a bibliography).
+
+    Uses the batch endpoint: up to 500 IDs per request, larger lists are
+    split and fetched concurrently.
+
+    Args:
+        paper_ids: Paper identifiers, mixing any of the formats accepted by
+            download_semantic (Semantic Scholar ID, DOI:, ARXIV:, PMID:, PMCID:,
+            MAG:, ACL:, URL:).
+    Returns:
+        One entry per requested ID, in order: the paper metadata plus
+        'requested_id', {'requested_id': ..., 'error': 'Not found'} for unknown
+        IDs, or {'requested_id': ..., 'error': 'Request failed: ...'} for IDs
+        whose batch request failed (worth retrying).
+    """
+    try:
+        papers, failed = await semantic_searcher.get_papers_batch(paper_ids), {}
+    except BatchLookupError as e:
+        papers, failed = e.papers, e.failed
+    results = []
+    for paper_id, paper in zip(paper_ids, papers):
+        if paper:
+            results.append(dict(paper.to_dict(), requested_id=paper_id))
+        elif paper_id in failed:
+            results.append({"requested_id": paper_id, "error": f"Request failed: {failed[paper_id]}"})
+        else:
+            results.append({"requested_id": paper_id, "error": "Not found"})
+    return results
+
+
+@mcp.tool()
+async def read_semantic_paper(
+    paper_id: str,
+    save_path: str = "./downloads",
+    pages: Optional[str] = None,
+    max_chars: Optional[int] = None,
+) -> str:
     """Read and extract text content from a Semantic Scholar paper. 
 
     Args:
@@ -340,20 +439,27 @@ async def read_semantic_paper(paper_id: str, save_path: str = "./downloads") ->
             - PMCID:<id> (e.g., "PMCID:2323736")
             - URL:<url> (e.g., "URL:https://arxiv.org/abs/2106.15928v1")
         save_path: Directory where the PDF is/will be saved (default: './downloads').
+        pages: 1-based pages to read, e.g. '1-5,8,10-' (default: all pages).
+        max_chars: Stop after this many characters; only the pages needed are parsed
+            (default: no limit).
     Returns:
         str: The extracted text content of the paper.
     """
+    error = _page_range_error(pages)
+    if error:
+        return error
     try:
-        return await semantic_searcher.read_paper(paper_id, save_path)
+        return await semantic_searcher.read_paper(paper_id, save_path, pages, max_chars)
     except Exception as e:
         print(f"Error reading paper {paper_id}: {e}")
         return ""
 
 
 @mcp.tool()
-async def search_crossref(query: str, max_results: int = 10, **kwargs) -> List[Dict]:
+async def search_crossref(query: str, max_results: int = 10, filter: str = "",
+                          sort: str = "", order: str = "", select: str = "") -> List[Dict]:
     """Search academic papers from CrossRef database.
-    
+
     CrossRef is a scholarly infrastructure organization that provides 
     persistent identifiers (DOIs) for scholarly content and metadata.
     It's one of the largest citation databases covering millions of 
@@ -361,26 +467,30 @@ async def search_crossref(query: str, max_results: int = 10, **kwargs) -> List[D
 
     Args:
         query: Search query string (e.g., 'machine learning', 'climate change').
-        max_results: Maximum number of papers to return (default: 10, max: 1000).
-        **kwargs: Additional search parameters:
-            - filter: CrossRef filter string (e.g., 'has-full-text:true,from-pub-date:2020')
-            - sort: Sort field ('relevance', 'published', 'updated', 'deposited', etc.)
-            - order: Sort order ('asc' or 'desc')
+        max_results: Maximum number of papers to return (default: 10); more than
+            1000 are fetched page by page with CrossRef cursors.
+        filter: CrossRef filter string (e.g., 'has-full-text:true,from-pub-date:2020').
+        sort: Sort field ('relevance', 'published', 'updated', 'deposited', etc.).
+        order: Sort order ('asc' or 'desc').
+        select: Comma-separated CrossRef fields to fetch (e.g., 'DOI,title,issued');
+            other paper fields are left empty, but responses are much smaller.
     Returns:
         List of paper metadata in dictionary format.
-        
+
     Examples:
         # Basic search
         search_crossref("deep learning", 20)
-        
+
         # Search with filters
         search_crossref("climate change", 10, filter="from-pub-date:2020,has-full-text:true")
-        
+
         # Search sorted by publication date
         search_crossref("neural networks", 15, sort="published", order="desc")
     """
-    papers = await async_search(crossref_searcher, query, max_results, **kwargs)
-    return papers if papers else []
+    papers = await crossref_searcher.search(query, max_results=max_results, filter=filter or None,
+                                            sort=sort or None, order=order or None,
+                                            select=select or None)
+    return [paper.to_dict() for paper in papers]
 
 
 @mcp.tool()
@@ -391,13 +501,32 @@ async def get_crossref_paper_by_doi(doi: str) -> Dict:
         doi: Digital Object Identifier (e.g., '10.1038/nature12373').
     Returns:
         Paper metadata in dictionary format, or empty dict if not found.
-        
+
     Example:
         get_crossref_paper_by_doi("10.1038/nature12373")
     """
-    async with httpx.AsyncClient() as client:
-        paper = crossref_searcher.get_paper_by_doi(doi)
-        return paper.to_dict() if paper else {}
+    paper = await crossref_searcher.get_paper_by_doi(doi)
+    return paper.to_dict() if paper else {}
+
+
+@mcp.tool()
+async def resolve_dois(dois: List[str]) -> List[Dict]:
+    """Resolve many DOIs to CrossRef metadata at once (e.g., a reference list).
+
+    DOIs are normalized and deduplicated; known ones are served from the
+    cache and the rest are looked up concurrently, up to 50 per request.
+
+    Args:
+        dois: DOIs, bare or as 'doi:...' / 'https://doi.org/...'.
+    Returns:
+        One entry per requested DOI, in order: the paper metadata plus
+        'requested_doi', or {'requested_doi': ..., 'error': 'Not found'}.
+    """
+    papers = await crossref_searcher.resolve_dois(dois)
+    return [
+        dict(paper.to_dict(), requested_doi=doi) if paper else {"requested_doi": doi, "error": "Not found"}
+        for doi, paper in zip(dois, papers)
+    ]
 
 
 @mcp.tool()
@@ -409,7 +538,7 @@ async def download_crossref(paper_id: str, save_path: str = "./downloads") -> st
         save_path: Directory to save the PDF (default: './downloads').
     Returns:
         str: Message indicating that direct PDF download is not supported.
-        
+
     Note:
         CrossRef is a citation database and doesn't provide direct PDF downloads.
         Use the DOI to access the paper through the publisher's website.
@@ -429,7 +558,7 @@ async def read_crossref_paper(paper_id: str, save_path: str = "./downloads") ->
         save_path: Directory where the PDF is/will be saved (default: './downloads').
     Returns:
         str: Message indicating that direct paper reading is not supported.
-        
+
     Note:
         CrossRef is a citation database and doesn't provide direct paper content.
         Use the DOI to access the paper through the publisher's website.
@@ -453,6 +582,192 @@ async def search_searxng(query: str, max_results: int = 10, category: str = "sci
     return [paper.to_dict() for paper in papers] if papers else []
 
 
+# Per-source tools, generated from each source's declared capabilities
+def register_source_tools(name: str, overrides: Container[str] = ()) -> None:
+    """Add search_<name> / download_<name> / read_<name>_paper tools for a source.
+
+    Tools whose names are in overrides are skipped: the built-in sources
+    define those above by hand to expose source-specific parameters.
+    """
+    spec = searchers.spec(name)
+    searcher = searchers.lazy(name)
+
+    if SEARCH in spec.capabilities and f"search_{name}" not in overrides:
+        async def search(query: str, max_results: int = 10) -> List[Dict]:
+            papers = await searcher.search(query, max_results=max_results)
+            return [paper.to_dict() for paper in papers]
+        mcp.tool(search, name=f"search_{name}", description=(
+            f"Search academic papers from {spec.description}.\n\n"
+            "Args:\n    query: Search query string.\n"
+            "    max_results: Maximum number of papers to return (default: 10)."))
+
+    if DOWNLOAD in spec.capabilities and f"download_{name}" not in overrides:
+        async def download(paper_id: str, save_path: str = "./downloads") -> str:
+            return await searcher.download_pdf(paper_id, save_path)
+        mcp.tool(download, name=f"download_{name}", description=(
+            f"Download the PDF of a paper from {spec.description}.\n\n"
+            "Args:\n    paper_id: Paper ID on this source.\n"
+            "    save_path: Directory to save the PDF (default: './downloads')."))
+
+    if READ in spec.capabilities and f"read_{name}_paper" not in overrides:
+        async def read(paper_id: str, save_path: str = "./downloads",
+                       pages: Optional[str] = None, max_chars: Optional[int] = None) -> str:
+            error = _page_range_error(pages)
+            if error:
+                return error
+            return await searcher.read_paper(paper_id, save_path, pages, max_chars)
+        mcp.tool(read, name=f"read_{name}_paper", description=(
+            f"Read and extract the text of a paper from {spec.description}.\n\n"
+            "Args:\n    paper_id: Paper ID on this source.\n"
+            "    save_path: Directory where the PDF is/will be saved (default: './downloads').\n"
+            "    pages: 1-based pages to read, e.g. '1-5,8,10-' (default: all pages).\n"
+            "    max_chars: Stop after this many characters (default: no limit)."))
+
+
+# Per-source tools defined by hand above; register_source_tools skips these
+HAND_WRITTEN_TOOLS = frozenset({
+    "search_arxiv", "download_arxiv", "read_arxiv_paper",
+    "search_pubmed", "download_pubmed", "read_pubmed_paper",
+    "search_biorxiv", "download_biorxiv", "read_biorxiv_paper",
+    "search_medrxiv", "download_medrxiv", "read_medrxiv_paper",
+    "search_google_scholar",
+    "search_iacr", "download_iacr", "read_iacr_paper",
+    "search_semantic", "download_semantic", "read_semantic_paper",
+    "search_crossref", "download_crossref", "read_crossref_paper",
+    "search_searxng",
+})
+
+for _name in searchers:
+    register_source_tools(_name, overrides=HAND_WRITTEN_TOOLS)
+
+
+@mcp.tool()
+async def get_source_metrics() -> Dict:
+    """Get request counts, failures and latency per platform since the server started.
+
+    Returns:
+        Dictionary mapping each platform used so far to its requests, failures,
+        seconds, mean_seconds per request, coalesced (requests answered by an
+        identical one already in flight) and latency (p50/p95/p99 response time
+        of GET requests in seconds, samples, hedges sent and hedge_wins).
+    """
+    return {name: dict(searcher.metrics.to_dict(), latency=searcher.latency.to_dict())
+            for name, searcher in searchers.loaded().items() if hasattr(searcher, "metrics")}
+
+
+@mcp.tool()
+async def get_source_health() -> Dict:
+    """Get the circuit breaker state of every platform.
+
+    A platform whose recent requests mostly failed (errors, throttling, CAPTCHA
+    pages) or were very slow is 'open': its requests fail immediately and
+    search_all skips it until a probe request succeeds after a cooldown.
+
+    Returns:
+        Dictionary mapping each platform to its state ('closed', 'open', 'half_open'),
+        recent_calls, recent_failures, error_rate, retry_in seconds, times_opened
+        and last_error.
+    """
+    breakers = get_breakers()
+    return {name: breakers.get(name).to_dict() for name in searchers}
+
+
+# Federated search across platforms
+@mcp.tool()
+async def search_all(
+    query: str,
+    max_results: int = 10,
+    sources: Optional[List[str]] = None,
+    timeout: float = DEFAULT_SOURCE_TIMEOUT,
+    dedupe: bool = True,
+) -> Dict:
+    """Search several platforms concurrently and merge their results.
+
+    Args:
+        query: Search query string (e.g., 'machine learning').
+        max_results: Maximum number of papers to return per source (default: 10).
+        sources: Platforms to query (default: all). Options: arxiv, pubmed, biorxiv,
+            medrxiv, google_scholar, iacr, semantic, crossref, searxng.
+        timeout: Seconds each source may take before it is skipped (default: 20).
+        dedupe: Fold the same paper found on several platforms into one record whose
+            extra['source_ids'] lists each source's IDs (default: True).
+    Returns:
+        Dictionary with 'papers' (in the order the sources answered) and 'sources'
+        (status 'ok'/'timeout'/'error'/'skipped', result count, elapsed seconds and
+        error message per source; failing sources are 'skipped' without waiting).
+    """
+    try:
+        selected = select_searchers(searchers, sources)
+    except ValueError as e:
+        return {"papers": [], "sources": {}, "error": str(e)}
+
+    papers = []
+    statuses = {}
+    async for result in iter_search(selected, query, max_results, timeout):
+        papers.extend(result.papers)
+        statuses[result.source] = result.to_dict()
+    if dedupe:
+        papers = merge_papers(papers)
+    return {"papers": [paper.to_dict() for paper in papers], "sources": statuses}
+
+
+# Bulk downloads
+@mcp.tool()
+async def download_batch(
+    papers: List[Union[str, List[str]]],
+    save_path: str = "./downloads",
+    max_concurrency: Optional[int] = None,
+) -> Dict:
+    """Download many paper PDFs concurrently.
+
+    Args:
+        papers: Papers as 'source:id' strings (e.g., 'arxiv:2106.12345',
+            'semantic:DOI:10.18653/v1/N18-3011') or [source, id] pairs.
+            Sources: arxiv, biorxiv, medrxiv, iacr, semantic.
+        save_path: Directory to save the PDFs (default: './downloads').
+        max_concurrency: Downloads in flight at once (default: 8); each host is
+            additionally limited to a few concurrent transfers.
+    Returns:
+        Dictionary with 'results' (source, paper_id, status 'ok'/'error', path, error,
+        elapsed seconds per paper, in input order) and 'ok'/'failed' counts.
+    """
+    specs = [item if isinstance(item, str) else " ".join(item) for item in papers]
+    try:
+        items = parse_items(specs, downloaders)
+    except ValueError as e:
+        return {"results": [], "ok": 0, "failed": 0, "error": str(e)}
+
+    results = await run_download_batch(downloaders, items, save_path,
+                                       max_concurrency or default_concurrency())
+    ok = sum(1 for item in results if item.status == "ok")
+    return {"results": [item.to_dict() for item in results], "ok": ok, "failed": len(results) - ok}
+
+
+# Search cache tools
+@mcp.tool()
+async def get_search_cache_stats() -> Dict:
+    """Get hit/miss statistics of the search result cache.
+
+    Returns:
+        Dictionary with hits, stale_hits (served while refreshing), misses, hit_rate,
+        refreshes, evictions, total entries and entries per source.
+    """
+    return get_search_cache().get_stats()
+
+
+@mcp.tool()
+async def clear_search_cache(source: Optional[str] = None) -> str:
+    """Drop cached search results so the next search goes upstream.
+
+    Args:
+        source: Only clear this platform (e.g., 'arxiv'); clears everything if omitted.
+    Returns:
+        Number of removed entries.
+    """
+    removed = get_search_cache().clear(source)
+    return f"Removed {removed} cached search results"
+
+
 # Knowledge management tools
 @mcp.tool()
 async def store_paper_knowledge(paper_data: Dict) -> str:
@@ -463,7 +778,22 @@ async def store_paper_knowledge(paper_data: Dict) -> str:
     Returns:
         Record ID of the stored paper in SurrealDB.
     """
-    return await knowledge_store.store_paper(paper_data)
+    return await get_knowledge_store().store_paper(paper_data)
+
+
+@mcp.tool()
+async def store_papers_knowledge_bulk(papers: List[Dict], batch_size: int = 500) -> Dict:
+    """Store many papers in the knowledge graph, batch_size per transaction.
+
+    Papers already stored under the same paper_id are updated, not duplicated.
+
+    Args:
+        papers: Paper dictionaries, e.g. results of the search tools.
+        batch_size: Papers per insert statement (default: 500).
+    Returns:
+        Counts of stored, skipped (no paper_id) and failed papers, batches sent, and errors.
+    """
+    return await get_knowledge_store().store_papers_bulk(papers, batch_size)
 
 
 @mcp.tool()
@@ -475,20 +805,21 @@ async def get_paper_knowledge(paper_id: str) -> Optional[Dict]:
     Returns:
         Paper data dictionary or None if not found.
     """
-    return await knowledge_store.get_paper(paper_id)
+    return await get_knowledge_store().get_paper(paper_id)
 
 
 @mcp.tool()
-async def search_knowledge(query: str, limit: int = 10) -> List[Dict]:
-    """Search papers in the knowledge graph by keywords.
+async def search_knowledge(query: str, limit: int = 10, offset: int = 0) -> List[Dict]:
+    """Search papers in the knowledge graph by keywords, ranked by BM25 relevance.
 
     Args:
-        query: Search query string.
+        query: Search query string (matched against titles and abstracts).
         limit: Maximum number of results to return (default: 10).
+        offset: Number of ranked results to skip, for fetching further pages (default: 0).
     Returns:
-        List of matching papers from the knowledge graph.
+        List of matching papers from the knowledge graph, best first, each with a 'score'.
     """
-    return await knowledge_store.search_papers(query, limit)
+    return await get_knowledge_store().search_papers(query, limit, offset)
 
 
 @mcp.tool()
@@ -502,7 +833,7 @@ async def add_concept_knowledge(name: str, description: str, category: str = "ge
     Returns:
         Record ID of the concept.
     """
-    return await knowledge_store.add_concept(name, description, category)
+    return await get_knowledge_store().add_concept(name, description, category)
 
 
 @mcp.tool()
@@ -516,7 +847,7 @@ async def relate_paper_concept(paper_id: str, concept_name: str, strength: float
     Returns:
         Relationship record ID.
     """
-    return await knowledge_store.relate_paper_to_concept(paper_id, concept_name, strength)
+    return await get_knowledge_store().relate_paper_to_concept(paper_id, concept_name, strength)
 
 
 @mcp.tool()
@@ -529,7 +860,7 @@ async def get_similar_papers_knowledge(paper_id: str, limit: int = 5) -> List[Di
     Returns:
         List of similar papers with shared concept counts.
     """
-    return await knowledge_store.get_similar_papers(paper_id, limit)
+    return await get_knowledge_store().get_similar_papers(paper_id, limit)
 
 
 @mcp.tool()
@@ -539,7 +870,7 @@ async def get_knowledge_stats() -> Dict:
     Returns:
         Dictionary with counts of papers, concepts, and relationships.
     """
-    return await knowledge_store.get_knowledge_stats()
+    return await get_knowledge_store().get_knowledge_stats()
 
 
 # Document processing tools
@@ -551,13 +882,14 @@ async def process_pdf_advanced(pdf_path: str) -> Dict:
         pdf_path: Path to PDF file.
     Returns:
         Dictionary with extracted text, metadata, and structure (sections, tables, figures, references).
-        
+
     Note:
         Requires Docling to be installed. Falls back to basic PDF extraction if unavailable.
     """
+    doc_processor = get_document_processor()
     if not doc_processor:
         return {"error": "Docling not available. Install with: pip install docling"}
-    
+
     return await doc_processor.process_pdf(pdf_path)
 
 
@@ -571,11 +903,13 @@ async def process_document_url(url: str, output_dir: str = "./downloads") -> Dic
     Returns:
         Processed document data with text and metadata.
     """
+    doc_processor = get_document_processor()
     if not doc_processor:
         return {"error": "Docling not available. Install with: pip install docling"}
-    
+
     return await doc_processor.process_url(url, output_dir)
 
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    # Serve over stdio and close the pooled HTTP connections on shutdown
+    run_with_transport(mcp.run_stdio_async())
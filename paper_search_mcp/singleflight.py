@@ -0,0 +1,126 @@
+"""
+Request coalescing (single-flight) for paper-search-mcp.
+Concurrent identical calls - the same search, paper lookup or PDF - share
+one in-flight task instead of each going upstream, so bursts of identical
+requests from several agents cost one upstream call and one rate-limit
+token.
+"""
+import os
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional
+
+import httpx
+
+# Request arguments that carry a body; such requests are never coalesced
+BODY_ARGUMENTS = ('content', 'data', 'files', 'json')
+IDEMPOTENT_METHODS = ('GET', 'HEAD')
+
+
+def coalescing_enabled() -> bool:
+    """Coalescing is on unless PAPER_SEARCH_COALESCE is set to off/false/0."""
+    return os.getenv('PAPER_SEARCH_COALESCE', 'on').strip().lower() not in ('0', 'off', 'false', 'no')
+
+
+def request_key(method: str, url: str, params: Mapping = None, headers: Mapping = None) -> Optional[tuple]:
+    """
+    Key identifying a request for coalescing, or None if it must not be shared.
+
+    The URL is normalized (lower-case scheme and host, query parameters from
+    the URL and params merged and sorted); headers are part of the key, so
+    requests sent with different API keys are never merged.
+    """
+    method = method.upper()
+    if method not in IDEMPOTENT_METHODS:
+        return None
+    parsed = httpx.URL(url)
+    if params:
+        parsed = parsed.copy_merge_params(params)
+    query = tuple(sorted(parsed.params.multi_items()))
+    normalized = parsed.copy_with(scheme=parsed.scheme.lower(), host=parsed.host.lower(), query=None)
+    header_items = tuple(sorted((k.lower(), str(v)) for k, v in (headers or {}).items()))
+    return method, str(normalized), query, header_items
+
+
+class _Call:
+    """One in-flight call and the number of callers waiting for it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; callers arriving while it is
+    in flight await the same result (or exception).
+
+    The call runs in its own task, so a caller that is cancelled doesn't
+    cancel it for the others; it is only cancelled when every caller has
+    given up. Keys are tracked per event loop.
+    """
+
+    def __init__(self):
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, _Call]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.calls = 0          # Calls that went upstream
+        self.shared = 0         # Calls answered by another caller's in-flight call
+
+    def in_flight(self) -> int:
+        """Calls currently running on this event loop."""
+        return len(self._calls.get(asyncio.get_running_loop(), {}))
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether a call for key is running on this event loop (do() would join it)."""
+        return key in self._calls.get(asyncio.get_running_loop(), {})
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn(), or the call already running for key.
+
+        Args:
+            key: Identifies the call; None disables coalescing for this call
+            fn: Starts the call; invoked only if none is running for key
+
+        Returns:
+            fn()'s result, shared by every concurrent caller with the same key
+        """
+        if key is None or not coalescing_enabled():
+            return await fn()
+        calls = self._calls.setdefault(asyncio.get_running_loop(), {})
+        call = calls.get(key)
+        if call is None:
+            call = calls[key] = _Call(asyncio.ensure_future(fn()))
+
+            def forget(_task, call=call):
+                if calls.get(key) is call:
+                    del calls[key]
+
+            call.task.add_done_callback(forget)
+            self.calls += 1
+        else:
+            self.shared += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def get_stats(self) -> Dict:
+        return {'calls': self.calls, 'shared': self.shared}
+
+
+_singleflight: Optional[SingleFlight] = None
+
+
+def get_singleflight() -> SingleFlight:
+    """Return the process-wide single-flight group."""
+    global _singleflight
+    if _singleflight is None:
+        _singleflight = SingleFlight()
+    return _singleflight
@@ -0,0 +1,177 @@
+"""
+Extracted text cache for paper-search-mcp.
+Keeps the page texts of parsed PDFs, gzip-compressed in SQLite and keyed by
+the PDF's sha256 plus the extractor version, so reading a paper again is a
+disk lookup instead of a parse. Total size is capped with LRU eviction.
+"""
+import os
+import gzip
+import json
+import time
+import logging
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .pdf_store import sha256_file
+
+logger = logging.getLogger(__name__)
+
+# Cached text kept before least recently read documents are evicted
+DEFAULT_MAX_MB = 500
+
+
+def _data_dir() -> str:
+    return os.getenv('DATA_DIR', './data')
+
+
+class TextCache:
+    """
+    Page texts per (PDF sha256, extractor version).
+
+    Entries may be partial: pages that were never requested are stored as
+    None and filled in by later extractions.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = None):
+        """
+        Args:
+            path: SQLite file (default: $DATA_DIR/text_cache.sqlite3)
+            max_bytes: Compressed bytes kept before LRU eviction
+                (default: env PAPER_SEARCH_TEXT_CACHE_MAX_MB or 500 MB)
+        """
+        self.path = path or os.path.join(_data_dir(), 'text_cache.sqlite3')
+        self.max_bytes = max_bytes or int(os.getenv('PAPER_SEARCH_TEXT_CACHE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        # (path, size, mtime) -> sha256, so unchanged files aren't rehashed
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS text_cache (
+                    sha256 TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed REAL NOT NULL,
+                    value BLOB NOT NULL,
+                    PRIMARY KEY (sha256, version)
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS text_cache_accessed ON text_cache (accessed)")
+        return self._db
+
+    def file_hash(self, pdf_path: str) -> str:
+        """sha256 of a PDF, memoized on path, size and modification time."""
+        stat = os.stat(pdf_path)
+        key = (os.path.abspath(pdf_path), stat.st_size, stat.st_mtime_ns)
+        sha256 = self._hashes.get(key)
+        if sha256 is None:
+            sha256 = sha256_file(pdf_path)
+            self._hashes[key] = sha256
+        return sha256
+
+    def get(self, sha256: str, version: str) -> Optional[Tuple[int, List[Optional[str]]]]:
+        """
+        Returns:
+            (page_count, pages) with None for pages not extracted yet, or None on a miss
+        """
+        with self._lock:
+            try:
+                row = self._conn().execute(
+                    "SELECT value FROM text_cache WHERE sha256 = ? AND version = ?", (sha256, version)
+                ).fetchone()
+                if row is None:
+                    self.stats['misses'] += 1
+                    return None
+                self._conn().execute(
+                    "UPDATE text_cache SET accessed = ? WHERE sha256 = ? AND version = ?",
+                    (time.time(), sha256, version),
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Text cache read failed: {e}")
+                return None
+        data = json.loads(gzip.decompress(row[0]))
+        self.stats['hits'] += 1
+        return data['page_count'], data['pages']
+
+    def put(self, sha256: str, version: str, page_count: int, pages: Dict[int, str]) -> None:
+        """Store extracted pages (0-based number -> text), merging with what is cached."""
+        # Read, merge and write in one locked transaction: concurrent puts of
+        # different page ranges (from this or another process) must not drop
+        # each other's pages
+        with self._lock:
+            try:
+                db = self._conn()
+                db.execute("BEGIN IMMEDIATE")
+                try:
+                    row = db.execute(
+                        "SELECT value FROM text_cache WHERE sha256 = ? AND version = ?", (sha256, version)
+                    ).fetchone()
+                    cached = json.loads(gzip.decompress(row[0])) if row else None
+                    if cached and cached['page_count'] == page_count:
+                        merged: List[Optional[str]] = cached['pages']
+                    else:
+                        merged = [None] * page_count
+                    for number, text in pages.items():
+                        merged[number] = text
+                    value = gzip.compress(json.dumps({'page_count': page_count, 'pages': merged}).encode('utf-8'))
+                    db.execute(
+                        "INSERT OR REPLACE INTO text_cache (sha256, version, size, accessed, value) VALUES (?, ?, ?, ?, ?)",
+                        (sha256, version, len(value), time.time(), value),
+                    )
+                    self._evict(db)
+                    db.execute("COMMIT")
+                except BaseException:
+                    db.execute("ROLLBACK")
+                    raise
+            except sqlite3.Error as e:
+                logger.warning(f"Text cache write failed: {e}")
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM text_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for sha256, version, size in db.execute(
+            "SELECT sha256, version, size FROM text_cache ORDER BY accessed ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM text_cache WHERE sha256 = ? AND version = ?", (sha256, version))
+            total -= size
+            self.stats['evictions'] += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            return self._conn().execute("DELETE FROM text_cache").rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_text_cache: Optional[TextCache] = None
+
+
+def text_cache_enabled() -> bool:
+    """The text cache is on unless PAPER_SEARCH_TEXT_CACHE is set to off/false/0."""
+    return os.getenv('PAPER_SEARCH_TEXT_CACHE', 'on').strip().lower() not in ('0', 'off', 'false', 'no')
+
+
+def get_text_cache() -> Optional[TextCache]:
+    """Return the process-wide text cache, or None when disabled."""
+    global _text_cache
+    if not text_cache_enabled():
+        return None
+    if _text_cache is None:
+        _text_cache = TextCache()
+    return _text_cache
@@ -0,0 +1,154 @@
+"""
+Shared HTTP transport for paper-search-mcp.
+Provides a process-wide pooled httpx client so searchers reuse keep-alive
+connections (and HTTP/2 where available) instead of opening a new client per call.
+"""
+import os
+import asyncio
+import logging
+import weakref
+from typing import Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401 - only needed to enable HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment."""
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean setting from the environment."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class TransportConfig:
+    """
+    Connection pool settings for the shared client.
+
+    Every value can be overridden with an environment variable:
+        PAPER_SEARCH_HTTP_MAX_CONNECTIONS (default: 100)
+        PAPER_SEARCH_HTTP_MAX_KEEPALIVE (default: 20)
+        PAPER_SEARCH_HTTP_KEEPALIVE_EXPIRY seconds (default: 30)
+        PAPER_SEARCH_HTTP_TIMEOUT seconds (default: 30)
+        PAPER_SEARCH_HTTP2 (default: on when the h2 package is installed)
+    """
+
+    def __init__(self, max_connections: int = None, max_keepalive_connections: int = None,
+                 keepalive_expiry: float = None, timeout: float = None, http2: bool = None):
+        self.max_connections = max_connections or _env_int('PAPER_SEARCH_HTTP_MAX_CONNECTIONS', 100)
+        self.max_keepalive_connections = max_keepalive_connections or _env_int('PAPER_SEARCH_HTTP_MAX_KEEPALIVE', 20)
+        self.keepalive_expiry = keepalive_expiry or _env_float('PAPER_SEARCH_HTTP_KEEPALIVE_EXPIRY', 30.0)
+        self.timeout = timeout or _env_float('PAPER_SEARCH_HTTP_TIMEOUT', 30.0)
+        if http2 is None:
+            http2 = _env_bool('PAPER_SEARCH_HTTP2', True)
+        if http2 and not HTTP2_AVAILABLE:
+            logger.info("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+_config = TransportConfig()
+
+# httpx clients are bound to the event loop that first uses them, and the CLI
+# and tests run one asyncio.run() per command, so pools are kept per loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[bool, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+
+
+def configure(config: TransportConfig) -> None:
+    """
+    Replace the pool settings. Clients that are already open keep their old
+    settings until they are closed with aclose_clients().
+    """
+    global _config
+    _config = config
+
+
+def get_config() -> TransportConfig:
+    """Return the active pool settings."""
+    return _config
+
+
+def get_client(verify: bool = True) -> httpx.AsyncClient:
+    """
+    Return the shared pooled client for the running event loop.
+
+    httpx keeps a separate keep-alive pool per host inside one client, so a
+    single client per loop gives every searcher per-host connection reuse.
+    Request-specific headers and timeouts should be passed per request.
+
+    Args:
+        verify: Whether to verify TLS certificates (Sci-Hub mirrors need False)
+
+    Returns:
+        Shared httpx.AsyncClient; callers must not close it
+    """
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+    client = clients.get(verify)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=_config.http2,
+            limits=_config.limits(),
+            timeout=_config.timeout,
+            verify=verify,
+            follow_redirects=True,
+        )
+        clients[verify] = client
+    return client
+
+
+async def aclose_clients() -> None:
+    """Close the pooled clients of the running event loop (shutdown hook)."""
+    loop = asyncio.get_running_loop()
+    clients = _clients.pop(loop, {})
+    for client in clients.values():
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing HTTP client: {e}")
+
+
+def run(coro):
+    """
+    Run a coroutine with asyncio.run() and close the pooled clients afterwards.
+    Use this instead of asyncio.run() in synchronous entry points.
+    """
+    async def _runner():
+        try:
+            return await coro
+        finally:
+            await aclose_clients()
+
+    return asyncio.run(_runner())
@@ -15,11 +15,11 @@ class TestPubMedSearcher(unittest.TestCase):
     def test_pdf_unsupported(self):
         searcher = PubMedSearcher()
         with self.assertRaises(NotImplementedError):
-            searcher.download_pdf("12345678", "./downloads")
+            asyncio.run(searcher.download_pdf("12345678", "./downloads"))
     
     def test_read_paper_message(self):
         searcher = PubMedSearcher()
-        message = searcher.read_paper("12345678")
+        message = asyncio.run(searcher.read_paper("12345678"))
         self.assertIn("PubMed papers cannot be read directly", message)
 
 if __name__ == '__main__':
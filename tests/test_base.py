@@ -0,0 +1,97 @@
+# tests/test_base.py
+import unittest
+import asyncio
+import httpx
+from paper_search_mcp.paper import Paper
+from paper_search_mcp.ratelimit import configure_rate_limits
+from paper_search_mcp.academic_platforms.base import PaperSource, SEARCH, LOOKUP, BATCH
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class SearchOnly(PaperSource):
+    name = "search_only"
+    description = "Search Only"
+
+
+class LookupSource(PaperSource):
+    name = "lookup"
+    capabilities = frozenset({SEARCH, LOOKUP})
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def get_paper(self, paper_id: str):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if paper_id == "missing":
+            return None
+        return Paper(paper_id=paper_id, title=paper_id, authors=[], abstract="", doi="",
+                     published_date=None, pdf_url="", url="", source="lookup")
+
+
+class TestPaperSource(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+
+    def tearDown(self):
+        configure_rate_limits()
+
+    def test_request_records_metrics(self):
+        def handler(request):
+            return httpx.Response(200 if request.url.path == "/ok" else 404)
+
+        source = SearchOnly()
+
+        async def run():
+            async with make_client(handler) as client:
+                await source.request("GET", "https://api.example.org/ok", client=client)
+                await source.request("GET", "https://api.example.org/gone", client=client)
+
+        asyncio.run(run())
+        metrics = source.metrics.to_dict()
+        self.assertEqual(metrics["requests"], 2)
+        self.assertEqual(metrics["failures"], 1)
+        self.assertGreaterEqual(metrics["mean_seconds"], 0.0)
+
+    def test_connection_errors_count_as_failures(self):
+        def handler(request):
+            raise httpx.ConnectError("down", request=request)
+
+        source = SearchOnly()
+
+        async def run():
+            async with make_client(handler) as client:
+                await source.request("GET", "https://api.example.org/", retries=0, client=client)
+
+        with self.assertRaises(httpx.ConnectError):
+            asyncio.run(run())
+        self.assertEqual((source.metrics.requests, source.metrics.failures), (1, 1))
+
+    def test_unsupported_operations(self):
+        source = SearchOnly()
+        self.assertTrue(SearchOnly.supports(SEARCH))
+        self.assertFalse(SearchOnly.supports(LOOKUP))
+        with self.assertRaisesRegex(NotImplementedError, "Search Only does not support download"):
+            asyncio.run(source.download_pdf("1", "./downloads"))
+        with self.assertRaises(NotImplementedError):
+            asyncio.run(source.read_paper("1"))
+        with self.assertRaisesRegex(NotImplementedError, BATCH):
+            asyncio.run(source.get_papers(["1"]))
+
+    def test_default_get_papers(self):
+        source = LookupSource()
+        ids = [str(i) for i in range(10)] + ["missing"]
+        papers = asyncio.run(source.get_papers(ids))
+        self.assertEqual([p.paper_id if p else None for p in papers], ids[:-1] + [None])
+        self.assertGreater(source.peak, 1)
+        self.assertLessEqual(source.peak, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
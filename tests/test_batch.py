@@ -0,0 +1,72 @@
+# tests/test_batch.py
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+from paper_search_mcp.batch import download_batch, parse_items
+
+
+class FakeDownloader:
+    """Downloader that writes a file after a short delay and tracks concurrency."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def download_pdf(self, paper_id: str, save_path: str) -> str:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if paper_id == "missing":
+                return "Error downloading PDF: 404"
+            path = os.path.join(save_path, f"{paper_id}.pdf")
+            with open(path, "wb") as f:
+                f.write(b"%PDF")
+            return path
+        finally:
+            self.active -= 1
+
+
+class TestParseItems(unittest.TestCase):
+    def test_forms(self):
+        specs = ["arxiv:2106.1", "semantic DOI:10.1/x", "# comment", "", "2106.2", "arxiv:2106.1"]
+        self.assertEqual(
+            parse_items(specs, ["arxiv", "semantic"], default_source="arxiv"),
+            [("arxiv", "2106.1"), ("semantic", "DOI:10.1/x"), ("arxiv", "2106.2")],
+        )
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            parse_items(["2106.1"], ["arxiv"])
+        with self.assertRaises(ValueError):
+            parse_items(["nature 10.1/x"], ["arxiv"])
+
+
+class TestDownloadBatch(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="batch_test_")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_concurrency_and_per_item_status(self):
+        downloader = FakeDownloader()
+        items = [("fake", f"p{i}") for i in range(10)] + [("fake", "missing"), ("other", "x")]
+        finished = []
+        results = asyncio.run(download_batch({"fake": downloader}, items, self.test_dir,
+                                             max_concurrency=3, on_result=finished.append))
+
+        self.assertEqual([(r.source, r.paper_id) for r in results], items)
+        self.assertLessEqual(downloader.peak, 3)
+        self.assertGreater(downloader.peak, 1)
+        self.assertEqual(sum(r.status == "ok" for r in results), 10)
+        self.assertEqual(results[10].status, "error")
+        self.assertIn("404", results[10].error)
+        self.assertEqual(results[11].status, "error")
+        self.assertEqual(len(finished), len(items))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+# tests/test_breaker.py
+import unittest
+import asyncio
+import time
+import httpx
+from paper_search_mcp.breaker import (
+    BreakerPolicy, CircuitBreaker, CircuitOpenError, configure_breakers, CLOSED, OPEN, HALF_OPEN,
+)
+from paper_search_mcp.federation import search_all
+from paper_search_mcp.ratelimit import configure_rate_limits
+from paper_search_mcp.academic_platforms.base import PaperSource
+from paper_search_mcp.academic_platforms.google_scholar import GoogleScholarSearcher
+
+FAST = BreakerPolicy(window=60.0, min_calls=4, failure_rate=0.5, slow_call_seconds=5.0, cooldown=0.05)
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class FlakySource(PaperSource):
+    name = "flaky"
+
+    def __init__(self, client):
+        self.test_client = client
+
+    async def search(self, query: str, max_results: int = 10, **kwargs):
+        response = await self.request("GET", "https://flaky.example.org/search", params={"q": query},
+                                      retries=0, client=self.test_client)
+        response.raise_for_status()
+        return []
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_on_failure_rate(self):
+        breaker = CircuitBreaker("src", FAST)
+        for failed in (False, True, True):
+            breaker.record(failed)
+        # Too few calls to judge yet
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record(True, error="HTTP 503")
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+        self.assertEqual(breaker.to_dict()["last_error"], "HTTP 503")
+
+    def test_stays_closed_below_threshold(self):
+        breaker = CircuitBreaker("src", FAST)
+        for failed in (True, False, False, False, False, True, False):
+            breaker.record(failed)
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.allow()
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = CircuitBreaker("src", FAST)
+        for _ in range(4):
+            breaker.record(False, seconds=6.0)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertIn("slow", breaker.to_dict()["last_error"])
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker("src", FAST)
+        for _ in range(4):
+            breaker.record(True)
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.allow()
+        # Only one probe at a time
+        with self.assertRaises(CircuitOpenError):
+            breaker.allow()
+        breaker.record(True)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(breaker.times_opened, 2)
+
+        time.sleep(0.06)
+        breaker.allow()
+        breaker.record(False)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.to_dict()["recent_calls"], 0)
+
+    def test_released_probe_can_be_retried(self):
+        breaker = CircuitBreaker("src", FAST)
+        for _ in range(4):
+            breaker.record(True)
+        time.sleep(0.06)
+        breaker.allow()
+        breaker.release()
+        breaker.allow()
+
+    def test_disabled(self):
+        breaker = CircuitBreaker("src", FAST, enabled=False)
+        for _ in range(10):
+            breaker.record(True)
+        breaker.allow()
+        self.assertEqual(breaker.to_dict()["state"], "disabled")
+
+
+class TestSourceBreakers(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+        self.board = configure_breakers(FAST, enabled=True)
+
+    def tearDown(self):
+        configure_rate_limits()
+        configure_breakers()
+
+    def test_failing_source_fails_fast(self):
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            return httpx.Response(503)
+
+        async def run():
+            async with make_client(handler) as client:
+                source = FlakySource(client)
+                for i in range(4):
+                    with self.assertRaises(httpx.HTTPStatusError):
+                        await source.search(f"q{i}")
+                start = time.monotonic()
+                with self.assertRaises(CircuitOpenError):
+                    await source.search("q5")
+                return time.monotonic() - start
+
+        elapsed = asyncio.run(run())
+        self.assertEqual(len(calls), 4)
+        self.assertLess(elapsed, 0.01)
+        self.assertEqual(self.board.states()["flaky"]["state"], OPEN)
+
+    def test_client_errors_keep_breaker_closed(self):
+        async def run():
+            async with make_client(lambda request: httpx.Response(404)) as client:
+                source = FlakySource(client)
+                for i in range(6):
+                    with self.assertRaises(httpx.HTTPStatusError):
+                        await source.search(f"q{i}")
+
+        asyncio.run(run())
+        self.assertEqual(self.board.get("flaky").state, CLOSED)
+
+    def test_unexpected_error_frees_the_probe(self):
+        breaker = self.board.get("flaky")
+        for _ in range(4):
+            breaker.record(True)
+        time.sleep(0.06)
+
+        def handler(request):
+            raise ValueError("bad hook")
+
+        async def run():
+            async with make_client(handler) as client:
+                source = FlakySource(client)
+                with self.assertRaises(ValueError):
+                    await source.search("probe")
+                return source
+
+        source = asyncio.run(run())
+        self.assertEqual(source.metrics.failures, 1)
+        # The probe was given back, so the next request may probe again
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.allow()
+
+    def test_fan_out_skips_open_sources(self):
+        for _ in range(4):
+            self.board.get("flaky").record(True)
+
+        async def run():
+            async with make_client(lambda request: httpx.Response(200)) as client:
+                return await search_all({"flaky": FlakySource(client)}, "q")
+
+        [result] = asyncio.run(run())
+        self.assertEqual(result.status, "skipped")
+        self.assertIn("circuit open", result.error)
+
+    def test_scholar_captcha_page_is_a_failure(self):
+        scholar = GoogleScholarSearcher()
+        captcha = httpx.Response(200, text="<form id='gs_captcha_f'>Please show you're not a robot</form>",
+                                 request=httpx.Request("GET", GoogleScholarSearcher.SCHOLAR_URL))
+        results = httpx.Response(200, text="<div class='gs_ri'><h3 class='gs_rt'>A paper</h3></div>",
+                                 request=httpx.Request("GET", GoogleScholarSearcher.SCHOLAR_URL))
+        self.assertTrue(scholar.is_failure(captcha))
+        self.assertFalse(scholar.is_failure(results))
+        self.assertTrue(scholar.is_failure(httpx.Response(429)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+# tests/test_cache.py
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from unittest import mock
+from paper_search_mcp.paper import Paper
+from paper_search_mcp.cache import SearchCache, CachedSearcher, make_key
+
+
+class CountingSearcher:
+    """Searcher that counts upstream calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def search(self, query: str, max_results: int = 10, year: str = None):
+        self.calls += 1
+        return [Paper(
+            paper_id=f"{query}-{self.calls}", title=query, authors=["A B"], abstract="",
+            doi="10.1/x", published_date=datetime(2020, 5, 1), pdf_url="", url="", source="fake",
+            extra={"n": self.calls},
+        )]
+
+    def download_pdf(self, paper_id, save_path):
+        return "delegated"
+
+
+class TestSearchCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="cache_test_")
+        self.path = os.path.join(self.test_dir, "cache.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_hit_after_miss(self):
+        cache = SearchCache(path=self.path)
+        upstream = CountingSearcher()
+        searcher = CachedSearcher(upstream, "fake", cache)
+
+        async def run():
+            first = await searcher.search("Deep  Learning", max_results=5)
+            second = await searcher.search("deep learning", 5)
+            third = await searcher.search("deep learning", max_results=6)
+            return first, second, third
+
+        first, second, third = asyncio.run(run())
+        self.assertEqual(upstream.calls, 2)
+        self.assertEqual(first[0].paper_id, second[0].paper_id)
+        self.assertEqual(second[0].published_date, datetime(2020, 5, 1))
+        self.assertNotEqual(first[0].paper_id, third[0].paper_id)
+        self.assertEqual(searcher.download_pdf("x", "y"), "delegated")
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+
+    def test_persists_across_restarts(self):
+        upstream = CountingSearcher()
+        asyncio.run(CachedSearcher(upstream, "fake", SearchCache(path=self.path)).search("q"))
+        papers = asyncio.run(CachedSearcher(upstream, "fake", SearchCache(path=self.path)).search("q"))
+        self.assertEqual(upstream.calls, 1)
+        self.assertEqual(papers[0].extra, {"n": 1})
+
+    def test_stale_while_revalidate(self):
+        cache = SearchCache(path=self.path, ttls={"fake": 0}, stale_ttl=60)
+        upstream = CountingSearcher()
+        searcher = CachedSearcher(upstream, "fake", cache)
+
+        async def run():
+            await searcher.search("q")
+            time.sleep(0.01)
+            stale = await searcher.search("q")
+            await asyncio.sleep(0.05)  # let the background refresh finish
+            return stale
+
+        stale = asyncio.run(run())
+        self.assertEqual(stale[0].paper_id, "q-1")
+        self.assertEqual(upstream.calls, 2)
+        self.assertEqual(cache.get_stats()["stale_hits"], 1)
+
+    def test_failed_background_refresh_is_logged(self):
+        cache = SearchCache(path=self.path, ttls={"fake": 0}, stale_ttl=60)
+        upstream = CountingSearcher()
+        searcher = CachedSearcher(upstream, "fake", cache)
+
+        async def failing_search(query, max_results=10, year=None):
+            raise RuntimeError("upstream down")
+
+        async def run():
+            await searcher.search("q")
+            time.sleep(0.01)
+            upstream.search = failing_search
+            stale = await searcher.search("q")
+            await asyncio.sleep(0.05)
+            return stale
+
+        with self.assertLogs("paper_search_mcp.cache", level="WARNING") as logs:
+            stale = asyncio.run(run())
+        self.assertEqual(stale[0].paper_id, "q-1")
+        self.assertIn("upstream down", logs.output[0])
+        self.assertEqual(cache.get_stats()["errors"], 1)
+
+    def test_unreadable_entry_is_a_miss(self):
+        upstream = CountingSearcher()
+        asyncio.run(CachedSearcher(upstream, "fake", SearchCache(path=self.path)).search("q"))
+        cache = SearchCache(path=self.path)
+        cache._conn().execute("UPDATE search_cache SET value = ?", ('[{"title": "old format"}]',))
+
+        papers = asyncio.run(CachedSearcher(upstream, "fake", cache).search("q"))
+        self.assertEqual(upstream.calls, 2)
+        self.assertEqual(papers[0].paper_id, "q-2")
+        self.assertEqual(cache.get_stats()["errors"], 1)
+        # The refetched result replaced the bad row
+        self.assertEqual(asyncio.run(CachedSearcher(upstream, "fake", SearchCache(path=self.path)).search("q"))[0].paper_id, "q-2")
+
+    def test_expired_entry_is_a_miss(self):
+        cache = SearchCache(path=self.path, ttls={"fake": 0}, stale_ttl=0)
+        upstream = CountingSearcher()
+        searcher = CachedSearcher(upstream, "fake", cache)
+
+        async def run():
+            await searcher.search("q")
+            time.sleep(0.01)
+            return await searcher.search("q")
+
+        self.assertEqual(asyncio.run(run())[0].paper_id, "q-2")
+
+    def test_lru_eviction(self):
+        cache = SearchCache(path=self.path, max_entries=3, memory_entries=1)
+        paper = asyncio.run(CountingSearcher().search("x"))
+        for i in range(5):
+            cache.put("fake", make_key("fake", f"q{i}", {}), paper)
+        stats = cache.get_stats()
+        self.assertEqual(stats["entries"], 3)
+        self.assertEqual(stats["evictions"], 2)
+        self.assertIsNone(cache.get("fake", make_key("fake", "q0", {}))[0])
+        self.assertIsNotNone(cache.get("fake", make_key("fake", "q4", {}))[0])
+
+    def test_memory_hits_keep_entries_on_disk(self):
+        cache = SearchCache(path=self.path, max_entries=3, memory_entries=10)
+        paper = asyncio.run(CountingSearcher().search("x"))
+        hot = make_key("fake", "hot", {})
+        cache.put("fake", hot, paper)
+        for i in range(5):
+            time.sleep(0.001)
+            self.assertIsNotNone(cache.get("fake", hot)[0])
+            cache.put("fake", make_key("fake", f"q{i}", {}), paper)
+        cache._memory.clear()
+        self.assertIsNotNone(cache.get("fake", hot)[0])
+        self.assertIsNone(cache.get("fake", make_key("fake", "q0", {}))[0])
+
+    def test_memory_hit_stays_on_the_event_loop(self):
+        cache = SearchCache(path=self.path)
+        searcher = CachedSearcher(CountingSearcher(), "fake", cache)
+
+        async def run():
+            await searcher.search("q")
+            with mock.patch("paper_search_mcp.cache.asyncio.to_thread") as to_thread:
+                papers = await searcher.search("q")
+            return papers, to_thread.called
+
+        papers, used_thread = asyncio.run(run())
+        self.assertEqual(papers[0].paper_id, "q-1")
+        self.assertFalse(used_thread)
+
+    def test_details_follow_version(self):
+        cache = SearchCache(path=self.path)
+        paper = asyncio.run(CountingSearcher().search("x"))[0]
+        cache.put_details("fake", "2025/1", "2025-06-01", paper)
+        self.assertEqual(cache.get_details("fake", "2025/1", "2025-06-01").title, "x")
+        # A newer last-updated date invalidates the entry
+        self.assertIsNone(cache.get_details("fake", "2025/1", "2025-06-02"))
+        self.assertEqual(cache.get_stats()["detail_entries"], 1)
+        cache.clear("fake")
+        self.assertIsNone(cache.get_details("fake", "2025/1", "2025-06-01"))
+
+
+if __name__ == '__main__':
+    unittest.main()
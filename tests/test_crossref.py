@@ -2,7 +2,15 @@
 import unittest
 import asyncio
 import os
+import shutil
+import tempfile
+from urllib.parse import unquote
 import requests
+import httpx
+from paper_search_mcp import transport
+from paper_search_mcp.cache import SearchCache
+from paper_search_mcp.ratelimit import configure_rate_limits
+from paper_search_mcp.academic_platforms import crossref
 from paper_search_mcp.academic_platforms.crossref import CrossRefSearcher
 
 def check_api_accessible():
@@ -83,12 +91,12 @@ class TestCrossRefSearcher(unittest.TestCase):
 
     def test_download_pdf_not_supported(self):
         with self.assertRaises(NotImplementedError) as context:
-            self.searcher.download_pdf("10.1038/nature12373", "./downloads")
+            asyncio.run(self.searcher.download_pdf("10.1038/nature12373", "./downloads"))
         
         self.assertIn("CrossRef does not provide direct PDF downloads", str(context.exception))
 
     def test_read_paper_not_supported(self):
-        message = self.searcher.read_paper("10.1038/nature12373")
+        message = asyncio.run(self.searcher.read_paper("10.1038/nature12373"))
         self.assertIn("CrossRef papers cannot be read directly", message)
         self.assertIn("metadata and abstracts are available", message)
 
@@ -102,5 +110,184 @@ class TestCrossRefSearcher(unittest.TestCase):
         self.assertIn("paper-search-mcp", self.searcher.session.headers.get('User-Agent', ''))
         self.assertIn("mailto:", self.searcher.session.headers.get('User-Agent', ''))
 
+
+class FakeWorksAPI:
+    """/works endpoint with `total` results served through cursors."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.requests = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        self.requests.append(dict(params))
+        await asyncio.sleep(0.01)
+        start = 0 if params["cursor"] == "*" else int(params["cursor"].split("-")[1])
+        rows = int(params["rows"])
+        items = [{"DOI": f"10.1/{n}", "title": [f"Work {n}"],
+                  "issued": {"date-parts": [[2020, 1, 2]]}}
+                 for n in range(start, min(start + rows, self.total))]
+        if "select" in params:
+            fields = params["select"].split(",")
+            items = [{k: v for k, v in item.items() if k in fields} for item in items]
+        return httpx.Response(200, json={"message": {
+            "total-results": self.total, "items": items, "next-cursor": f"c-{start + rows}",
+        }})
+
+
+class TestCrossRefPaging(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+
+    def tearDown(self):
+        configure_rate_limits()
+
+    def run_with_api(self, api, coro_factory):
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+            # Make the searcher's shared client the mock for this loop
+            transport._clients[asyncio.get_running_loop()] = {True: client}
+            try:
+                return await coro_factory()
+            finally:
+                await transport.aclose_clients()
+        return asyncio.run(run())
+
+    def test_search_pages_past_one_request(self):
+        api = FakeWorksAPI(total=5000)
+        papers = self.run_with_api(api, lambda: CrossRefSearcher().search(
+            "x", max_results=2500, filter="type:journal-article"))
+        self.assertEqual([p.doi for p in papers], [f"10.1/{n}" for n in range(2500)])
+        self.assertEqual([r["rows"] for r in api.requests], ["1000", "1000", "500"])
+        self.assertEqual([r["cursor"] for r in api.requests], ["*", "c-1000", "c-2000"])
+        self.assertTrue(all(r["filter"] == "type:journal-article" for r in api.requests))
+
+    def test_iterator_stops_at_end_of_results(self):
+        api = FakeWorksAPI(total=150)
+
+        async def harvest():
+            searcher = CrossRefSearcher()
+            return [p async for p in searcher.iter_works(filter="type:book", select="DOI,title", rows=100)]
+
+        papers = self.run_with_api(api, harvest)
+        self.assertEqual(len(papers), 150)
+        self.assertEqual(papers[0].title, "Work 0")
+        # Projected fields only; the parser fills in defaults for the rest
+        self.assertEqual(papers[0].published_date.year, 1970)
+        self.assertEqual(api.requests[0]["select"], "DOI,title")
+        self.assertNotIn("query", api.requests[0])
+
+    def test_early_exit_cancels_prefetch(self):
+        api = FakeWorksAPI(total=10000)
+
+        async def first_few():
+            found = []
+            async for paper in CrossRefSearcher().iter_works("x", rows=10):
+                found.append(paper)
+                if len(found) == 5:
+                    break
+            await asyncio.sleep(0.05)
+            return found
+
+        self.assertEqual(len(self.run_with_api(api, first_few)), 5)
+        # The first page plus at most the prefetched second one
+        self.assertLessEqual(len(api.requests), 2)
+
+    def test_failed_page_keeps_earlier_results(self):
+        api = FakeWorksAPI(total=3000)
+
+        async def flaky(request):
+            if request.url.params["cursor"] != "*":
+                return httpx.Response(400)
+            return await api(request)
+
+        papers = self.run_with_api(flaky, lambda: CrossRefSearcher().search("x", max_results=3000))
+        self.assertEqual(len(papers), 1000)
+
+
+class FakeDoiAPI:
+    """Answers `filter=doi:` queries and single /works/{doi} lookups for `known` DOIs."""
+
+    def __init__(self, known):
+        self.known = set(known)
+        self.batches = []
+        self.singles = []
+        self.active = 0
+        self.peak = 0
+
+    @staticmethod
+    def item(doi):
+        # CrossRef reports DOIs in their registered case
+        return {"DOI": doi.upper(), "title": [f"Title of {doi}"]}
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        path = unquote(request.url.path)
+        if path == "/works":
+            dois = [value[len("doi:"):] for value in request.url.params["filter"].split(",")]
+            self.batches.append(dois)
+            return httpx.Response(200, json={"message": {
+                "items": [self.item(doi) for doi in dois if doi in self.known]}})
+        doi = path[len("/works/"):]
+        self.singles.append(doi)
+        if doi not in self.known:
+            return httpx.Response(404)
+        return httpx.Response(200, json={"message": self.item(doi)})
+
+
+class TestResolveDois(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+        self.test_dir = tempfile.mkdtemp(prefix="crossref_test_")
+        self.cache = SearchCache(path=os.path.join(self.test_dir, "cache.sqlite3"))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.test_dir)
+        configure_rate_limits()
+
+    def resolve(self, api, dois):
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+            transport._clients[asyncio.get_running_loop()] = {True: client}
+            try:
+                return await CrossRefSearcher(doi_cache=self.cache).resolve_dois(dois)
+            finally:
+                await transport.aclose_clients()
+        return asyncio.run(run())
+
+    def test_batches_dedupe_and_order(self):
+        dois = [f"10.1/{n}" for n in range(120)]
+        api = FakeDoiAPI(dois)
+        requested = ["https://doi.org/10.1/5", "not a doi"] + dois + ["DOI:10.1/7", "10.1/missing"]
+        papers = self.resolve(api, requested)
+        self.assertEqual(len(papers), len(requested))
+        self.assertEqual(papers[0].title, "Title of 10.1/5")
+        self.assertIsNone(papers[1])
+        self.assertEqual(papers[-2].title, "Title of 10.1/7")
+        self.assertIsNone(papers[-1])
+        self.assertEqual(sorted(len(batch) for batch in api.batches), [21, 50, 50])
+        self.assertLessEqual(api.peak, crossref.POLITE_CONCURRENCY)
+        # Only the DOI no batch returned is retried on its own
+        self.assertEqual(api.singles, ["10.1/missing"])
+
+    def test_known_dois_come_from_cache(self):
+        api = FakeDoiAPI(["10.1/a", "10.1/b"])
+        self.resolve(api, ["10.1/a"])
+        papers = self.resolve(api, ["10.1/a", "10.1/b"])
+        self.assertEqual([p.title for p in papers], ["Title of 10.1/a", "Title of 10.1/b"])
+        self.assertEqual(api.batches, [["10.1/a"], ["10.1/b"]])
+
+    def test_comma_dois_are_fetched_alone(self):
+        api = FakeDoiAPI(["10.1/a,b", "10.1/c"])
+        papers = self.resolve(api, ["10.1/a,b", "10.1/c"])
+        self.assertEqual([p.title for p in papers], ["Title of 10.1/a,b", "Title of 10.1/c"])
+        self.assertEqual(api.batches, [["10.1/c"]])
+        self.assertEqual(api.singles, ["10.1/a,b"])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
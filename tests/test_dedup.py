@@ -0,0 +1,104 @@
+# tests/test_dedup.py
+import unittest
+import time
+from datetime import datetime
+from paper_search_mcp.paper import Paper
+from paper_search_mcp.dedup import merge_papers, normalize_doi, first_author_surname
+
+
+def make_paper(paper_id, source, title="Attention Is All You Need", authors=None, doi="", **kwargs):
+    return Paper(
+        paper_id=paper_id, title=title, authors=authors or ["Ashish Vaswani"], abstract=kwargs.pop("abstract", ""),
+        doi=doi, published_date=datetime(2017, 6, 12), pdf_url=kwargs.pop("pdf_url", ""),
+        url=kwargs.pop("url", ""), source=source, **kwargs,
+    )
+
+
+class TestMergePapers(unittest.TestCase):
+    def test_normalizers(self):
+        self.assertEqual(normalize_doi("https://doi.org/10.1038/Nature12373"), "10.1038/nature12373")
+        self.assertEqual(normalize_doi("doi: 10.1/X"), "10.1/x")
+        self.assertEqual(first_author_surname(["Vaswani A"]), "vaswani")
+        self.assertEqual(first_author_surname(["Vaswani, Ashish"]), "vaswani")
+        self.assertEqual(first_author_surname(["Ashish Vaswani"]), "vaswani")
+
+    def test_merge_across_sources(self):
+        """Test that arXiv, Semantic Scholar, CrossRef and PubMed records fold into one."""
+        papers = [
+            make_paper("1706.03762v5", "arxiv", pdf_url="https://arxiv.org/pdf/1706.03762v5"),
+            make_paper("abc123", "semantic", abstract="The dominant sequence transduction models...",
+                       citations=90000, extra={"external_ids": {"ArXiv": "1706.03762", "DOI": "10.5555/3295222"}}),
+            make_paper("10.5555/3295222", "crossref", doi="https://doi.org/10.5555/3295222",
+                       title="Attention is all you need!", authors=["Vaswani A", "Shazeer N"]),
+            make_paper("999", "pubmed", title="A different paper entirely", authors=["Smith J"]),
+        ]
+        merged = merge_papers(papers)
+
+        self.assertEqual(len(merged), 2)
+        paper = merged[0]
+        self.assertEqual(paper.source, "arxiv")
+        self.assertEqual(paper.extra["source_ids"],
+                         {"arxiv": ["1706.03762v5"], "semantic": ["abc123"], "crossref": ["10.5555/3295222"]})
+        self.assertEqual(paper.citations, 90000)
+        self.assertTrue(paper.abstract.startswith("The dominant"))
+        self.assertEqual(len(paper.authors), 2)
+        self.assertTrue(paper.doi)
+        # Inputs are not mutated
+        self.assertEqual(papers[0].extra, {})
+
+    def test_transitive_merge(self):
+        """Test that A~B by DOI and B~C by title join all three."""
+        papers = [
+            make_paper("a", "crossref", doi="10.1/xyz", title="Completely Different Title Here"),
+            make_paper("b", "semantic", doi="10.1/XYZ"),
+            make_paper("c", "searxng"),
+        ]
+        merged = merge_papers(papers)
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(set(merged[0].extra["source_ids"]), {"crossref", "semantic", "searxng"})
+
+    def test_same_source_ids_are_kept(self):
+        """Test that two records from one source keep both IDs."""
+        papers = [
+            make_paper("1706.03762v5", "arxiv"),
+            make_paper("s1", "semantic", extra={"external_ids": {"ArXiv": "1706.03762"}}),
+            make_paper("s2", "semantic", extra={"external_ids": {"ArXiv": "1706.03762"}}),
+        ]
+        merged = merge_papers(papers)
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(merged[0].extra["source_ids"], {"arxiv": ["1706.03762v5"], "semantic": ["s1", "s2"]})
+
+    def test_generic_titles_do_not_bridge_dois(self):
+        """Test that authorless 'Erratum' records and differing DOIs stay apart."""
+        papers = [
+            make_paper("e1", "crossref", title="Erratum to the previous article", doi="10.1/one", authors=[""]),
+            make_paper("e2", "crossref", title="Erratum to the previous article", doi="10.1/two", authors=[""]),
+            make_paper("e3", "searxng", title="Erratum to the previous article", authors=[""]),
+        ]
+        self.assertEqual(len(merge_papers(papers)), 3)
+
+    def test_conflicting_dois_are_not_joined(self):
+        """Test that a title match never joins two records with different DOIs."""
+        papers = [
+            make_paper("a", "crossref", doi="10.1/journal"),
+            make_paper("b", "searxng"),
+            make_paper("c", "crossref", doi="10.1/reprint"),
+        ]
+        merged = merge_papers(papers)
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(merged[0].extra["source_ids"], {"crossref": ["a"], "searxng": ["b"]})
+        self.assertEqual(merged[1].paper_id, "c")
+
+    def test_linear_scaling(self):
+        """Test that a large result set is merged quickly."""
+        papers = [make_paper(str(i), "crossref", title=f"Distinct paper number {i}", doi=f"10.1/{i}")
+                  for i in range(20000)]
+        papers += [make_paper(f"s{i}", "semantic", title=f"Distinct paper number {i}") for i in range(20000)]
+        start = time.monotonic()
+        merged = merge_papers(papers)
+        self.assertEqual(len(merged), 20000)
+        self.assertLess(time.monotonic() - start, 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
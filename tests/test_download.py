@@ -0,0 +1,149 @@
+# tests/test_download.py
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+import httpx
+from paper_search_mcp.download import stream_to_file, report_progress, DownloadError
+from paper_search_mcp.breaker import configure_breakers
+from paper_search_mcp.ratelimit import configure_rate_limits
+from paper_search_mcp.academic_platforms.base import PaperSource
+
+BODY = bytes(range(256)) * 40
+
+
+class DroppingStream(httpx.AsyncByteStream):
+    """Body that breaks off after `cut` bytes, like a dropped connection."""
+
+    def __init__(self, data: bytes, cut: int):
+        self.data = data
+        self.cut = cut
+
+    async def __aiter__(self):
+        yield self.data[:self.cut]
+        raise httpx.ReadError("connection reset")
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestStreamToFile(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="download_test_")
+        self.path = os.path.join(self.test_dir, "paper.pdf")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_resume_after_dropped_connection(self):
+        ranges = []
+
+        def handler(request):
+            ranges.append(request.headers.get("Range"))
+            if "Range" not in request.headers:
+                return httpx.Response(200, headers={"Content-Length": str(len(BODY))},
+                                      stream=DroppingStream(BODY, 1000))
+            start = int(request.headers["Range"][len("bytes="):-1])
+            return httpx.Response(206, content=BODY[start:], headers={
+                "Content-Range": f"bytes {start}-{len(BODY) - 1}/{len(BODY)}",
+            })
+
+        updates = []
+
+        async def run():
+            async with make_client(handler) as client:
+                with report_progress(lambda done, total: updates.append((done, total))):
+                    return await stream_to_file("https://example.org/p.pdf", self.path, client=client)
+
+        result = asyncio.run(run())
+        self.assertEqual(ranges, [None, "bytes=1000-"])
+        self.assertEqual(result.resumes, 1)
+        self.assertEqual(result.size, len(BODY))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), BODY)
+        self.assertFalse(os.path.exists(self.path + ".part"))
+        self.assertEqual(updates[-1], (len(BODY), len(BODY)))
+
+    def test_server_ignoring_range_restarts(self):
+        with open(self.path + ".part", "wb") as f:
+            f.write(b"stale bytes")
+
+        def handler(request):
+            return httpx.Response(200, content=BODY)
+
+        async def run():
+            async with make_client(handler) as client:
+                return await stream_to_file("https://example.org/p.pdf", self.path, client=client)
+
+        asyncio.run(run())
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), BODY)
+
+    def test_wrong_content_type_rejected(self):
+        def handler(request):
+            return httpx.Response(200, content=b"<html></html>", headers={"Content-Type": "text/html"})
+
+        async def run():
+            async with make_client(handler) as client:
+                return await stream_to_file("https://example.org/p.pdf", self.path, client=client,
+                                            expect_content_type="application/pdf")
+
+        with self.assertRaises(DownloadError):
+            asyncio.run(run())
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + ".part"))
+
+
+
+class TestSourceDownloads(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+        self.board = configure_breakers()
+        self.test_dir = tempfile.mkdtemp(prefix="download_test_")
+        self.path = os.path.join(self.test_dir, "paper.pdf")
+
+    def tearDown(self):
+        configure_rate_limits()
+        configure_breakers()
+        shutil.rmtree(self.test_dir)
+
+    def test_download_goes_through_the_source_hook(self):
+        statuses = [503, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), stream=httpx.ByteStream(BODY))
+
+        source = PaperSource()
+        source.name = "pdfsource"
+
+        async def run():
+            async with make_client(handler) as client:
+                return await stream_to_file("https://example.org/p.pdf", self.path, client=client,
+                                            source=source)
+
+        result = asyncio.run(run())
+        self.assertEqual(result.size, len(BODY))
+        # The 503 was retried by the shared retry policy, then counted as one request
+        self.assertEqual(source.metrics.requests, 1)
+        self.assertEqual(source.latency.to_dict()["samples"], 1)
+        self.assertEqual(self.board.states()["pdfsource"]["recent_calls"], 1)
+
+    def test_open_breaker_stops_downloads(self):
+        source = PaperSource()
+        source.name = "pdfsource"
+        for _ in range(10):
+            self.board.get("pdfsource").record(True)
+
+        async def run():
+            async with make_client(lambda request: httpx.Response(200, content=BODY)) as client:
+                await stream_to_file("https://example.org/p.pdf", self.path, client=client, source=source)
+
+        with self.assertRaises(httpx.HTTPError):
+            asyncio.run(run())
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
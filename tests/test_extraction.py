@@ -0,0 +1,141 @@
+# tests/test_extraction.py
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from paper_search_mcp.extraction import (
+    PDFExtractor, ExtractionError, EXTRACTOR_VERSION, parse_page_ranges, select_pages,
+)
+from paper_search_mcp.text_cache import TextCache
+
+
+def write_pdf(path, pages):
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+class TestPDFExtractor(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="extraction_test_")
+        self.pdf = os.path.join(self.test_dir, "paper.pdf")
+        write_pdf(self.pdf, ["First page", "Second page"])
+        self.cache = TextCache(path=os.path.join(self.test_dir, "text_cache.sqlite3"))
+        self.extractor = PDFExtractor(workers=2, timeout=60, cache=self.cache)
+
+    def tearDown(self):
+        self.extractor.close()
+        self.cache.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_extract_in_parallel(self):
+        async def run():
+            return await asyncio.gather(
+                self.extractor.extract_text(self.pdf),
+                self.extractor.extract_pages(self.pdf, [1]),
+            )
+
+        text, (page_count, pages) = asyncio.run(run())
+        self.assertIn("First page", text)
+        self.assertIn("Second page", text)
+        self.assertEqual(page_count, 2)
+        self.assertEqual(len(pages), 1)
+        self.assertIn("Second page", pages[0])
+
+    def test_corrupt_pdf_is_isolated(self):
+        broken = os.path.join(self.test_dir, "broken.pdf")
+        with open(broken, "wb") as f:
+            f.write(b"not a pdf")
+        with self.assertRaises(ExtractionError):
+            asyncio.run(self.extractor.extract_text(broken))
+        # The pool keeps working for other documents
+        self.assertIn("First page", asyncio.run(self.extractor.extract_text(self.pdf)))
+
+    def test_repeated_reads_use_text_cache(self):
+        first = asyncio.run(self.extractor.extract_pages(self.pdf, [0]))
+        self.assertEqual(self.cache.stats["misses"], 1)
+
+        # Page 0 is cached, page 1 is not: one more parse fills in the rest
+        asyncio.run(self.extractor.extract_text(self.pdf))
+        hits = self.cache.stats["hits"]
+        again = asyncio.run(self.extractor.extract_pages(self.pdf, [0]))
+        self.assertEqual(again, first)
+        self.assertEqual(self.cache.stats["hits"], hits + 1)
+
+        page_count, pages = self.cache.get(self.cache.file_hash(self.pdf), EXTRACTOR_VERSION)
+        self.assertEqual(page_count, 2)
+        self.assertNotIn(None, pages)
+
+    def test_text_cache_lru_cap(self):
+        cache = TextCache(path=os.path.join(self.test_dir, "small.sqlite3"), max_bytes=600)
+        text = os.urandom(300).hex()
+        cache.put("a", "v1", 1, {0: text})
+        cache.put("b", "v1", 1, {0: text})
+        self.assertIsNone(cache.get("a", "v1"))
+        self.assertEqual(cache.get("b", "v1"), (1, [text]))
+        self.assertEqual(cache.stats["evictions"], 1)
+        cache.close()
+
+    def test_concurrent_puts_merge_pages(self):
+        cache = TextCache(path=os.path.join(self.test_dir, "merge.sqlite3"))
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda n: cache.put("a", "v1", 32, {n: f"page {n}"}), range(32)))
+        self.assertEqual(cache.get("a", "v1"), (32, [f"page {n}" for n in range(32)]))
+        cache.close()
+
+    def test_page_ranges(self):
+        self.assertEqual(parse_page_ranges("1-3, 5,9-"), [(0, 2), (4, 4), (8, None)])
+        self.assertEqual(select_pages(parse_page_ranges("2,1-3,9-"), 10), [1, 0, 2, 8, 9])
+        for bad in ("", "0", "3-1", "a-b", "1,,2"):
+            with self.assertRaises(ValueError):
+                parse_page_ranges(bad)
+
+    def test_budget_parses_only_needed_pages(self):
+        long_pdf = os.path.join(self.test_dir, "thesis.pdf")
+        write_pdf(long_pdf, [f"Page {n} " + "x" * 80 for n in range(1, 41)])
+
+        text = asyncio.run(self.extractor.read_text(long_pdf, max_chars=150))
+        self.assertIn("Page 1 x", text)
+        self.assertIn("[Truncated at 150 characters on page 2 of 40", text)
+        _, cached = self.cache.get(self.cache.file_hash(long_pdf), EXTRACTOR_VERSION)
+        self.assertTrue(all(page is None for page in cached[8:]))
+
+        marked = asyncio.run(self.extractor.read_text(long_pdf, pages="3,39-", page_markers=True))
+        self.assertEqual([line for line in marked.splitlines() if line.startswith("---")],
+                         ["--- Page 3 ---", "--- Page 39 ---", "--- Page 40 ---"])
+
+        async def first_pages():
+            numbers = []
+            async for number, page_count, _ in self.extractor.iter_pages(long_pdf, "5-"):
+                numbers.append(number)
+                if len(numbers) == 2:
+                    break
+            return numbers
+
+        self.assertEqual(asyncio.run(first_pages()), [5, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
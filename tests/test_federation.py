@@ -0,0 +1,69 @@
+# tests/test_federation.py
+import unittest
+import asyncio
+import time
+from datetime import datetime
+from paper_search_mcp.paper import Paper
+from paper_search_mcp.federation import iter_search, search_all, select_searchers
+
+
+class FakeSearcher:
+    """Searcher that answers after a fixed delay."""
+
+    def __init__(self, name, delay, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+
+    async def search(self, query, max_results=10):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream error")
+        return [Paper(
+            paper_id=f"{self.name}-{i}", title=f"{query} {i}", authors=[], abstract="",
+            doi="", published_date=datetime(2024, 1, 1), pdf_url="", url="", source=self.name,
+        ) for i in range(max_results)]
+
+
+class TestFederatedSearch(unittest.TestCase):
+    def test_results_in_completion_order(self):
+        """Test that fast sources are yielded before slow ones."""
+        searchers = {
+            "slow": FakeSearcher("slow", 0.2),
+            "fast": FakeSearcher("fast", 0.01),
+        }
+
+        async def run():
+            return [result.source async for result in iter_search(searchers, "q", 2)]
+
+        self.assertEqual(asyncio.run(run()), ["fast", "slow"])
+
+    def test_concurrent_latency_and_timeout(self):
+        """Test that wall time tracks the slowest source inside the budget."""
+        searchers = {
+            "a": FakeSearcher("a", 0.2),
+            "b": FakeSearcher("b", 0.2),
+            "c": FakeSearcher("c", 0.2),
+            "stuck": FakeSearcher("stuck", 10),
+            "broken": FakeSearcher("broken", 0, fail=True),
+        }
+        start = time.monotonic()
+        results = {r.source: r for r in asyncio.run(search_all(searchers, "q", 3, timeout=0.5))}
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(len(results["a"].papers), 3)
+        self.assertEqual(results["stuck"].status, "timeout")
+        self.assertEqual(results["broken"].status, "error")
+        self.assertIn("upstream error", results["broken"].error)
+
+    def test_select_searchers(self):
+        searchers = {"arxiv": object(), "pubmed": object()}
+        self.assertEqual(list(select_searchers(searchers, None)), ["arxiv", "pubmed"])
+        self.assertEqual(list(select_searchers(searchers, ["pubmed"])), ["pubmed"])
+        with self.assertRaises(ValueError):
+            select_searchers(searchers, ["nope"])
+
+
+if __name__ == '__main__':
+    unittest.main()
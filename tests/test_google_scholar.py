@@ -37,10 +37,10 @@ class TestGoogleScholarSearcher(unittest.TestCase):
 
     def test_download_pdf_not_supported(self):
         with self.assertRaises(NotImplementedError):
-            self.searcher.download_pdf("some_id", "./downloads")
+            asyncio.run(self.searcher.download_pdf("some_id", "./downloads"))
 
     def test_read_paper_not_supported(self):
-        message = self.searcher.read_paper("some_id")
+        message = asyncio.run(self.searcher.read_paper("some_id"))
         self.assertIn("Google Scholar doesn't support direct paper reading", message)
 
 if __name__ == '__main__':
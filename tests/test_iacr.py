@@ -1,7 +1,13 @@
 import unittest
 import asyncio
 import os
+import shutil
+import tempfile
+import time
 import requests
+from datetime import datetime
+from paper_search_mcp.paper import Paper
+from paper_search_mcp.cache import SearchCache
 from paper_search_mcp.academic_platforms.iacr import IACRSearcher
 
 
@@ -304,5 +310,72 @@ class TestIACRSearcher(unittest.TestCase):
             )
 
 
+def make_hit(paper_id: str, updated: str) -> Paper:
+    return Paper(
+        paper_id=paper_id, title=f"Hit {paper_id}", authors=[], abstract="", doi="",
+        published_date=datetime.fromisoformat(updated), updated_date=datetime.fromisoformat(updated),
+        pdf_url="", url="", source="iacr", categories=["Foundations"],
+    )
+
+
+class SlowDetailSearcher(IACRSearcher):
+    """Detail pages that take 0.2s each, tracking concurrency."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.fetched = []
+        self.active = 0
+        self.peak = 0
+
+    async def get_paper_details(self, paper_id):
+        self.fetched.append(paper_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.2)
+        self.active -= 1
+        if paper_id == "2025/missing":
+            return None
+        paper = make_hit(paper_id, "2025-06-01")
+        paper.title = f"Details {paper_id}"
+        paper.categories = []
+        return paper
+
+
+class TestIACRDetails(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="iacr_details_test_")
+        self.cache = SearchCache(path=os.path.join(self.test_dir, "cache.sqlite3"))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_details_fetched_concurrently(self):
+        searcher = SlowDetailSearcher(detail_cache=self.cache, detail_concurrency=8)
+        hits = [make_hit(f"2025/{i}", "2025-06-01") for i in range(16)]
+        start = time.monotonic()
+        papers = asyncio.run(searcher._add_details(hits))
+        elapsed = time.monotonic() - start
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(searcher.peak, 8)
+        self.assertEqual([p.paper_id for p in papers], [h.paper_id for h in hits])
+        self.assertTrue(all(p.title.startswith("Details") for p in papers))
+        self.assertEqual(papers[0].categories, ["Foundations"])
+
+    def test_detail_cache_checks_last_updated(self):
+        searcher = SlowDetailSearcher(detail_cache=self.cache)
+        asyncio.run(searcher._add_details([make_hit("2025/1", "2025-06-01")]))
+        asyncio.run(searcher._add_details([make_hit("2025/1", "2025-06-01")]))
+        self.assertEqual(searcher.fetched, ["2025/1"])
+        # Revised since: the page is fetched again
+        asyncio.run(searcher._add_details([make_hit("2025/1", "2025-07-01")]))
+        self.assertEqual(searcher.fetched, ["2025/1", "2025/1"])
+
+    def test_failed_details_keep_search_hit(self):
+        searcher = SlowDetailSearcher(detail_cache=self.cache)
+        papers = asyncio.run(searcher._add_details([make_hit("2025/missing", "2025-06-01")]))
+        self.assertEqual(papers[0].title, "Hit 2025/missing")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,149 @@
+# tests/test_knowledge.py
+import unittest
+import asyncio
+import importlib.util
+from datetime import datetime
+from paper_search_mcp.paper import Paper
+from paper_search_mcp.knowledge import KnowledgeStore, paper_record
+
+HAS_SURREALDB = importlib.util.find_spec("surrealdb") is not None
+
+
+def make_paper(i: int, title: str = None) -> Paper:
+    return Paper(paper_id=f"p{i}", title=title or f"Paper {i}", authors=["Ada Lovelace", "Alan Turing"],
+                 abstract=f"Abstract {i}", doi=f"10.1/{i}", published_date=datetime(2020, 5, 1),
+                 pdf_url="", url=f"https://example.org/{i}", source="fake", categories=["cs.LG"])
+
+
+class TestPaperRecord(unittest.TestCase):
+    def test_to_dict_output(self):
+        record = paper_record(make_paper(1).to_dict())
+        self.assertEqual(record["authors"], ["Ada Lovelace", "Alan Turing"])
+        self.assertEqual(record["categories"], ["cs.LG"])
+        self.assertEqual(record["keywords"], [])
+        self.assertEqual(record["published_date"].year, 2020)
+        self.assertIsNotNone(record["published_date"].tzinfo)
+
+    def test_missing_fields(self):
+        self.assertIsNone(paper_record({"title": "No ID"}))
+        record = paper_record({"paper_id": "x", "published_date": "not a date"})
+        self.assertNotIn("published_date", record)
+        self.assertEqual(record["title"], "")
+
+
+@unittest.skipUnless(HAS_SURREALDB, "surrealdb not installed")
+class TestBulkStore(unittest.TestCase):
+    def setUp(self):
+        self.store = KnowledgeStore(url="mem://")
+
+    def run_store(self, coro_fn):
+        async def run():
+            try:
+                return await coro_fn()
+            finally:
+                await self.store.close()
+        return asyncio.run(run())
+
+    def test_bulk_store_in_batches(self):
+        async def run():
+            papers = (make_paper(i) for i in range(25))
+            stats = await self.store.store_papers_bulk(papers, batch_size=10)
+            return stats, await self.store.get_knowledge_stats()
+
+        stats, counts = self.run_store(run)
+        self.assertEqual((stats["stored"], stats["batches"], stats["failed"]), (25, 3, 0))
+        self.assertEqual(counts["papers"], 25)
+
+    def test_reimport_updates_instead_of_duplicating(self):
+        async def run():
+            await self.store.store_papers_bulk([make_paper(i) for i in range(5)])
+            stats = await self.store.store_papers_bulk(
+                [make_paper(i, title="Revised").to_dict() for i in range(3)] + [make_paper(3)])
+            return stats, await self.store.get_knowledge_stats(), await self.store.get_paper("p1")
+
+        stats, counts, paper = self.run_store(run)
+        self.assertEqual(stats["stored"], 4)
+        self.assertEqual(counts["papers"], 5)
+        self.assertEqual(paper["title"], "Revised")
+        self.assertEqual(paper["authors"], ["Ada Lovelace", "Alan Turing"])
+
+    def test_store_single_paper(self):
+        async def run():
+            record_id = await self.store.store_paper(make_paper(7).to_dict())
+            return record_id, await self.store.get_paper("p7")
+
+        record_id, paper = self.run_store(run)
+        self.assertTrue(record_id.startswith("paper:"))
+        self.assertEqual(paper["categories"], ["cs.LG"])
+
+    def test_papers_without_id_are_skipped(self):
+        async def run():
+            return await self.store.store_papers_bulk(
+                [make_paper(1), {"title": "No ID"}, make_paper(1), make_paper(2)])
+
+        stats = self.run_store(run)
+        self.assertEqual((stats["stored"], stats["skipped"]), (2, 1))
+
+
+@unittest.skipUnless(HAS_SURREALDB, "surrealdb not installed")
+class TestSearchPapers(unittest.TestCase):
+    def setUp(self):
+        self.store = KnowledgeStore(url="mem://")
+
+    def search(self, *queries, lost_index: bool = False, **kwargs):
+        papers = [make_paper(i, title=f"Filler topic {i}") for i in range(10)]
+        papers[3].abstract = "We train graph networks on molecules."
+        papers[5].title = "Graph Neural Networks"
+        papers[7].title = "Networks of Networks"
+
+        async def run():
+            try:
+                await self.store.store_papers_bulk(papers)
+                if lost_index:
+                    self.store.index.clear()
+                    self.assertEqual(await self.store.sync_index(), 10)
+                return [await self.store.search_papers(query, **kwargs) for query in queries]
+            finally:
+                await self.store.close()
+        return asyncio.run(run())
+
+    def test_ranked_title_matches_first(self):
+        [results] = self.search("graph network")
+        self.assertEqual([p["paper_id"] for p in results], ["p5", "p3"])
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+    def test_case_and_word_endings_ignored(self):
+        [results] = self.search("NETWORK")
+        self.assertEqual({p["paper_id"] for p in results}, {"p3", "p5", "p7"})
+
+    def test_pagination(self):
+        first, blank = self.search("networks", "  ")
+        self.assertEqual(len(first), 3)
+        self.assertEqual(blank, [])
+
+        [page] = self.search("networks", limit=2, offset=1)
+        self.assertEqual([p["paper_id"] for p in page], [p["paper_id"] for p in first[1:]])
+
+    def test_index_rebuilt_from_stored_papers(self):
+        [results] = self.search("graph network", lost_index=True)
+        self.assertEqual([p["paper_id"] for p in results], ["p5", "p3"])
+        self.assertEqual(results[0]["authors"], ["Ada Lovelace", "Alan Turing"])
+
+    def test_reimport_reindexes(self):
+        async def run():
+            try:
+                await self.store.store_papers_bulk([make_paper(1, title="Graph networks")])
+                await self.store.store_papers_bulk([make_paper(1, title="Protein folding")])
+                return (await self.store.search_papers("graph"), await self.store.search_papers("protein"),
+                        self.store.index.count())
+            finally:
+                await self.store.close()
+
+        graph, protein, indexed = asyncio.run(run())
+        self.assertEqual(graph, [])
+        self.assertEqual([p["paper_id"] for p in protein], ["p1"])
+        self.assertEqual(indexed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+# tests/test_latency.py
+import unittest
+import asyncio
+import time
+import httpx
+from paper_search_mcp.breaker import configure_breakers
+from paper_search_mcp.latency import LatencyHistogram, LatencyTracker, HedgeBudget, hedged
+from paper_search_mcp.ratelimit import configure_rate_limits, HostPolicy
+from paper_search_mcp.academic_platforms.base import PaperSource
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def primed(seconds: float = 0.01, **kwargs) -> LatencyTracker:
+    tracker = LatencyTracker(factor=3.0, min_timeout=0.5, **kwargs)
+    for _ in range(tracker.min_samples):
+        tracker.observe(seconds)
+    return tracker
+
+
+class HedgingSource(PaperSource):
+    name = "hedging"
+    hedge_requests = True
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_quantiles(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 101):
+            histogram.observe(i / 100)
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.5, delta=0.5 * 0.15)
+        self.assertAlmostEqual(histogram.quantile(0.99), 0.99, delta=0.99 * 0.15)
+        self.assertGreaterEqual(histogram.quantile(0.99), 0.99)
+
+    def test_empty_and_out_of_range(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.quantile(0.5))
+        histogram.observe(0.0)
+        histogram.observe(10_000.0)
+        self.assertEqual(histogram.quantile(0.01), histogram.bounds[0])
+        self.assertEqual(histogram.quantile(1.0), histogram.bounds[-1])
+
+    def test_recent_samples_dominate(self):
+        histogram = LatencyHistogram(decay_every=100)
+        for _ in range(300):
+            histogram.observe(5.0)
+        for _ in range(400):
+            histogram.observe(0.1)
+        self.assertLess(histogram.quantile(0.9), 0.2)
+
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_timeout_follows_p99(self):
+        tracker = LatencyTracker(factor=3.0, min_timeout=0.5)
+        # Not enough samples yet: the fixed timeout stands
+        self.assertEqual(tracker.timeout(30.0), 30.0)
+        self.assertIsNone(tracker.hedge_delay())
+        for _ in range(tracker.min_samples):
+            tracker.observe(1.0)
+        self.assertAlmostEqual(tracker.timeout(30.0), 3.0, delta=0.5)
+        # Never above the caller's timeout, never below the floor
+        self.assertEqual(tracker.timeout(2.0), 2.0)
+        self.assertEqual(primed(0.01).timeout(30.0), 0.5)
+
+    def test_hedge_budget(self):
+        budget = HedgeBudget(0.5, burst=1.0)
+        self.assertFalse(budget.spend())
+        budget.earn()
+        budget.earn()
+        budget.earn()
+        self.assertTrue(budget.spend())
+        self.assertFalse(budget.spend())
+        self.assertFalse(HedgeBudget(0.0).spend())
+
+
+class TestHedged(unittest.TestCase):
+    def test_hedge_wins_when_first_is_slow(self):
+        tracker = primed(hedge_budget=1.0)
+        delays = [1.0, 0.0]
+
+        async def send():
+            await asyncio.sleep(delays.pop(0))
+            return "answer"
+
+        start = time.monotonic()
+        self.assertEqual(asyncio.run(hedged(send, tracker, 0.05)), "answer")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual((tracker.hedges, tracker.hedge_wins), (1, 1))
+
+    def test_fast_answer_is_not_hedged(self):
+        tracker = primed(hedge_budget=1.0)
+        calls = []
+
+        async def send():
+            calls.append(1)
+            return "answer"
+
+        asyncio.run(hedged(send, tracker, 0.05))
+        self.assertEqual((len(calls), tracker.hedges), (1, 0))
+
+    def test_no_hedge_without_budget(self):
+        tracker = primed(hedge_budget=0.0)
+        calls = []
+
+        async def send():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return "answer"
+
+        self.assertEqual(asyncio.run(hedged(send, tracker, 0.01)), "answer")
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_hedge_falls_back_to_first(self):
+        tracker = primed(hedge_budget=1.0)
+        attempts = []
+
+        async def send():
+            attempts.append(1)
+            if len(attempts) == 2:
+                raise httpx.ConnectError("refused")
+            await asyncio.sleep(0.1)
+            return "answer"
+
+        self.assertEqual(asyncio.run(hedged(send, tracker, 0.01)), "answer")
+        self.assertEqual(tracker.hedge_wins, 0)
+
+
+class TestSourceLatency(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+        configure_breakers(enabled=False)
+
+    def tearDown(self):
+        configure_rate_limits()
+        configure_breakers()
+
+    def test_slow_get_is_hedged(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request.extensions["timeout"]["read"])
+            if len(calls) == 1:
+                await asyncio.sleep(1.0)
+            return httpx.Response(200, stream=httpx.ByteStream(str(len(calls)).encode()))
+
+        source = HedgingSource()
+        source.__dict__['_latency'] = primed(hedge_budget=1.0)
+
+        async def run():
+            async with make_client(handler) as client:
+                return await source.request("GET", "https://api.example.org/works", timeout=30, client=client)
+
+        start = time.monotonic()
+        response = asyncio.run(run())
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(response.text, "2")
+        # Adaptive timeout: p99 of ~10ms times 3, raised to the 0.5s floor
+        self.assertEqual(calls, [0.5, 0.5])
+        self.assertEqual(source.latency.to_dict()["hedge_wins"], 1)
+
+    def test_rate_limit_wait_does_not_trigger_a_hedge(self):
+        configure_rate_limits({"api.example.org": HostPolicy(rate=5.0, burst=1)})
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            return httpx.Response(200, stream=httpx.ByteStream(b"{}"))
+
+        source = HedgingSource()
+        source.__dict__['_latency'] = primed(hedge_budget=1.0)
+
+        async def run():
+            async with make_client(handler) as client:
+                for i in range(2):
+                    # The second request waits ~0.2s for a token, well past the hedge delay
+                    await source.request("GET", f"https://api.example.org/{i}", client=client)
+
+        asyncio.run(run())
+        self.assertEqual((len(calls), source.latency.hedges), (2, 0))
+
+    def test_responses_are_observed(self):
+        async def run():
+            async with make_client(lambda request: httpx.Response(200, stream=httpx.ByteStream(b"{}"))) as client:
+                for i in range(3):
+                    await source.request("GET", f"https://api.example.org/{i}", client=client)
+                await source.request("POST", "https://api.example.org/batch", json={}, client=client)
+
+        source = PaperSource()
+        asyncio.run(run())
+        stats = source.latency.to_dict()
+        self.assertEqual(stats["samples"], 3)
+        self.assertIsNotNone(stats["p99"])
+
+
+if __name__ == '__main__':
+    unittest.main()
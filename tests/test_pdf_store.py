@@ -0,0 +1,118 @@
+# tests/test_pdf_store.py
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+from paper_search_mcp import pdf_store
+from paper_search_mcp.pdf_store import PDFStore, pdf_aliases, versionless_arxiv_alias
+from paper_search_mcp.academic_platforms.arxiv import ArxivSearcher
+from paper_search_mcp.academic_platforms.semantic import SemanticSearcher
+
+PDF_BYTES = b"%PDF-1.4\n% test document\n%%EOF\n"
+
+
+class TestPDFAliases(unittest.TestCase):
+    def test_prefixed_ids_map_to_shared_namespaces(self):
+        self.assertEqual(pdf_aliases("semantic", "DOI:10.1000/ABC"), ["doi:10.1000/abc"])
+        self.assertEqual(pdf_aliases("semantic", "ARXIV:2106.15928"), ["arxiv:2106.15928"])
+        self.assertEqual(pdf_aliases("iacr", "2025/1014"), ["iacr:2025/1014"])
+
+    def test_arxiv_version_is_kept(self):
+        self.assertEqual(pdf_aliases(arxiv_id="2106.15928v2"), ["arxiv:2106.15928v2"])
+        self.assertEqual(versionless_arxiv_alias("2106.15928v2"), "arxiv:2106.15928")
+
+
+class TestPDFStore(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp(prefix="pdf_store_test_")
+        self.store = PDFStore(root=os.path.join(self.test_dir, "store"))
+        self.save_path = os.path.join(self.test_dir, "downloads")
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_same_content_stored_once(self):
+        first = self.store.save(PDF_BYTES, ["arxiv:2106.15928"], self.save_path, "a.pdf")
+        second = self.store.save(PDF_BYTES, ["doi:10.48550/arxiv.2106.15928"], self.save_path, "b.pdf")
+
+        with open(first, "rb") as f:
+            self.assertEqual(f.read(), PDF_BYTES)
+        self.assertTrue(os.path.exists(second))
+        blobs = [name for _, _, files in os.walk(self.store.root) for name in files if name.endswith(".pdf")]
+        self.assertEqual(len(blobs), 1)
+        self.assertEqual(self.store.find(["arxiv:2106.15928"]),
+                         self.store.find(["doi:10.48550/arxiv.2106.15928"]))
+
+    def test_lookup_miss_and_metadata(self):
+        self.assertIsNone(self.store.lookup(["iacr:2025/1"], self.save_path, "x.pdf"))
+        self.store.save(PDF_BYTES, ["iacr:2025/1"], self.save_path, "x.pdf", metadata={"title": "T"})
+        sha256 = self.store.find(["iacr:2025/1"])
+        self.assertEqual(self.store.get_metadata(sha256), {"title": "T"})
+        path = self.store.lookup(["iacr:2025/1"], os.path.join(self.test_dir, "other"), "y.pdf")
+        self.assertTrue(path.endswith("y.pdf"))
+
+    def test_editing_an_export_leaves_the_blob_intact(self):
+        path = self.store.save(PDF_BYTES, ["arxiv:2106.15928"], self.save_path, "a.pdf")
+        blob = self.store.blob_path(self.store.find(["arxiv:2106.15928"]))
+        self.assertFalse(os.path.samefile(path, blob))
+        self.assertEqual(os.stat(blob).st_mode & 0o222, 0)
+
+        with open(path, "ab") as f:
+            f.write(b"% annotation\n")
+        with open(blob, "rb") as f:
+            self.assertEqual(f.read(), PDF_BYTES)
+        # The edited file is replaced by a fresh export on the next lookup
+        self.store.lookup(["arxiv:2106.15928"], self.save_path, "a.pdf")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), PDF_BYTES)
+
+    def test_searcher_skips_network_on_store_hit(self):
+        self.store.save(PDF_BYTES, ["arxiv:2106.15928v1"], self.save_path, "seed.pdf")
+        original, pdf_store._pdf_store = pdf_store._pdf_store, self.store
+        try:
+            path = asyncio.run(ArxivSearcher().download_pdf("2106.15928v1", self.save_path))
+        finally:
+            pdf_store._pdf_store = original
+        self.assertEqual(path, os.path.join(self.save_path, "2106.15928v1.pdf"))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), PDF_BYTES)
+
+    def test_stored_pdf_without_metadata_skips_the_lookup(self):
+        # Stored by another source, e.g. CrossRef, with no Semantic Scholar metadata
+        self.store.save(PDF_BYTES, ["doi:10.1000/abc"], self.save_path, "seed.pdf")
+        searcher = SemanticSearcher()
+        original, pdf_store._pdf_store = pdf_store._pdf_store, self.store
+        try:
+            with mock.patch.object(searcher, "get_paper_details", mock.AsyncMock()) as details:
+                path = asyncio.run(searcher.download_pdf("DOI:10.1000/ABC", self.save_path))
+        finally:
+            pdf_store._pdf_store = original
+        details.assert_not_called()
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), PDF_BYTES)
+
+    def test_store_hit_is_exported_off_the_event_loop(self):
+        self.store.save(PDF_BYTES, ["arxiv:2106.15928v1"], self.save_path, "seed.pdf")
+        threads = []
+        export = self.store.export
+
+        def recording_export(*args):
+            threads.append(threading.current_thread())
+            return export(*args)
+
+        self.store.export = recording_export
+        original, pdf_store._pdf_store = pdf_store._pdf_store, self.store
+        try:
+            asyncio.run(ArxivSearcher().download_pdf("2106.15928v1", self.save_path))
+        finally:
+            pdf_store._pdf_store = original
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+
+if __name__ == '__main__':
+    unittest.main()
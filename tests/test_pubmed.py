@@ -0,0 +1,140 @@
+# tests/test_pubmed.py
+import unittest
+import asyncio
+from urllib.parse import parse_qs
+import httpx
+from paper_search_mcp import transport
+from paper_search_mcp.ratelimit import configure_rate_limits
+from paper_search_mcp.academic_platforms import pubmed
+from paper_search_mcp.academic_platforms.pubmed import PubMedSearcher
+
+
+def article_xml(pmid: int) -> str:
+    return f"""
+    <PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>
+      <Journal><JournalIssue><PubDate><Year>2021</Year></PubDate></JournalIssue></Journal>
+      <ArticleTitle>Deep <i>learning</i> {pmid}</ArticleTitle>
+      <Abstract><AbstractText Label="BACKGROUND">Part one.</AbstractText>
+                <AbstractText Label="RESULTS">Part two.</AbstractText></Abstract>
+      <AuthorList><Author><LastName>Doe</LastName><Initials>J</Initials></Author>
+                  <Author><CollectiveName>The Consortium</CollectiveName></Author></AuthorList>
+      <ELocationID EIdType="pii">S1</ELocationID><ELocationID EIdType="doi">10.1/{pmid}</ELocationID>
+    </Article></MedlineCitation></PubmedArticle>"""
+
+
+class FakeEutils:
+    """ESearch/EFetch pair backed by the history server, with `count` hits."""
+
+    def __init__(self, count: int, failing: tuple = ()):
+        self.count = count
+        self.failing = failing
+        self.fetches = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("esearch.fcgi"):
+            assert request.url.params["usehistory"] == "y"
+            return httpx.Response(200, text=(
+                f"<eSearchResult><Count>{self.count}</Count><QueryKey>1</QueryKey>"
+                f"<WebEnv>MCID_1</WebEnv></eSearchResult>"))
+        assert request.method == "POST"
+        form = {k: v[0] for k, v in parse_qs(request.content.decode()).items()}
+        assert form["WebEnv"] == "MCID_1" and form["query_key"] == "1"
+        start, size = int(form["retstart"]), int(form["retmax"])
+        self.fetches.append((start, size))
+        if start in self.failing:
+            return httpx.Response(400, text="<eFetchResult><ERROR>Bad batch</ERROR></eFetchResult>")
+        articles = "".join(article_xml(n) for n in range(start, min(start + size, self.count)))
+        return httpx.Response(200, text=f"<PubmedArticleSet>{articles}</PubmedArticleSet>")
+
+
+def efetch(xml: bytes, chunk_size: int = 50):
+    """Run PubMedSearcher._efetch against a response streamed in small chunks."""
+    async def chunks():
+        for i in range(0, len(xml), chunk_size):
+            yield xml[i:i + chunk_size]
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=chunks())))
+        transport._clients[asyncio.get_running_loop()] = {True: client}
+        try:
+            return await PubMedSearcher()._efetch("MCID_1", "1", 0, 20)
+        finally:
+            await transport.aclose_clients()
+    return asyncio.run(run())
+
+
+class TestPubMedParsing(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+
+    def tearDown(self):
+        configure_rate_limits()
+
+    def test_streamed_efetch_in_chunks(self):
+        papers = efetch(f"<PubmedArticleSet>{article_xml(1)}{article_xml(2)}</PubmedArticleSet>".encode())
+        self.assertEqual([p.paper_id for p in papers], ["1", "2"])
+        paper = papers[0]
+        self.assertEqual(paper.title, "Deep learning 1")
+        self.assertEqual(paper.authors, ["Doe J", "The Consortium"])
+        self.assertEqual(paper.abstract, "Part one. Part two.")
+        self.assertEqual(paper.doi, "10.1/1")
+        self.assertEqual(paper.published_date.year, 2021)
+
+    def test_broken_article_is_skipped(self):
+        broken = article_xml(1).replace("<Year>2021</Year>", "")
+        papers = efetch(f"<PubmedArticleSet>{broken}{article_xml(2)}</PubmedArticleSet>".encode())
+        self.assertEqual([p.paper_id for p in papers], ["2"])
+
+
+class TestPubMedSearch(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+
+    def tearDown(self):
+        configure_rate_limits()
+
+    def search(self, api, max_results):
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+            # Make the searcher's shared client the mock for this loop
+            transport._clients[asyncio.get_running_loop()] = {True: client}
+            try:
+                return await PubMedSearcher().search("deep learning", max_results=max_results)
+            finally:
+                await transport.aclose_clients()
+        return asyncio.run(run())
+
+    def test_batched_efetch(self):
+        api = FakeEutils(count=450)
+        papers = self.search(api, 450)
+        self.assertEqual(len(papers), 450)
+        self.assertEqual([p.paper_id for p in papers], [str(n) for n in range(450)])
+        self.assertEqual(sorted(api.fetches), [(0, pubmed.EFETCH_BATCH), (200, 200), (400, 50)])
+
+    def test_max_results_caps_fetch(self):
+        api = FakeEutils(count=1000)
+        self.assertEqual(len(self.search(api, 5)), 5)
+        self.assertEqual(api.fetches, [(0, 5)])
+
+    def test_failed_batch_is_left_out(self):
+        api = FakeEutils(count=450, failing=(200,))
+        with self.assertLogs(pubmed.logger, "WARNING") as logs:
+            papers = self.search(api, 450)
+        expected = [str(n) for n in range(200)] + [str(n) for n in range(400, 450)]
+        self.assertEqual([p.paper_id for p in papers], expected)
+        self.assertIn("starting at 200", logs.output[0])
+
+    def test_all_batches_failed(self):
+        api = FakeEutils(count=5, failing=(0,))
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.search(api, 5)
+
+    def test_no_hits(self):
+        api = FakeEutils(count=0)
+        self.assertEqual(self.search(api, 10), [])
+        self.assertEqual(api.fetches, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
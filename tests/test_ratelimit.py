@@ -0,0 +1,145 @@
+# tests/test_ratelimit.py
+import unittest
+import asyncio
+import os
+import time
+from unittest import mock
+import httpx
+from paper_search_mcp import ratelimit
+from paper_search_mcp.ratelimit import (
+    HostPolicy, RateLimiter, TokenBucket, fetch, retry_after, configure_rate_limits,
+)
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_spaced(self):
+        bucket = TokenBucket(HostPolicy(rate=10.0, burst=2))
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        # Out of tokens: each further caller waits one more interval
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.01)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.01)
+
+    def test_unlisted_host_is_not_limited(self):
+        limiter = RateLimiter({"api.example.org": HostPolicy(rate=0.001)})
+        self.assertIsNone(limiter.bucket("other.example.org"))
+
+    def test_throttled_host_does_not_stall_others(self):
+        limiter = RateLimiter({"slow.example.org": HostPolicy(rate=2.0, burst=1)})
+
+        async def run():
+            start = time.monotonic()
+            slow = asyncio.gather(*(limiter.acquire("https://slow.example.org/x") for _ in range(3)))
+            fast = asyncio.gather(*(limiter.acquire("https://fast.example.org/x") for _ in range(3)))
+            await fast
+            fast_done = time.monotonic() - start
+            await slow
+            return fast_done, time.monotonic() - start
+
+        fast_done, slow_done = asyncio.run(run())
+        self.assertLess(fast_done, 0.1)
+        self.assertGreaterEqual(slow_done, 0.9)
+
+    def test_semantic_policy_depends_on_api_key(self):
+        with mock.patch.dict(os.environ, {"SEMANTIC_SCHOLAR_API_KEY": "key"}):
+            keyed = ratelimit.default_policies()["api.semanticscholar.org"]
+        with mock.patch.dict(os.environ, {"SEMANTIC_SCHOLAR_API_KEY": ""}):
+            anonymous = ratelimit.default_policies()["api.semanticscholar.org"]
+        self.assertGreater(keyed.rate, anonymous.rate)
+
+    def test_env_overrides(self):
+        with mock.patch.dict(os.environ, {"PAPER_SEARCH_RATE_LIMITS": "api.crossref.org=20:5, bad=x"}):
+            limiter = RateLimiter()
+        self.assertEqual(limiter.policies["api.crossref.org"], HostPolicy(rate=20.0, burst=5))
+        self.assertNotIn("bad", limiter.policies)
+
+
+class TestRetryAfter(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(retry_after(httpx.Response(429, headers={"Retry-After": "7"})), 7.0)
+
+    def test_http_date(self):
+        when = httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.assertEqual(retry_after(when), 0.0)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(retry_after(httpx.Response(429)))
+        self.assertIsNone(retry_after(httpx.Response(429, headers={"Retry-After": "soon"})))
+
+
+class TestFetch(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+
+    def tearDown(self):
+        configure_rate_limits()
+
+    def test_retries_honouring_retry_after(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            if len(calls) < 3:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"ok": True})
+
+        async def run():
+            async with make_client(handler) as client:
+                return await fetch("GET", "https://api.example.org/works", client=client)
+
+        response = asyncio.run(run())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 3)
+
+    def test_gives_up_and_returns_last_response(self):
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            return httpx.Response(503)
+
+        async def run():
+            async with make_client(handler) as client:
+                return await fetch("GET", "https://api.example.org/", retries=2, backoff=0.01, client=client)
+
+        response = asyncio.run(run())
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(calls), 3)
+
+    def test_client_errors_are_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            return httpx.Response(404)
+
+        async def run():
+            async with make_client(handler) as client:
+                return await fetch("GET", "https://api.example.org/", client=client)
+
+        self.assertEqual(asyncio.run(run()).status_code, 404)
+        self.assertEqual(len(calls), 1)
+
+    def test_connection_errors_are_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused")
+            return httpx.Response(200)
+
+        async def run():
+            async with make_client(handler) as client:
+                return await fetch("GET", "https://api.example.org/", backoff=0.01, client=client)
+
+        self.assertEqual(asyncio.run(run()).status_code, 200)
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
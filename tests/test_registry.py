@@ -0,0 +1,166 @@
+# tests/test_registry.py
+import unittest
+import os
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+from unittest import mock
+from paper_search_mcp import registry
+from paper_search_mcp.registry import SearcherRegistry, LazySearcher, SourceSpec
+from paper_search_mcp.academic_platforms.base import PaperSource, SEARCH, DOWNLOAD, READ
+
+PLATFORM_MODULES = tuple("paper_search_mcp" + spec.target.partition(":")[0]
+                         for spec in registry.BUILTIN_SOURCES.values())
+# Modules that must not be imported just to start the server or the CLI
+HEAVY_MODULES = PLATFORM_MODULES + ("docling", "surrealdb", "feedparser", "bs4", "PyPDF2")
+
+
+class FakeSearcher:
+    instances = 0
+
+    def __init__(self):
+        FakeSearcher.instances += 1
+
+    async def search(self, query: str, max_results: int = 10):
+        return []
+
+    def describe(self):
+        return "fake"
+
+
+class FakeDownloader(PaperSource):
+    name = "fake_downloader"
+    description = "Fake - Downloads only"
+    capabilities = frozenset({SEARCH, DOWNLOAD})
+    cacheable = False
+
+    async def download_pdf(self, paper_id: str, save_path: str) -> str:
+        return f"{save_path}/{paper_id}.pdf"
+
+
+def loaded_modules(statement: str) -> list:
+    """Heavy modules present in sys.modules after running statement in a fresh interpreter."""
+    code = (f"import sys; {statement}; "
+            f"print('\\n'.join(m for m in sys.modules if m.startswith({HEAVY_MODULES!r})))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return result.stdout.split()
+
+
+class TestSearcherRegistry(unittest.TestCase):
+    def setUp(self):
+        FakeSearcher.instances = 0
+        self.registry = SearcherRegistry({"fake": f"{__name__}:FakeSearcher"}, discover=False)
+
+    def test_created_once_on_first_use(self):
+        self.assertIn("fake", self.registry)
+        self.assertEqual(list(self.registry), ["fake"])
+        self.assertEqual(FakeSearcher.instances, 0)
+        first = self.registry["fake"]
+        self.assertIs(self.registry["fake"], first)
+        self.assertEqual(FakeSearcher.instances, 1)
+        self.assertEqual(first.describe(), "fake")
+
+    def test_lazy_proxy(self):
+        proxy = self.registry.lazy("fake")
+        self.assertIsInstance(proxy, LazySearcher)
+        self.assertEqual(self.registry.loaded(), {})
+        self.assertEqual(proxy.describe(), "fake")
+        self.assertEqual(FakeSearcher.instances, 1)
+
+    def test_unknown_source(self):
+        self.assertNotIn("nope", self.registry)
+        with self.assertRaises(KeyError):
+            self.registry["nope"]
+        self.assertIsNone(self.registry.get("nope"))
+
+    def test_entry_point_plugins(self):
+        plugins = [
+            EntryPoint("plugin", f"{__name__}:FakeSearcher", registry.ENTRY_POINT_GROUP),
+            EntryPoint("fake", "elsewhere:Other", registry.ENTRY_POINT_GROUP),
+        ]
+        with mock.patch.object(registry, "entry_points", return_value=plugins) as found:
+            reg = SearcherRegistry({"fake": f"{__name__}:FakeSearcher"})
+            reg["fake"]
+            found.assert_not_called()
+            self.assertIn("plugin", reg)
+            self.assertEqual(reg["plugin"].describe(), "fake")
+        # Built-in names win over plugins
+        self.assertEqual(reg.spec("fake").target, f"{__name__}:FakeSearcher")
+        found.assert_called_once_with(group=registry.ENTRY_POINT_GROUP)
+
+    def test_capabilities_from_class(self):
+        reg = SearcherRegistry({"fake": f"{__name__}:FakeSearcher",
+                                "dl": f"{__name__}:FakeDownloader"}, discover=False)
+        self.assertEqual(reg.capabilities("fake"), {SEARCH})
+        self.assertEqual(reg.spec("dl").description, "Fake - Downloads only")
+        self.assertEqual(list(reg.supporting(DOWNLOAD)), ["dl"])
+        self.assertEqual(list(reg.supporting(SEARCH)), ["fake", "dl"])
+        # Sources that opt out of caching are not wrapped
+        self.assertIsInstance(reg["dl"], FakeDownloader)
+
+    def test_builtin_specs_match_classes(self):
+        for name, spec in registry.BUILTIN_SOURCES.items():
+            cls = registry.load_class(spec.target)
+            self.assertTrue(issubclass(cls, PaperSource), name)
+            self.assertEqual(cls.name, name)
+            self.assertEqual(cls.description, spec.description, name)
+            self.assertEqual(cls.capabilities, spec.capabilities, name)
+            if READ in spec.capabilities:
+                self.assertIsNot(cls.read_paper, PaperSource.read_paper, name)
+            if DOWNLOAD in spec.capabilities:
+                self.assertIsNot(cls.download_pdf, PaperSource.download_pdf, name)
+
+
+class TestStartup(unittest.TestCase):
+    def test_server_import_is_lazy(self):
+        self.assertEqual(loaded_modules("import paper_search_mcp.server"), [])
+
+    def test_cli_import_is_lazy(self):
+        self.assertEqual(loaded_modules("import paper_search_mcp.cli"), [])
+
+    def test_first_use_imports_only_that_platform(self):
+        modules = loaded_modules("from paper_search_mcp import server; server.arxiv_searcher.search")
+        platforms = [m for m in modules if m in PLATFORM_MODULES]
+        self.assertEqual(platforms, ["paper_search_mcp.academic_platforms.arxiv"])
+
+
+class TestGeneratedTools(unittest.TestCase):
+    def test_plugin_tools_follow_capabilities(self):
+        import asyncio
+        from paper_search_mcp import server
+
+        server.searchers.register("fake_downloader", f"{__name__}:FakeDownloader")
+        try:
+            server.register_source_tools("fake_downloader")
+            tools = {tool.name for tool in asyncio.run(server.mcp.list_tools())}
+            self.assertIn("search_fake_downloader", tools)
+            self.assertIn("download_fake_downloader", tools)
+            self.assertNotIn("read_fake_downloader_paper", tools)
+            result = asyncio.run(server.mcp.call_tool("download_fake_downloader", {"paper_id": "p1"}))
+            self.assertIn("./downloads/p1.pdf", str(result))
+        finally:
+            for tool in ("search_fake_downloader", "download_fake_downloader"):
+                server.mcp.local_provider.remove_tool(tool)
+            server.searchers._specs.pop("fake_downloader", None)
+            server.searchers._instances.pop("fake_downloader", None)
+
+    def test_builtin_tools_cover_capabilities(self):
+        import asyncio
+        from paper_search_mcp import server
+
+        tools = {tool.name for tool in asyncio.run(server.mcp.list_tools())}
+        for name, spec in registry.BUILTIN_SOURCES.items():
+            expected = {SEARCH: f"search_{name}", DOWNLOAD: f"download_{name}",
+                        READ: f"read_{name}_paper"}
+            for capability, tool in expected.items():
+                if capability in spec.capabilities:
+                    self.assertIn(tool, tools)
+        # Every name that suppresses a generated tool is defined by hand
+        self.assertLessEqual(server.HAND_WRITTEN_TOOLS, tools)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,310 @@
+# tests/test_rxiv.py
+import unittest
+import asyncio
+import functools
+import os
+from unittest import mock
+import shutil
+import tempfile
+from datetime import date, timedelta
+import httpx
+from paper_search_mcp.ratelimit import configure_rate_limits, fetch
+from paper_search_mcp.breaker import BreakerPolicy, CircuitOpenError, configure_breakers, OPEN
+from paper_search_mcp import pdf_store
+from paper_search_mcp.pdf_store import PDFStore
+from paper_search_mcp import rxiv
+from paper_search_mcp.rxiv import (
+    RxivStore, fetch_interval, search_window, keyword_search, day_runs, category_key,
+    match_expression,
+)
+from paper_search_mcp.academic_platforms.biorxiv import BioRxivSearcher
+from paper_search_mcp.academic_platforms.medrxiv import MedRxivSearcher
+
+
+def make_item(day: date, n: int, category: str = "cell biology") -> dict:
+    return {
+        "doi": f"10.1101/{day.isoformat()}.{n:04d}", "version": "1", "date": day.isoformat(),
+        "title": f"Paper {n}", "authors": "Doe, J.; Roe, R.", "abstract": "About cells.",
+        "category": category,
+    }
+
+
+class FakeDetailsAPI:
+    """Details endpoint serving `per_day` records a day, counting requests."""
+
+    def __init__(self, per_day: int):
+        self.per_day = per_day
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.path)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        _, _, _, start, end, cursor = request.url.path.split("/")
+        first, last = date.fromisoformat(start), date.fromisoformat(end)
+        items = []
+        day = first
+        while day <= last:
+            items.extend(make_item(day, n) for n in range(self.per_day))
+            day += timedelta(days=1)
+        cursor = int(cursor)
+        return httpx.Response(200, json={
+            "messages": [{"status": "ok", "cursor": cursor, "total": str(len(items))}],
+            "collection": items[cursor:cursor + 100],
+        })
+
+
+class TestRxiv(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+        self.test_dir = tempfile.mkdtemp(prefix="rxiv_test_")
+        self.store = RxivStore(path=os.path.join(self.test_dir, "rxiv.sqlite3"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.test_dir)
+        configure_rate_limits()
+
+    def run_with_api(self, api, coro_factory):
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(api)) as client:
+                try:
+                    return await coro_factory(client)
+                finally:
+                    await rxiv.wait_for_syncs()
+        return asyncio.run(run())
+
+    def test_day_runs(self):
+        d = date(2025, 1, 1)
+        days = [d, d + timedelta(1), d + timedelta(2), d + timedelta(5)]
+        self.assertEqual(day_runs(days), [(d, d + timedelta(2)), (d + timedelta(5), d + timedelta(5))])
+
+    def test_category_key(self):
+        self.assertEqual(category_key(" Cell  Biology "), "cell_biology")
+
+    def test_pages_fetched_concurrently(self):
+        api = FakeDetailsAPI(per_day=50)
+        start = date(2025, 1, 1)
+        items = self.run_with_api(api, lambda client: fetch_interval(
+            "biorxiv", start, start + timedelta(days=9), concurrency=3, client=client))
+        self.assertEqual(len(items), 500)
+        self.assertEqual(len(api.requests), 5)
+        self.assertEqual(api.peak, 3)
+        self.assertEqual(len({item["doi"] for item in items}), 500)
+
+    def test_repeat_window_only_fetches_missing_days(self):
+        api = FakeDetailsAPI(per_day=2)
+
+        first = self.run_with_api(api, lambda client: search_window(
+            "biorxiv", "cell biology", 30, 1000, self.store, client=client))
+        self.assertEqual(len(first), 62)
+        requests_before = len(api.requests)
+
+        # Recently fetched unsettled days are served from the store too
+        second = self.run_with_api(api, lambda client: search_window(
+            "biorxiv", "cell biology", 30, 1000, self.store, client=client))
+        self.assertEqual(len(second), 62)
+        self.assertEqual(len(api.requests), requests_before)
+
+        # Once they expire, only the unsettled recent days are fetched again
+        with mock.patch.object(rxiv, "RECENT_TTL", 0):
+            self.run_with_api(api, lambda client: search_window(
+                "biorxiv", "cell biology", 30, 1000, self.store, client=client))
+        self.assertEqual(len(api.requests), requests_before + 1)
+        recent = (date.today() - timedelta(days=1)).isoformat()
+        self.assertIn(f"/{recent}/{date.today().isoformat()}/0", api.requests[-1])
+        self.assertEqual(self.store.missing_days(
+            "biorxiv", "cell_biology", date.today() - timedelta(days=30), date.today() - timedelta(days=2)), [])
+
+        # A wider window fetches just the extra days
+        self.run_with_api(api, lambda client: search_window(
+            "biorxiv", "cell biology", 40, 1000, self.store, client=client))
+        windows = api.requests[requests_before + 1:]
+        older = (date.today() - timedelta(days=40)).isoformat()
+        self.assertTrue(any(older in path for path in windows))
+        self.assertEqual(self.store.get_stats()["records"], {"biorxiv": 82})
+
+    def test_unfiltered_days_answer_category_queries(self):
+        start = date(2025, 1, 1)
+        self.store.add("medrxiv", [make_item(start, 0), make_item(start, 1, "epidemiology")],
+                       complete=[start])
+        self.assertEqual(self.store.missing_days("medrxiv", "epidemiology", start, start), [])
+        records = self.store.query("medrxiv", "epidemiology", start, start)
+        self.assertEqual([r["category"] for r in records], ["epidemiology"])
+
+    def test_failed_fetch_returns_stored_records(self):
+        day = date.today() - timedelta(days=5)
+        self.store.add("biorxiv", [make_item(day, 0)])
+
+        def broken(request):
+            return httpx.Response(404)
+
+        papers = self.run_with_api(broken, lambda client: search_window(
+            "biorxiv", "", 10, 10, self.store, client=client))
+        self.assertEqual([p.title for p in papers], ["Paper 0"])
+        self.assertEqual(papers[0].url, f"https://www.biorxiv.org/content/{papers[0].doi}v1")
+
+    def test_first_page_answers_before_the_window_is_stored(self):
+        api = FakeDetailsAPI(per_day=20)
+
+        async def run(client):
+            papers = await search_window("biorxiv", "cell biology", 30, 10, self.store, client=client)
+            return papers, len(api.requests)
+
+        papers, requests = self.run_with_api(api, run)
+        # One page was awaited; the other six were fetched in the background
+        self.assertEqual(requests, 1)
+        self.assertEqual(len(papers), 10)
+        self.assertEqual(papers[0].published_date.date(), date.today() - timedelta(days=30))
+        self.assertEqual(len(api.requests), 7)
+        self.assertEqual(self.store.get_stats()["records"], {"biorxiv": 620})
+        self.assertEqual(self.store.missing_days(
+            "biorxiv", "cell_biology", date.today() - timedelta(days=30), date.today()), [])
+
+    def test_failed_page_keeps_the_pages_that_arrived(self):
+        api = FakeDetailsAPI(per_day=50)
+
+        async def flaky(request):
+            if request.url.path.endswith("/200"):
+                return httpx.Response(500)
+            return await api(request)
+
+        start = date(2025, 1, 1)
+        end = start + timedelta(days=9)
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.run_with_api(flaky, lambda client: rxiv.sync_window(
+                "biorxiv", "", start, end, self.store, client=client,
+                request=functools.partial(fetch, retries=0)))
+        self.assertEqual(self.store.get_stats()["records"], {"biorxiv": 400})
+        # The run isn't complete, so it is fetched again
+        self.assertEqual(len(self.store.missing_days("biorxiv", "", start, end)), 10)
+
+    def test_searcher_requests_feed_its_breaker(self):
+        policy = BreakerPolicy(window=60.0, min_calls=2, failure_rate=0.5, slow_call_seconds=5.0, cooldown=60.0)
+        board = configure_breakers(policy, enabled=True)
+        self.addCleanup(configure_breakers)
+        searcher = BioRxivSearcher()
+        request = functools.partial(searcher.request, retries=0)
+        calls = []
+
+        def unavailable(request):
+            calls.append(request.url.path)
+            return httpx.Response(503)
+
+        async def run(client):
+            return [await search_window("biorxiv", "cell biology", 5, 10, self.store,
+                                        client=client, request=request) for _ in range(3)]
+
+        results = self.run_with_api(unavailable, run)
+        self.assertEqual(results, [[], [], []])
+        # The third search is refused by the open breaker without a request
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(searcher.metrics.requests, 2)
+        self.assertEqual(board.states()["biorxiv"]["state"], OPEN)
+
+    def test_download_is_not_retried_into_an_open_breaker(self):
+        policy = BreakerPolicy(window=60.0, min_calls=2, failure_rate=0.5, slow_call_seconds=5.0, cooldown=60.0)
+        board = configure_breakers(policy, enabled=True)
+        self.addCleanup(configure_breakers)
+        for _ in range(2):
+            board.get("medrxiv").record(True)
+        store = PDFStore(root=os.path.join(self.test_dir, "pdfs"))
+        original, pdf_store._pdf_store = pdf_store._pdf_store, store
+        self.addCleanup(setattr, pdf_store, "_pdf_store", original)
+        self.addCleanup(store.close)
+        searcher = MedRxivSearcher()
+
+        with mock.patch("builtins.print") as printed:
+            with self.assertRaises(CircuitOpenError):
+                asyncio.run(searcher.download_pdf("10.1101/2025.01.01.0001", self.test_dir))
+        printed.assert_not_called()
+        self.assertEqual(searcher.metrics.requests, 0)
+        self.assertEqual(board.states()["medrxiv"]["state"], OPEN)
+
+
+class TestKeywordIndex(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+        self.test_dir = tempfile.mkdtemp(prefix="rxiv_index_test_")
+        self.path = os.path.join(self.test_dir, "rxiv.sqlite3")
+        self.store = RxivStore(path=self.path)
+        day = date(2025, 3, 1)
+        self.items = [make_item(day, n) for n in range(4)]
+        self.items[0].update(title="Single-cell sequencing of neurons", abstract="We sequence cells.")
+        self.items[1].update(title="Protein folding", abstract="Single-cell methods for folding.")
+        self.items[2].update(title="Tumour growth", abstract="Nothing relevant here.")
+        self.items[3].update(title="Sequencing sequencing", abstract="Neurons neurons.", category="neuroscience")
+        self.store.add("biorxiv", self.items)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.test_dir)
+        configure_rate_limits()
+
+    def test_match_expression(self):
+        self.assertEqual(match_expression('single-cell "RNA"'), '"single" OR "cell" OR "rna"')
+        self.assertEqual(match_expression("  ?! "), "")
+
+    def test_bm25_ranking(self):
+        results = self.store.keyword_query("biorxiv", "single cell sequencing neurons", 10)
+        titles = [record["title"] for record, _ in results]
+        self.assertEqual(titles[0], "Single-cell sequencing of neurons")
+        self.assertNotIn("Tumour growth", titles)
+        scores = [score for _, score in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        # Porter stemming: 'sequenced' finds 'sequencing'
+        self.assertTrue(self.store.keyword_query("biorxiv", "sequenced", 10))
+        self.assertEqual(self.store.keyword_query("medrxiv", "neurons", 10), [])
+
+    def test_updated_record_is_reindexed(self):
+        changed = dict(self.items[2], title="Neurons in tumour growth")
+        self.store.add("biorxiv", [changed])
+        found = [r["title"] for r, _ in self.store.keyword_query("biorxiv", "neurons", 10)]
+        self.assertIn("Neurons in tumour growth", found)
+        self.assertEqual(self.store.keyword_query("biorxiv", "nothing relevant", 10)[0][0]["doi"],
+                         changed["doi"])
+        # Only the latest version of a DOI is returned
+        self.store.add("biorxiv", [dict(self.items[1], version="2", title="Protein folding v2")])
+        found = [r["title"] for r, _ in self.store.keyword_query("biorxiv", "protein folding", 10)]
+        self.assertEqual(found, ["Protein folding v2"])
+
+    def test_index_survives_reopen(self):
+        self.store.close()
+        store = RxivStore(path=self.path)
+        self.assertEqual(len(store.keyword_query("biorxiv", "neurons", 10)), 2)
+        store.close()
+
+    def test_first_keyword_search_builds_mirror_in_background(self):
+        api = FakeDetailsAPI(per_day=1)
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(api)) as client:
+                first = await keyword_search("medrxiv", "paper", 5, self.store, client=client)
+                requests = len(api.requests)
+                await rxiv.wait_for_syncs()
+                synced = len(api.requests)
+                second = await keyword_search("medrxiv", "paper", 5, self.store, client=client)
+                return first, requests, synced, second
+
+        first, requests, synced, second = asyncio.run(run())
+        # Only the newest postings were awaited; the mirror was built afterwards
+        self.assertEqual(requests, 1)
+        self.assertEqual(len(first), 2)
+        self.assertIn("score", first[0].extra)
+        self.assertGreater(synced, requests)
+        self.assertIsNotNone(self.store.mirror_synced("medrxiv"))
+        # A fresh mirror answers from the index without any request
+        self.assertEqual(len(api.requests), synced)
+        self.assertEqual(len(second), 5)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(BioRxivSearcher().search("x", mode="fuzzy"))
+
+
+if __name__ == '__main__':
+    unittest.main()
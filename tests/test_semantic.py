@@ -1,7 +1,14 @@
 import unittest
 import asyncio
+import json
 import os
+from unittest import mock
 import requests
+import httpx
+from paper_search_mcp import transport
+from paper_search_mcp.ratelimit import configure_rate_limits
+from paper_search_mcp.academic_platforms import semantic
+from paper_search_mcp.academic_platforms.base import BatchLookupError
 from paper_search_mcp.academic_platforms.semantic import SemanticSearcher
 
 
@@ -272,5 +279,92 @@ class TestSemanticSearcher(unittest.TestCase):
 
 
 
+class FakeBatchAPI:
+    """POST /paper/batch answering every ID except those starting with 'MISSING'."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.method == "POST" and request.url.path.endswith("/paper/batch")
+        assert "openAccessPdf" in request.url.params["fields"]
+        ids = json.loads(request.content)["ids"]
+        self.batches.append(len(ids))
+        return httpx.Response(200, json=[
+            None if paper_id.startswith("MISSING") else {
+                "paperId": f"s2-{paper_id}", "title": f"Title {paper_id}", "authors": [{"name": "A B"}],
+                "publicationDate": "2020-01-02", "externalIds": {"DOI": "10.1/x"},
+            }
+            for paper_id in ids
+        ])
+
+
+class TestSemanticBatch(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+
+    def tearDown(self):
+        configure_rate_limits()
+
+    def lookup(self, searcher, api, ids):
+        async def run():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+            # Make the searcher's shared client the mock for this loop
+            transport._clients[asyncio.get_running_loop()] = {True: client}
+            try:
+                return await searcher.get_papers_batch(ids)
+            finally:
+                await transport.aclose_clients()
+        return asyncio.run(run())
+
+    def test_large_list_is_chunked(self):
+        api = FakeBatchAPI()
+        ids = [f"DOI:10.1/{n}" for n in range(semantic.BATCH_SIZE + 100)] + ["MISSING:1", "DOI:10.1/0"]
+        papers = self.lookup(SemanticSearcher(), api, ids)
+        self.assertEqual(sorted(api.batches), [101, semantic.BATCH_SIZE])
+        self.assertEqual(len(papers), len(ids))
+        self.assertEqual(papers[0].title, "Title DOI:10.1/0")
+        self.assertIsNone(papers[-2])
+        self.assertIs(papers[-1], papers[0])
+
+    def test_batch_results_serve_later_lookups(self):
+        api = FakeBatchAPI()
+        searcher = SemanticSearcher()
+        self.lookup(searcher, api, ["ARXIV:2106.15928"])
+        paper = asyncio.run(searcher.get_paper_details("ARXIV:2106.15928"))
+        self.assertEqual(paper.paper_id, "s2-ARXIV:2106.15928")
+        self.assertEqual(api.batches, [1])
+
+    def test_failed_batch_is_not_reported_as_not_found(self):
+        api = FakeBatchAPI()
+
+        def flaky(request):
+            if "FAIL" in request.content.decode():
+                return httpx.Response(503)
+            return api(request)
+
+        ids = ["DOI:10.1/a", "MISSING:1", "FAIL:1", "FAIL:2"]
+        with mock.patch.object(semantic, "BATCH_SIZE", 2), \
+                mock.patch.dict(os.environ, {"PAPER_SEARCH_HTTP_RETRIES": "0"}):
+            with self.assertRaises(BatchLookupError) as raised:
+                self.lookup(SemanticSearcher(), flaky, ids)
+        papers, failed = raised.exception.papers, raised.exception.failed
+        self.assertEqual(papers[0].title, "Title DOI:10.1/a")
+        self.assertEqual(papers[1:], [None, None, None])
+        self.assertEqual(set(failed), {"FAIL:1", "FAIL:2"})
+
+    def test_batch_tool_reports_failed_ids(self):
+        from paper_search_mcp import server
+
+        error = BatchLookupError([None, None], {"FAIL:1": "503 Service Unavailable"})
+        fake = mock.Mock(get_papers_batch=mock.AsyncMock(side_effect=error))
+        with mock.patch.object(server, "semantic_searcher", fake):
+            results = asyncio.run(server.get_semantic_papers_batch(["MISSING:1", "FAIL:1"]))
+        self.assertEqual(results, [
+            {"requested_id": "MISSING:1", "error": "Not found"},
+            {"requested_id": "FAIL:1", "error": "Request failed: 503 Service Unavailable"},
+        ])
+
+
 if __name__ == "__main__":
     unittest.main()
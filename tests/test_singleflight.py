@@ -0,0 +1,217 @@
+# tests/test_singleflight.py
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+from unittest import mock
+from datetime import datetime
+import httpx
+from paper_search_mcp import pdf_store
+from paper_search_mcp.paper import Paper
+from paper_search_mcp.cache import SearchCache, CachedSearcher
+from paper_search_mcp.download import fetch_to_store
+from paper_search_mcp.pdf_store import PDFStore
+from paper_search_mcp.ratelimit import configure_rate_limits
+from paper_search_mcp.singleflight import SingleFlight, request_key
+from paper_search_mcp.academic_platforms.base import PaperSource
+
+
+def make_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class SlowCountingSearcher:
+    """Searcher that takes a while and counts upstream calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def search(self, query: str, max_results: int = 10):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return [Paper(paper_id=f"{query}-{self.calls}", title=query, authors=[], abstract="", doi="",
+                      published_date=datetime(2020, 5, 1), pdf_url="", url="", source="fake")]
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return "result"
+
+        async def run():
+            return await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(run()), ["result"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.get_stats(), {"calls": 1, "shared": 4})
+
+    def test_sequential_calls_are_not_shared(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return len(calls)
+
+        async def run():
+            return [await flight.do("k", work), await flight.do("k", work), await flight.do(None, work)]
+
+        self.assertEqual(asyncio.run(run()), [1, 2, 3])
+
+    def test_exception_reaches_every_caller(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        async def run():
+            return await asyncio.gather(flight.do("k", work), flight.do("k", work), return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def run():
+            first = asyncio.ensure_future(flight.do("k", work))
+            second = asyncio.ensure_future(flight.do("k", work))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second, first.cancelled()
+
+        self.assertEqual(asyncio.run(run()), ("done", True))
+
+    def test_call_cancelled_when_every_caller_gives_up(self):
+        flight = SingleFlight()
+        finished = []
+
+        async def work():
+            await asyncio.sleep(0.05)
+            finished.append(1)
+
+        async def run():
+            caller = asyncio.ensure_future(flight.do("k", work))
+            await asyncio.sleep(0.01)
+            caller.cancel()
+            await asyncio.sleep(0.08)
+            return flight.in_flight()
+
+        self.assertEqual(asyncio.run(run()), 0)
+        self.assertEqual(finished, [])
+
+    def test_disabled_by_env(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+
+        async def run():
+            await asyncio.gather(flight.do("k", work), flight.do("k", work))
+
+        with mock.patch.dict(os.environ, {"PAPER_SEARCH_COALESCE": "off"}):
+            asyncio.run(run())
+        self.assertEqual(len(calls), 2)
+
+
+class TestRequestKey(unittest.TestCase):
+    def test_normalized(self):
+        self.assertEqual(
+            request_key("get", "HTTPS://Export.arXiv.org/api/query?b=2", {"a": "1"}),
+            request_key("GET", "https://export.arxiv.org/api/query?a=1&b=2"),
+        )
+
+    def test_headers_and_methods(self):
+        url = "https://api.semanticscholar.org/graph/v1/paper/1"
+        self.assertNotEqual(request_key("GET", url, headers={"x-api-key": "a"}),
+                            request_key("GET", url, headers={"x-api-key": "b"}))
+        self.assertIsNone(request_key("POST", url))
+
+
+class TestCoalescedRequests(unittest.TestCase):
+    def setUp(self):
+        configure_rate_limits({})
+        self.test_dir = tempfile.mkdtemp(prefix="singleflight_test_")
+
+    def tearDown(self):
+        configure_rate_limits()
+        shutil.rmtree(self.test_dir)
+
+    def test_identical_gets_go_upstream_once(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(str(request.url))
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json={"ok": True})
+
+        source = PaperSource()
+
+        async def run():
+            async with make_client(handler) as client:
+                return await asyncio.gather(*(
+                    source.request("GET", "https://api.example.org/paper", params={"id": "1"}, client=client)
+                    for _ in range(4)
+                ), source.request("GET", "https://api.example.org/paper", params={"id": "2"}, client=client))
+
+        responses = asyncio.run(run())
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(all(r.json() == {"ok": True} for r in responses))
+        self.assertEqual((source.metrics.requests, source.metrics.coalesced), (2, 3))
+
+    def test_concurrent_cache_misses_search_once(self):
+        upstream = SlowCountingSearcher()
+        searcher = CachedSearcher(upstream, "fake", SearchCache(path=os.path.join(self.test_dir, "c.sqlite3")))
+
+        async def run():
+            return await asyncio.gather(*(searcher.search("graphs") for _ in range(3)))
+
+        results = asyncio.run(run())
+        self.assertEqual(upstream.calls, 1)
+        self.assertEqual([r[0].paper_id for r in results], ["graphs-1"] * 3)
+        self.assertIsNot(results[0], results[1])
+
+    def test_concurrent_pdf_downloads_share_one_transfer(self):
+        calls = []
+        body = b"%PDF-1.4 " + bytes(1000)
+
+        async def handler(request):
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, content=body, headers={"Content-Type": "application/pdf"})
+
+        store = PDFStore(root=os.path.join(self.test_dir, "pdfs"))
+        original, pdf_store._pdf_store = pdf_store._pdf_store, store
+        try:
+            async def run():
+                async with make_client(handler) as client:
+                    return await asyncio.gather(
+                        fetch_to_store("https://example.org/p.pdf", ["arxiv:1"], client=client),
+                        fetch_to_store("https://example.org/p.pdf", ["doi:10.1/x"], client=client),
+                    )
+
+            first, second = asyncio.run(run())
+        finally:
+            pdf_store._pdf_store = original
+            store.close()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first.sha256, second.sha256)
+        self.assertIsNot(first, second)
+        self.assertEqual(store.find(["doi:10.1/x"]), store.find(["arxiv:1"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
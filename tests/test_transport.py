@@ -0,0 +1,43 @@
+# tests/test_transport.py
+import unittest
+import asyncio
+from paper_search_mcp import transport
+
+
+class TestTransport(unittest.TestCase):
+    def test_client_shared_within_loop(self):
+        """Test that searchers in the same event loop share one pooled client."""
+        async def run():
+            first = transport.get_client()
+            second = transport.get_client()
+            insecure = transport.get_client(verify=False)
+            self.assertIs(first, second)
+            self.assertIsNot(first, insecure)
+            await transport.aclose_clients()
+            self.assertTrue(first.is_closed)
+            self.assertTrue(insecure.is_closed)
+
+        asyncio.run(run())
+
+    def test_client_per_event_loop(self):
+        """Test that a new event loop gets its own client."""
+        async def grab():
+            return transport.get_client()
+
+        first = transport.run(grab())
+        second = transport.run(grab())
+        self.assertIsNot(first, second)
+        self.assertTrue(first.is_closed)
+        self.assertTrue(second.is_closed)
+
+    def test_config_limits(self):
+        """Test that pool limits come from the configuration."""
+        config = transport.TransportConfig(max_connections=7, max_keepalive_connections=3, http2=False)
+        limits = config.limits()
+        self.assertEqual(limits.max_connections, 7)
+        self.assertEqual(limits.max_keepalive_connections, 3)
+        self.assertFalse(config.http2)
+
+
+if __name__ == '__main__':
+    unittest.main()